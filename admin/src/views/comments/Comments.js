@@ -146,6 +146,22 @@ const ModalButtonContainer = styled.div`
   margin-top: 1.5rem;
 `
 
+const LoadMoreButton = styled.button`
+  display: block;
+  margin: 1rem auto;
+  background: #3498db;
+  color: white;
+  border: none;
+  padding: 0.5rem 1.5rem;
+  border-radius: 4px;
+  cursor: pointer;
+
+  &:disabled {
+    background: #95a5a6;
+    cursor: default;
+  }
+`
+
 const Table = styled.table`
   width: 100%;
   border-collapse: collapse;
@@ -163,6 +179,8 @@ const Comments = ({ theme }) => {
   const [isCreateModalOpen, setIsCreateModalOpen] = useState(false)
   const [editingComment, setEditingComment] = useState(null)
   const [deleteConfirmation, setDeleteConfirmation] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchComments()
@@ -170,14 +188,29 @@ const Comments = ({ theme }) => {
 
   const fetchComments = async () => {
     try {
-      const data = await commentApi.getComments()
+      const { comments: data, nextCursor: cursor } = await commentApi.getComments()
       setComments(data)
+      setNextCursor(cursor)
     } catch (error) {
       console.error('Error fetching comments:', error)
       alert('Yorumlar yüklenirken hata oluştu')
     }
   }
 
+  const loadMoreComments = async () => {
+    setLoadingMore(true)
+    try {
+      const { comments: data, nextCursor: cursor } = await commentApi.getComments(nextCursor)
+      setComments((prev) => [...prev, ...data])
+      setNextCursor(cursor)
+    } catch (error) {
+      console.error('Error fetching comments:', error)
+      alert('Yorumlar yüklenirken hata oluştu')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const filteredComments = useMemo(() => {
     return comments.filter(
       (comment) =>
@@ -356,6 +389,11 @@ const Comments = ({ theme }) => {
         {sortedComments.length === 0 && (
           <NoDataMessage theme={theme}>Yorum bulunamadı</NoDataMessage>
         )}
+        {nextCursor && (
+          <LoadMoreButton onClick={loadMoreComments} disabled={loadingMore}>
+            {loadingMore ? 'Yükleniyor...' : 'Daha Fazla Yükle'}
+          </LoadMoreButton>
+        )}
       </TableWrapper>
 
       {isCreateModalOpen && (
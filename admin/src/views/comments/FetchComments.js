@@ -9,9 +9,16 @@ const getAuthHeader = () => ({
 })
 
 export const commentApi = {
-  getComments: async () => {
-    const response = await axios.get(`${BASE_URL}/comments`, getAuthHeader())
-    return response.data
+  // Yorumlar sayfa sayfa gelir; sonraki sayfanın cursor'ı X-Next-Cursor header'ında
+  getComments: async (cursor = null) => {
+    const response = await axios.get(`${BASE_URL}/comments`, {
+      ...getAuthHeader(),
+      params: cursor ? { cursor } : {},
+    })
+    return {
+      comments: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    }
   },
 
   createComment: async (data) => {
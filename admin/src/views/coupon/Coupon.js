@@ -111,6 +111,22 @@ const ModalButtonContainer = styled.div`
   margin-top: 1.5rem;
 `
 
+const LoadMoreButton = styled.button`
+  display: block;
+  margin: 1rem auto;
+  background: #3498db;
+  color: white;
+  border: none;
+  padding: 0.5rem 1.5rem;
+  border-radius: 4px;
+  cursor: pointer;
+
+  &:disabled {
+    background: #95a5a6;
+    cursor: default;
+  }
+`
+
 const Table = styled.table`
   width: 100%;
   border-collapse: collapse;
@@ -127,6 +143,8 @@ const Coupon = ({ theme }) => {
   const [isCreateModalOpen, setIsCreateModalOpen] = useState(false)
   const [editingCoupon, setEditingCoupon] = useState(null)
   const [deleteConfirmation, setDeleteConfirmation] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     fetchCoupons()
@@ -137,9 +155,24 @@ const Coupon = ({ theme }) => {
     try {
       const data = await couponApi.getCoupons()
       setCoupons(data.coupons)
+      setNextCursor(data.next_cursor)
+    } catch (error) {
+      console.error('Error fetching coupons:', error)
+      alert('Failed to fetch coupons')
+    }
+  }
+
+  const loadMoreCoupons = async () => {
+    setLoadingMore(true)
+    try {
+      const data = await couponApi.getCoupons(nextCursor)
+      setCoupons((prev) => [...prev, ...data.coupons])
+      setNextCursor(data.next_cursor)
     } catch (error) {
       console.error('Error fetching coupons:', error)
       alert('Failed to fetch coupons')
+    } finally {
+      setLoadingMore(false)
     }
   }
 
@@ -256,6 +289,11 @@ const Coupon = ({ theme }) => {
             ))}
           </tbody>
         </Table>
+        {nextCursor && (
+          <LoadMoreButton onClick={loadMoreCoupons} disabled={loadingMore}>
+            {loadingMore ? 'Yükleniyor...' : 'Daha Fazla Yükle'}
+          </LoadMoreButton>
+        )}
       </TableWrapper>
 
       {isCreateModalOpen && (
@@ -9,8 +9,12 @@ const getAuthHeader = () => ({
 })
 
 export const couponApi = {
-  getCoupons: async () => {
-    const response = await axios.get(`${BASE_URL}/coupons/all`, getAuthHeader())
+  // Kuponlar sayfa sayfa gelir; sonraki sayfanın cursor'ı yanıttaki next_cursor alanında
+  getCoupons: async (cursor = null) => {
+    const response = await axios.get(`${BASE_URL}/coupons/all`, {
+      ...getAuthHeader(),
+      params: cursor ? { cursor } : {},
+    })
     return response.data
   },
 
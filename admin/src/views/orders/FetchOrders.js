@@ -59,7 +59,8 @@ export const buildPayload = (
   }
 }
 
-export const fetchOrders = async () => {
+// Siparişler sayfa sayfa gelir; sonraki sayfanın cursor'ı X-Next-Cursor header'ında
+export const fetchOrders = async (cursor = null) => {
   const BASE_URL = process.env.REACT_APP_API_URL
   const token = localStorage.getItem('token')
 
@@ -68,8 +69,12 @@ export const fetchOrders = async () => {
       headers: {
         Authorization: `Bearer ${token}`,
       },
+      params: cursor ? { cursor } : {},
     })
-    return response.data
+    return {
+      orders: response.data,
+      nextCursor: response.headers['x-next-cursor'] || null,
+    }
   } catch (error) {
     console.error('Error fetching orders:', error)
     throw error
@@ -102,11 +102,38 @@ const AddOrderButton = styled.button`
   }
 `
 
+const LoadMoreButton = styled.button`
+  display: block;
+  margin: 1.5rem auto 0;
+  background-color: #3498db;
+  color: white;
+  border: none;
+  padding: 0.5rem 1.5rem;
+  border-radius: 4px;
+  cursor: pointer;
+  transition: background-color 0.3s ease;
+
+  &:hover {
+    background-color: #2980b9;
+  }
+
+  &:disabled {
+    background-color: #95a5a6;
+    cursor: default;
+  }
+`
+
 const ButtonContainer = styled.div`
   display: flex;
   align-items: center;
 `
 
+const HIDDEN_STATUSES = ['Sipariş Bekleniyor', 'Sipariş Oluşturuldu']
+
+// Filtre butonu kapalıyken bekleyen siparişler gizlenir
+const applyFilter = (list, showAll) =>
+  showAll ? list : list.filter((order) => !HIDDEN_STATUSES.includes(order.status))
+
 const Orders = () => {
   const [orders, setOrders] = useState([])
   const [filteredOrders, setFilteredOrders] = useState([])
@@ -115,6 +142,8 @@ const Orders = () => {
   const [theme, setTheme] = useState('light')
   const [isFilterActive, setIsFilterActive] = useState(false)
   const [isOrderCreateOpen, setIsOrderCreateOpen] = useState(false)
+  const [nextCursor, setNextCursor] = useState(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     const currentTheme = localStorage.getItem('coreui-free-react-admin-template-theme') || 'light'
@@ -123,14 +152,12 @@ const Orders = () => {
     const loadOrders = async () => {
       try {
         const token = localStorage.getItem('token')
-        const data = await fetchOrders(token)
+        const { orders: data, nextCursor: cursor } = await fetchOrders()
         setOrders(data)
+        setNextCursor(cursor)
 
         // Default filtering
-        const filtered = data.filter(
-          (order) => !['Sipariş Bekleniyor', 'Sipariş Oluşturuldu'].includes(order.status),
-        )
-        setFilteredOrders(filtered)
+        setFilteredOrders(applyFilter(data, false))
         setLoading(false)
       } catch (err) {
         setError(err)
@@ -143,16 +170,21 @@ const Orders = () => {
 
   const toggleFilter = () => {
     setIsFilterActive(!isFilterActive)
+    setFilteredOrders(applyFilter(orders, !isFilterActive))
+  }
 
-    if (isFilterActive) {
-      // Apply filter
-      const filtered = orders.filter(
-        (order) => !['Sipariş Bekleniyor', 'Sipariş Oluşturuldu'].includes(order.status),
-      )
-      setFilteredOrders(filtered)
-    } else {
-      // Remove filter
-      setFilteredOrders(orders)
+  const loadMoreOrders = async () => {
+    setLoadingMore(true)
+    try {
+      const { orders: data, nextCursor: cursor } = await fetchOrders(nextCursor)
+      const allOrders = [...orders, ...data]
+      setOrders(allOrders)
+      setFilteredOrders(applyFilter(allOrders, isFilterActive))
+      setNextCursor(cursor)
+    } catch (err) {
+      setError(err)
+    } finally {
+      setLoadingMore(false)
     }
   }
 
@@ -187,6 +219,11 @@ const Orders = () => {
           <AddOrderButton onClick={() => setIsOrderCreateOpen(true)}>Sipariş Ekle</AddOrderButton>
         </ButtonContainer>
         <OrderTable orders={filteredOrders} theme={theme} originalOrders={orders} />
+        {nextCursor && (
+          <LoadMoreButton onClick={loadMoreOrders} disabled={loadingMore}>
+            {loadingMore ? 'Yükleniyor...' : 'Daha Fazla Yükle'}
+          </LoadMoreButton>
+        )}
 
         <OrderCreate isOpen={isOrderCreateOpen} onClose={handleOrderCreateClose} theme={theme} />
       </PageContainer>
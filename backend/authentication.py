@@ -4,14 +4,16 @@ import jwt
 from dotenv import dotenv_values
 from models import User
 from fastapi import status
+from helpers.executor import offload
 
 config_credential = dotenv_values(".env")
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def get_hashed_password(password):
-    return pwd_context.hash(password)
+async def get_hashed_password(password):
+    # bcrypt CPU-bound; event loop'u bloklamaması için havuzda çalışır
+    return await offload("bcrypt", pwd_context.hash, password)
 
 
 async def very_token(token: str):
@@ -28,7 +30,7 @@ async def very_token(token: str):
 
 
 async def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return await offload("bcrypt", pwd_context.verify, plain_password, hashed_password)
 
 
 async def authenticate_user(email, password):
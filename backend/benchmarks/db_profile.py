@@ -0,0 +1,144 @@
+"""
+SQLite profil karşılaştırması: aynı karışık yükü (transaction içinde sipariş
+ve günlük özet yazan yazarlar + admin sipariş listesi sorgusu yapan
+okuyucular) her profil için geçici bir veritabanında çalıştırır ve saniyedeki
+işlem sayısını ve okuma gecikmesini yazdırır.
+
+Tortoise her bağlantıdaki sorguları tek bir kilitle sıralar ve açık bir
+transaction bu kilidi commit'e kadar tutar. Tek bağlantılı profilde okuyucular
+her yazma transaction'ını bekler; okuma ayrımı olan profilde okumalar WAL
+sayesinde ayrı bağlantılarda devam eder. "production-nosplit" aynı
+pragma'ları okuma ayrımı olmadan ölçer.
+
+    cd backend && python -m benchmarks.db_profile --seconds 10 --readers 8 --writers 2
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from tortoise import Tortoise
+
+from tortoise.transactions import in_transaction
+
+from helpers.database import DB_READERS, WRITER, read_only, tortoise_config
+
+# (ad, profil, okuma bağlantısı sayısı; None ise --pool)
+VARIANTS = {
+    "default": ("default", 0),
+    "production-nosplit": ("production", 0),
+    "production": ("production", None),
+}
+
+
+async def seed(count: int):
+    from models import Order
+
+    statuses = ["Sipariş Bekleniyor", "Sipariş Oluşturuldu", "Kargoda", "Teslim Edildi"]
+    await Order.bulk_create(
+        [
+            Order(
+                customer_name=f"Müşteri {i}",
+                customer_id=i % 500,
+                status=statuses[i % len(statuses)],
+                receiver_city="İstanbul" if i % 3 else "Ankara",
+                order_price=100 + i % 50,
+            )
+            for i in range(count)
+        ],
+        batch_size=1000,
+    )
+
+
+async def reader(deadline: float, counter: list, latencies: list):
+    from models import Order
+
+    await read_only()
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await Order.filter(status="Kargoda").order_by("-date", "-id").limit(50).values(
+            "id", "customer_name", "order_price", "date"
+        )
+        await Order.filter(customer_id=counter[0] % 500).count()
+        latencies.append(time.perf_counter() - started)
+        counter[0] += 1
+
+
+async def writer(deadline: float, counter: list, hold: float):
+    from helpers.stats import record_order_created, record_order_updated, order_snapshot
+    from models import Order
+
+    while time.perf_counter() < deadline:
+        # Sipariş ve günlük özet aynı transaction'da yazılır (uygulamadaki gibi)
+        async with in_transaction(WRITER):
+            order = await Order.create(customer_name="Yük", customer_id=1, order_price=10)
+            await record_order_created(order)
+            if hold:
+                # Transaction içinde yapılan diğer işler (fiyatlama, dosya vb.)
+                await asyncio.sleep(hold)
+            before = order_snapshot(order)
+            order.status = "Kargoda"
+            await order.save(update_fields=["status"])
+            await record_order_updated(before, order)
+        counter[0] += 1
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_variant(name: str, args) -> dict:
+    profile, pool = VARIANTS[name]
+    directory = tempfile.mkdtemp(prefix="db_profile_")
+    path = os.path.join(directory, "bench.sqlite3")
+    await Tortoise.init(config=tortoise_config(profile, path, args.pool if pool is None else pool))
+    await Tortoise.generate_schemas()
+    await seed(args.seed)
+
+    reads, writes, latencies = [0], [0], []
+    deadline = time.perf_counter() + args.seconds
+    await asyncio.gather(
+        *[reader(deadline, reads, latencies) for _ in range(args.readers)],
+        *[writer(deadline, writes, args.hold_ms / 1000) for _ in range(args.writers)],
+    )
+    await Tortoise.close_connections()
+
+    return {
+        "name": name,
+        "reads_per_sec": reads[0] / args.seconds,
+        "writes_per_sec": writes[0] / args.seconds,
+        "read_p50_ms": percentile(latencies, 0.5) * 1000,
+        "read_p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def main(args):
+    results = [await run_variant(name, args) for name in args.variants]
+    base = results[0]
+    for result in results:
+        print(
+            f"{result['name']:<19} reads/s={result['reads_per_sec']:>8.1f} "
+            f"writes/s={result['writes_per_sec']:>7.1f} "
+            f"read p50={result['read_p50_ms']:>6.1f}ms p99={result['read_p99_ms']:>6.1f}ms "
+            f"read x{result['reads_per_sec'] / (base['reads_per_sec'] or 1):.2f} "
+            f"write x{result['writes_per_sec'] / (base['writes_per_sec'] or 1):.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=8, help="eşzamanlı okuyucu görev sayısı")
+    parser.add_argument("--writers", type=int, default=2, help="eşzamanlı yazar görev sayısı")
+    parser.add_argument("--pool", type=int, default=DB_READERS, help="okuma bağlantısı sayısı")
+    parser.add_argument("--seed", type=int, default=20000, help="başlangıç sipariş sayısı")
+    parser.add_argument(
+        "--hold-ms", type=float, default=5,
+        help="yazma transaction'ı içinde geçen ek süre (ms)",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,477 @@
+"""
+Sık kullanılan endpoint'ler için yük testi: geçici bir SQLite veritabanını
+gerçekçi hacimlerle doldurur, uygulamayı süreç içinde (ASGI) ya da uvicorn
+üzerinden eşzamanlı istemcilerle çalıştırır ve her endpoint için p50/p95/p99
+gecikme ile saniyedeki istek sayısını JSON olarak yazdırır.
+
+    cd backend && python -m benchmarks.load --users 100000 --orders 1000000 \\
+        --requests 2000 --concurrency 32 --output sonuc.json
+
+Aynı veri setiyle tekrar ölçmek için --workdir verilir; içinde veritabanı
+varsa yeniden doldurulmaz.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import secrets
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytz
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_PASSWORD = "bench-password"
+STATUSES = ["Sipariş Bekleniyor", "Sipariş Oluşturuldu", "Kargoda", "Teslim Edildi"]
+ENVELOPE_TEXT = (
+    "<p>Merhaba, umarım iyisindir. Buradan herkes selam söylüyor; "
+    "mektubunu aldığımızda çok sevindik. Görüşmek dileğiyle.</p>"
+)
+BATCH_SIZE = 10000
+TOKEN_USERS = 500  # /profile için token üretilen kullanıcı sayısı
+SCENARIOS = (
+    "login", "profile", "admin_orders", "status", "photo_upload", "coupons_all",
+    "cities", "towns", "jails", "towns_by_city", "jails_by_city",
+)
+
+
+def prepare_workdir(args) -> str:
+    """
+    Uygulama modülleri .env'yi çalışma dizininden okuduğu için geçici bir
+    dizin hazırlanır; backend/.env varsa kopyalanıp DB ayarları ezilir.
+    """
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_")
+    os.makedirs(os.path.join(workdir, "static"), exist_ok=True)
+
+    settings = {}
+    source_env = os.path.join(BACKEND_DIR, ".env")
+    if os.path.exists(source_env):
+        from dotenv import dotenv_values
+
+        settings.update(dotenv_values(source_env))
+    settings.setdefault("SECRET", secrets.token_hex(32))
+    settings["DB_PATH"] = os.path.join(workdir, "bench.sqlite3")
+    settings["DB_PROFILE"] = args.profile
+    with open(os.path.join(workdir, ".env"), "w") as file:
+        for key, value in settings.items():
+            file.write(f"{key}={value}\n")
+
+    os.chdir(workdir)
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    return workdir
+
+
+async def bulk_insert(model, rows, total: int):
+    from tortoise.transactions import in_transaction
+
+    from helpers.database import WRITER
+
+    batch = []
+    async with in_transaction(WRITER):
+        for row in rows:
+            batch.append(model(**row))
+            if len(batch) >= BATCH_SIZE:
+                await model.bulk_create(batch)
+                batch = []
+        if batch:
+            await model.bulk_create(batch)
+    print(f"  {model.__name__}: {total}", file=sys.stderr)
+
+
+async def seed(args):
+    from tortoise import Tortoise
+
+    from authentication import pwd_context
+    from helpers.database import WRITER
+    from models import City, Coupons, Jail, Order, Town, User
+
+    rng = random.Random(args.random_seed)
+    # Sipariş tarihleri uygulamadaki gibi UTC yazılır
+    now = datetime.now(pytz.utc)
+
+    # bcrypt pahalı; tüm kullanıcılar aynı hash'i paylaşır
+    password = pwd_context.hash(BENCH_PASSWORD)
+    await bulk_insert(
+        User,
+        (
+            {
+                "id": i,
+                "name": f"Ad{i}",
+                "surname": f"Soyad{i}",
+                "email": f"user{i}@bench.local",
+                "phone_number": f"5{i:09d}",
+                "password": password,
+                "is_verified": True,
+                "privilege": "Admin" if i == 1 else "Müşteri",
+                "join_date": now - timedelta(minutes=i),
+            }
+            for i in range(1, args.users + 1)
+        ),
+        args.users,
+    )
+
+    await bulk_insert(
+        City,
+        (
+            {"city_id": i, "country_id": 1, "city_name": f"Şehir {i}", "plate_no": i, "phone_code": f"{200 + i}"}
+            for i in range(1, args.cities + 1)
+        ),
+        args.cities,
+    )
+    towns = args.cities * args.towns_per_city
+    await bulk_insert(
+        Town,
+        (
+            {"town_id": i + 1, "city_id": i // args.towns_per_city + 1, "town_name": f"İlçe {i + 1}"}
+            for i in range(towns)
+        ),
+        towns,
+    )
+    jails = args.cities * args.jails_per_city
+    await bulk_insert(
+        Jail,
+        (
+            {
+                "id": i + 1,
+                "city_id": i // args.jails_per_city + 1,
+                "name": f"Cezaevi {i + 1}",
+                "address": f"Cezaevi Yolu No:{i + 1}",
+                "type": i % 3,
+            }
+            for i in range(jails)
+        ),
+        jails,
+    )
+
+    span = timedelta(days=730).total_seconds()
+    await bulk_insert(
+        Order,
+        (
+            {
+                "date": now - timedelta(seconds=span * (args.orders - i) / args.orders),
+                "customer_name": f"Ad{customer_id} Soyad{customer_id}",
+                "customer_id": customer_id,
+                "receiver_name": "Alıcı",
+                "receiver_city": f"Şehir {rng.randint(1, args.cities)}",
+                "jail_name": f"Cezaevi {rng.randint(1, jails)}",
+                "status": rng.choice(STATUSES),
+                "order_price": rng.randint(5000, 50000) / 100,
+                "envelope_text": ENVELOPE_TEXT * rng.randint(1, 5),
+            }
+            for i, customer_id in enumerate(
+                (rng.randint(1, args.users) for _ in range(args.orders))
+            )
+        ),
+        args.orders,
+    )
+
+    await bulk_insert(
+        Coupons,
+        (
+            {
+                "id": i,
+                "coupon_code": f"BENCH{i:04d}",
+                "discount_rate": 10,
+                "discount_description": "Yük testi kuponu",
+                "is_active": i % 4 != 0,
+                "start_date": datetime.now(pytz.utc) - timedelta(days=30),
+                "end_date": datetime.now(pytz.utc) + timedelta(days=30 - i % 60),
+            }
+            for i in range(1, args.coupons + 1)
+        ),
+        args.coupons,
+    )
+    # Kupon ↔ kullanıcı ara tablosu doğrudan doldurulur
+    users_field = Coupons._meta.fields_map["users"]
+    sql = (
+        f'INSERT INTO "{users_field.through}" '
+        f'("{users_field.backward_key}", "{users_field.forward_key}") VALUES (?, ?)'
+    )
+    conn = Tortoise.get_connection(WRITER)
+    per_coupon = min(args.coupon_users, args.users)
+    for coupon_id in range(1, args.coupons + 1):
+        user_ids = rng.sample(range(1, args.users + 1), per_coupon)
+        await conn.execute_many(sql, [[coupon_id, user_id] for user_id in user_ids])
+    print(f"  coupon users: {args.coupons * per_coupon}", file=sys.stderr)
+
+
+async def prepare_database(args, db_path: str) -> bool:
+    """Şemayı oluşturur; veritabanı boşsa doldurur. Doldurulduysa True döner."""
+    from tortoise import Tortoise
+
+    from helpers.database import tortoise_config
+    from helpers.migrations import run_migrations
+    from models import User
+
+    await Tortoise.init(config=tortoise_config())
+    try:
+        await run_migrations()
+        if await User.exists():
+            return False
+        print(f"Seeding {db_path}", file=sys.stderr)
+        await seed(args)
+        return True
+    finally:
+        await Tortoise.close_connections()
+
+
+def make_tokens(args) -> dict:
+    # token_generator ile aynı içerik; bcrypt doğrulaması atlanır
+    import jwt
+    from dotenv import dotenv_values
+
+    secret = dotenv_values(".env")["SECRET"]
+    rng = random.Random(args.random_seed + 1)
+    user_ids = rng.sample(range(1, args.users + 1), min(TOKEN_USERS, args.users))
+
+    def token(user_id):
+        return jwt.encode({"id": user_id, "email": f"user{user_id}@bench.local"}, secret, algorithm="HS256")
+
+    return {"admin": token(1), "users": [token(user_id) for user_id in user_ids]}
+
+
+def jpeg_bytes() -> bytes:
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), (180, 120, 60)).save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def build_scenarios(args, tokens: dict) -> dict:
+    """Her senaryo, rastgele bir istek (method, url, kwargs) üreten bir fonksiyondur."""
+    rng = random.Random(args.random_seed + 2)
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    photo = jpeg_bytes()
+
+    def user_headers():
+        return {"Authorization": f"Bearer {rng.choice(tokens['users'])}"}
+
+    def login():
+        user_id = rng.randint(1, args.users)
+        return "POST", "/login", {"json": {"email": f"user{user_id}@bench.local", "password": BENCH_PASSWORD}}
+
+    def admin_orders():
+        params = {"limit": 50}
+        if rng.random() < 0.5:
+            params["status"] = rng.choice(STATUSES)
+        return "GET", "/admin/orders", {"params": params, "headers": admin}
+
+    def photo_upload():
+        order_id = rng.randint(1, args.orders)
+        return "POST", "/photo", {
+            "params": {"order_id": order_id},
+            "files": [("files", ("bench.jpg", photo, "image/jpeg"))],
+            "headers": admin,
+        }
+
+    return {
+        "login": login,
+        "profile": lambda: ("GET", "/profile", {"headers": user_headers()}),
+        "admin_orders": admin_orders,
+        "status": lambda: ("GET", "/status", {"headers": admin}),
+        "photo_upload": photo_upload,
+        "coupons_all": lambda: ("GET", "/coupons/all", {"headers": admin}),
+        "cities": lambda: ("GET", "/cities", {"headers": user_headers()}),
+        "towns": lambda: ("GET", "/towns", {"headers": user_headers()}),
+        "jails": lambda: ("GET", "/jails", {"headers": user_headers()}),
+        "towns_by_city": lambda: (
+            "GET", f"/towns/city/{rng.randint(1, args.cities)}", {"headers": user_headers()}
+        ),
+        "jails_by_city": lambda: (
+            "GET", f"/jails/city/{rng.randint(1, args.cities)}", {"headers": user_headers()}
+        ),
+    }
+
+
+def summarize(latencies: list, errors: int, elapsed: float) -> dict:
+    result = {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+    }
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+        result.update(
+            {
+                "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+                "p50_ms": round(cuts[49] * 1000, 3),
+                "p95_ms": round(cuts[94] * 1000, 3),
+                "p99_ms": round(cuts[98] * 1000, 3),
+                "max_ms": round(max(latencies) * 1000, 3),
+            }
+        )
+    return result
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, args) -> dict:
+    for _ in range(args.warmup):
+        method, url, kwargs = make_request()
+        await client.request(method, url, **kwargs)
+
+    latencies, errors = [], [0]
+    remaining = [args.requests]
+    status_codes = {}
+
+    async def worker():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            method, url, kwargs = make_request()
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                await response.aread()
+            except httpx.HTTPError:
+                errors[0] += 1
+                continue
+            duration = time.perf_counter() - started
+            status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+            if response.status_code >= 400:
+                errors[0] += 1
+            else:
+                latencies.append(duration)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    result = summarize(latencies, errors[0], time.perf_counter() - started)
+    result["status_codes"] = {str(code): count for code, count in sorted(status_codes.items())}
+    return result
+
+
+async def run_in_process(args, scenarios: dict) -> dict:
+    import main
+
+    await main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=args.timeout) as client:
+            return {name: await run_scenario(client, scenarios[name], args) for name in args.endpoints}
+    finally:
+        await main.app.router.shutdown()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args, scenarios: dict) -> dict:
+    port = free_port()
+    env = {**os.environ, "PYTHONPATH": BACKEND_DIR}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            deadline = time.monotonic() + args.startup_timeout
+            while True:
+                try:
+                    if (await client.get("/")).status_code == 200:
+                        break
+                except httpx.HTTPError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.2)
+            return {name: await run_scenario(client, scenarios[name], args) for name in args.endpoints}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def main(args):
+    workdir = prepare_workdir(args)
+    db_path = os.path.join(workdir, "bench.sqlite3")
+
+    seed_started = time.perf_counter()
+    seeded = await prepare_database(args, db_path)
+    seed_seconds = time.perf_counter() - seed_started
+
+    scenarios = build_scenarios(args, make_tokens(args))
+    runner = run_in_process if args.mode == "asgi" else run_uvicorn
+    results = await runner(args, scenarios)
+
+    report = {
+        "meta": {
+            "started_at": datetime.now(pytz.utc).isoformat(),
+            "mode": args.mode,
+            "db_profile": args.profile,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "dataset": {
+                "users": args.users,
+                "orders": args.orders,
+                "cities": args.cities,
+                "towns": args.cities * args.towns_per_city,
+                "jails": args.cities * args.jails_per_city,
+                "coupons": args.coupons,
+                "users_per_coupon": min(args.coupon_users, args.users),
+            },
+            "seeded": seeded,
+            "seed_seconds": round(seed_seconds, 1),
+            "workdir": workdir,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output)
+
+    if not args.workdir and not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=["asgi", "uvicorn"], default="asgi", help="süreç içi ya da uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker sayısı")
+    parser.add_argument("--profile", default="production", help="DB_PROFILE")
+    parser.add_argument("--endpoints", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=1000, help="endpoint başına istek sayısı")
+    parser.add_argument("--concurrency", type=int, default=32, help="eşzamanlı istemci sayısı")
+    parser.add_argument("--warmup", type=int, default=10, help="ölçülmeyen ısınma istekleri")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--startup-timeout", type=float, default=120)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--cities", type=int, default=81)
+    parser.add_argument("--towns-per-city", type=int, default=12)
+    parser.add_argument("--jails-per-city", type=int, default=5)
+    parser.add_argument("--coupons", type=int, default=50)
+    parser.add_argument("--coupon-users", type=int, default=20000, help="kupon başına kullanıcı")
+    parser.add_argument("--random-seed", type=int, default=42)
+    parser.add_argument("--workdir", help="veritabanını saklamak/yeniden kullanmak için dizin")
+    parser.add_argument("--keep", action="store_true", help="geçici dizini silme")
+    parser.add_argument("--output", help="JSON raporun yazılacağı dosya")
+    args = parser.parse_args()
+    if args.output:
+        args.output = os.path.abspath(args.output)
+    if args.workdir:
+        args.workdir = os.path.abspath(args.workdir)
+
+    asyncio.run(main(args))
@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+
+from dotenv import dotenv_values
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from helpers.database import CACHE_TTL
+from helpers.executor import offload
+from models import Cardpostal
+
+config_credential = dotenv_values(".env")
+
+# Dosya sistemi ve diğer worker'lardaki bump()'lar görülebilsin diye indeks bu
+# aralıkla yeniden taranır; değişmeyen dosyaların hash'i yeniden hesaplanmaz
+CARDPOSTAL_INDEX_TTL = float(config_credential.get("CARDPOSTAL_INDEX_TTL") or CACHE_TTL)
+
+# ?v=<hash> ile istenen görseller hiç değişmeyeceği için uzun süre önbelleğe alınır
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, no-cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class ImageEntry:
+    path: str
+    size: int
+    mtime: float
+    digest: str
+    stat_result: os.stat_result = field(compare=False)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    @property
+    def version(self) -> str:
+        return self.digest[:16]
+
+    @property
+    def last_modified(self) -> str:
+        return formatdate(self.mtime, usegmt=True)
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def scan_image(path: str, previous: Optional[ImageEntry]) -> Optional[ImageEntry]:
+    """Dosyanın boyut/mtime bilgisini alır; değişmemişse hash'i yeniden hesaplamaz."""
+    stat_result = _stat(path)
+    if stat_result is None:
+        return None
+    if (
+        previous is not None
+        and previous.path == path
+        and previous.size == stat_result.st_size
+        and previous.mtime == stat_result.st_mtime
+    ):
+        return previous
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return ImageEntry(
+        path=path,
+        size=stat_result.st_size,
+        mtime=stat_result.st_mtime,
+        digest=digest.hexdigest(),
+        stat_result=stat_result,
+    )
+
+
+class CardpostalImageIndex:
+    """
+    Kartpostal id → (path, boyut, mtime, içerik hash'i) indeksi. Başlangıçta
+    oluşturulur; bump() ile ya da CARDPOSTAL_INDEX_TTL dolunca yenilenir.
+    İçerik değiştiğinde kayıtlı dinleyiciler (ör. katalog) haberdar edilir.
+    """
+
+    def __init__(self, ttl: float = CARDPOSTAL_INDEX_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._entries: Dict[int, ImageEntry] = {}
+        self._built = None  # (version, monotonic time)
+        self._lock = asyncio.Lock()
+        self._listeners: List[Callable[[], None]] = []
+
+    def on_change(self, listener: Callable[[], None]):
+        self._listeners.append(listener)
+
+    def bump(self):
+        self.version += 1
+
+    def _fresh(self) -> bool:
+        built = self._built
+        return (
+            built is not None
+            and built[0] == self.version
+            and time.monotonic() - built[1] < self.ttl
+        )
+
+    async def get(self) -> Dict[int, ImageEntry]:
+        if self._fresh():
+            return self._entries
+        async with self._lock:
+            if not self._fresh():
+                await self._rebuild()
+            return self._entries
+
+    async def _rebuild(self):
+        version = self.version
+        rows = await Cardpostal.all().values_list("id", "image_path")
+        entries = {}
+        for cardpostal_id, path in rows:
+            entry = await offload("fs", scan_image, path, self._entries.get(cardpostal_id))
+            if entry is not None:
+                entries[cardpostal_id] = entry
+
+        changed = entries != self._entries
+        self._entries = entries
+        self._built = (version, time.monotonic())
+        if changed:
+            for listener in self._listeners:
+                listener()
+
+    def url(self, cardpostal_id: int) -> str:
+        entry = self._entries.get(cardpostal_id)
+        path = f"/cardpostals/images/{cardpostal_id}"
+        return f"{path}?v={entry.version}" if entry else path
+
+    async def response(self, request: Request, cardpostal_id: int, v: str = None):
+        entry = (await self.get()).get(cardpostal_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Image not found")
+
+        # Dosya indeks taramaları arasında değişmiş olabilir; boyut/mtime
+        # tutmazsa eski ETag ve Content-Length ile gönderilmez, indeks yenilenir
+        stat_result = await offload("fs", _stat, entry.path)
+        if stat_result is None or (stat_result.st_size, stat_result.st_mtime) != (
+            entry.size,
+            entry.mtime,
+        ):
+            self.bump()
+            entry = (await self.get()).get(cardpostal_id)
+            if entry is None:
+                raise HTTPException(status_code=404, detail="Image not found")
+            stat_result = entry.stat_result
+
+        headers = {
+            "ETag": entry.etag,
+            "Last-Modified": entry.last_modified,
+            "Cache-Control": IMMUTABLE_CACHE if v == entry.version else REVALIDATE_CACHE,
+        }
+        if not_modified(request, entry):
+            return Response(status_code=304, headers=headers)
+        # Range / If-Range isteklerini FileResponse karşılar
+        return FileResponse(entry.path, stat_result=stat_result, headers=headers)
+
+
+def not_modified(request: Request, entry: ImageEntry) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags or f"W/{entry.etag}" in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(entry.mtime) <= since
+    return False
+
+
+cardpostal_images = CardpostalImageIndex()
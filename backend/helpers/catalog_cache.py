@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+from fastapi import Request
+
+from helpers.cardpostal_images import cardpostal_images
+from helpers.database import CACHE_TTL
+from helpers.http_cache import CachedPayload, payload_response
+from models import *
+
+
+async def _dump(pydantic_model, queryset) -> list:
+    return [item.model_dump(mode="json") for item in await pydantic_model.from_queryset(queryset)]
+
+
+async def build_catalog() -> dict:
+    """
+    Sipariş sihirbazının fiyatlandırma için ihtiyaç duyduğu tüm tablolar.
+    Her bölüm ilgili tekil endpoint'in döndüğü biçimle aynıdır.
+    """
+    prices = await _dump(prices_pydantic, Prices.all())
+    for price in prices:
+        price["price_value"] = float(price["price_value"])
+
+    cardpostals = await Cardpostal.all().order_by("id").values("id", "name", "category__name")
+    # Görsel URL'leri içerik hash'i ile sürümlenir
+    await cardpostal_images.get()
+
+    return {
+        "envelope_colors": await _dump(envelope_color_pydantic, EnvelopeColors.all()),
+        "paper_colors": await _dump(paper_color_pydantic, PaperColors.all()),
+        "envelope_smell": await _dump(envelope_smell_pydantic, EnvelopeSmell.all()),
+        "shipment_type": await _dump(shipment_type_pydantic, ShipmentType.all()),
+        "prices": prices,
+        "features": await _dump(features_pydantic, Features.all()),
+        "cardpostals": [
+            {
+                "name": cardpostal["name"],
+                "image_path": cardpostal_images.url(cardpostal["id"]),
+                "category": cardpostal["category__name"],
+            }
+            for cardpostal in cardpostals
+        ],
+        "schemas": await _dump(EnvelopeSchemasOut_Pydantic, EnvelopeSchemas.all()),
+    }
+
+
+class CatalogCache:
+    """
+    /catalog için önceden serileştirilmiş ve sıkıştırılmış yanıt.
+    Katalog tablolarını değiştiren admin route'ları bump() çağırır; diğer
+    worker'lardaki değişiklikler için yanıt ttl dolunca da yeniden üretilir.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._entry = None  # (version, CachedPayload)
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        entry = self._entry
+        return (
+            entry is not None
+            and entry[0] == self.version
+            and time.monotonic() - self._built_at < self.ttl
+        )
+
+    async def get(self):
+        if self._fresh():
+            return self._entry
+        async with self._lock:
+            if not self._fresh():
+                # Görsel indeksi yenilenirken on_change sürümü artırabilir;
+                # sürüm ondan sonra okunmazsa yeni katalog eski sürümle kaydedilir
+                await cardpostal_images.get()
+                version = self.version
+                payload = CachedPayload(
+                    {"version": version, **(await build_catalog())}
+                )
+                # gzip gövdesi rebuild sırasında üretilir, istek yolunda değil
+                payload.gzip_body
+                self._entry = (version, payload)
+                self._built_at = time.monotonic()
+            return self._entry
+
+    def bump(self):
+        self.version += 1
+
+    async def response(self, request: Request):
+        version, payload = await self.get()
+        return payload_response(
+            request, payload, {"X-Catalog-Version": str(version)}, compress=True
+        )
+
+
+catalog = CatalogCache()
+# Kartpostal görselleri değişince katalogdaki URL'ler de yenilenir
+cardpostal_images.on_change(catalog.bump)
@@ -0,0 +1,169 @@
+import zlib
+
+from dotenv import dotenv_values
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from helpers.static_assets import accepted_encodings
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse sadece gzip kullanılır
+    brotli = None
+
+config_credential = dotenv_values(".env")
+
+# Bu boyutun altındaki gövdeler sıkıştırılmaz (byte)
+COMPRESS_MIN_SIZE = int(config_credential.get("COMPRESS_MIN_SIZE") or 1024)
+GZIP_LEVEL = int(config_credential.get("COMPRESS_GZIP_LEVEL") or 6)
+BROTLI_QUALITY = int(config_credential.get("COMPRESS_BROTLI_QUALITY") or 4)
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+
+
+def is_compressible_type(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type.endswith("+json")
+        or media_type in COMPRESSIBLE_TYPES
+    )
+
+
+def choose_encoding(accept_encoding: str):
+    accepted = accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+COMPRESSORS = {"gzip": _GzipCompressor, "br": _BrotliCompressor}
+
+
+class CompressionMiddleware:
+    """
+    Yanıtları istemcinin kabul ettiği kodlamaya göre (brotli, yoksa gzip)
+    sıkıştırır. Zaten kodlanmış (ör. önceden sıkıştırılmış statik dosya),
+    kısmi (206 / Content-Range), sıkıştırılamaz türdeki ya da
+    COMPRESS_MIN_SIZE altındaki gövdelere dokunmaz. Akış halindeki
+    yanıtlar parça parça sıkıştırılır.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESS_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self.app, encoding, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app: ASGIApp, encoding: str, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start_message: Message = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Gövdenin ilk parçası gelene kadar header'lar bekletilir
+            self.start_message = message
+            return
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            headers = Headers(raw=self.start_message["headers"])
+            if (
+                "content-encoding" in headers
+                # Range yanıtları byte aralığına aittir; sıkıştırılırsa bozulur
+                or self.start_message["status"] == 206
+                or "content-range" in headers
+                or not is_compressible_type(headers.get("content-type", ""))
+                or (not more_body and len(body) < self.minimum_size)
+            ):
+                self.passthrough = True
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.compressor = COMPRESSORS[self.encoding]()
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            # Statik dosyalar Vary'yi zaten ekliyor; aynı değer tekrarlanmaz
+            vary = {token.strip().lower() for token in headers.get("vary", "").split(",")}
+            if "accept-encoding" not in vary:
+                headers.add_vary_header("Accept-Encoding")
+            # ETag sıkıştırılmamış gövdeye ait; farklı byte'lar için zayıflatılır
+            if "etag" in headers and not headers["etag"].startswith("W/"):
+                headers["ETag"] = "W/" + headers["etag"]
+            if more_body:
+                del headers["Content-Length"]
+                await self.send(self.start_message)
+            else:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self.send(
+            {"type": "http.response.body", "body": chunk, "more_body": more_body}
+        )
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from dotenv import dotenv_values
+
+from models import Coupons
+
+config_credential = dotenv_values(".env")
+logger = logging.getLogger(__name__)
+
+# Süresi dolan kuponları pasife çeken görevin çalışma aralığı (saniye)
+COUPON_SWEEP_INTERVAL = int(config_credential.get("COUPON_SWEEP_INTERVAL") or 300)
+
+_sweeper_task = None
+
+
+def coupon_is_active(coupon: Coupons, now: datetime = None) -> bool:
+    """Kuponun şu an kullanılabilir olup olmadığını yazma yapmadan hesaplar."""
+    now = now or datetime.now(timezone.utc)
+    return coupon.is_active and coupon.start_date <= now <= coupon.end_date
+
+
+async def expire_coupons() -> int:
+    """Bitiş tarihi geçmiş kuponları tek bir UPDATE ile pasife çeker."""
+    return await Coupons.filter(
+        is_active=True, end_date__lt=datetime.now(timezone.utc)
+    ).update(is_active=False)
+
+
+async def _sweep_forever():
+    while True:
+        try:
+            expired = await expire_coupons()
+            if expired:
+                logger.info("Deactivated %s expired coupons", expired)
+        except Exception:
+            logger.exception("Coupon sweep failed")
+        await asyncio.sleep(COUPON_SWEEP_INTERVAL)
+
+
+def start_coupon_sweeper():
+    global _sweeper_task
+    if _sweeper_task is None:
+        _sweeper_task = asyncio.create_task(_sweep_forever())
+
+
+async def stop_coupon_sweeper():
+    global _sweeper_task
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        try:
+            await _sweeper_task
+        except asyncio.CancelledError:
+            pass
+        _sweeper_task = None
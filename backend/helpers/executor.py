@@ -0,0 +1,125 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from dotenv import dotenv_values
+
+config_credential = dotenv_values(".env")
+
+
+class WorkPool:
+    """
+    Belirli bir iş türü (bcrypt, görsel, dosya sistemi) için sınırlı havuz.
+    Aynı anda çalışabilecek iş sayısı semaphore ile sınırlandırılır; kuyruk
+    derinliği ve bekleme süresi metrikleri tutulur.
+    """
+
+    def __init__(self, name: str, factory, max_workers: int, max_concurrency: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._factory = factory
+        self._executor: Executor = None
+        self._semaphore: asyncio.Semaphore = None
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = self._factory(max_workers=self.max_workers)
+        return self._executor
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, fn, *args, **kwargs):
+        enqueued_at = time.perf_counter()
+        self.queued += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queued -= 1
+        wait = time.perf_counter() - enqueued_at
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, partial(fn, *args, **kwargs)
+            )
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.queued,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": (self.total_wait / self.completed * 1000) if self.completed else 0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+def _setting(name: str, default: int) -> int:
+    return int(config_credential.get(name) or default)
+
+
+POOLS = {
+    # bcrypt CPU-bound ama GIL'i bırakıyor; thread havuzu yeterli
+    "bcrypt": WorkPool(
+        "bcrypt", ThreadPoolExecutor,
+        max_workers=_setting("BCRYPT_WORKERS", 4),
+        max_concurrency=_setting("BCRYPT_CONCURRENCY", 4),
+    ),
+    # Pillow ile yeniden boyutlandırma ayrı süreçlerde çalışır
+    "image": WorkPool(
+        "image", ProcessPoolExecutor,
+        max_workers=_setting("IMAGE_WORKERS", 2),
+        max_concurrency=_setting("IMAGE_CONCURRENCY", 4),
+    ),
+    # Kısa süreli bloklayan dosya sistemi işlemleri
+    "fs": WorkPool(
+        "fs", ThreadPoolExecutor,
+        max_workers=_setting("FS_WORKERS", 8),
+        max_concurrency=_setting("FS_CONCURRENCY", 16),
+    ),
+}
+
+
+async def offload(kind: str, fn, *args, **kwargs):
+    """fn'i verilen türün havuzunda, event loop'u bloklamadan çalıştırır."""
+    return await POOLS[kind].run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+def shutdown_executors():
+    for pool in POOLS.values():
+        pool.shutdown()
@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+
+from fastapi import Request, Response
+
+from helpers.responses import dumps
+
+
+def json_bytes(data) -> bytes:
+    return dumps(data)
+
+
+class CachedPayload:
+    """Önceden serileştirilmiş JSON gövdesi ve ondan türetilen güçlü ETag."""
+
+    __slots__ = ("body", "etag", "_gzip_body")
+
+    def __init__(self, data):
+        self.body = json_bytes(data)
+        self.etag = f'"{hashlib.sha1(self.body).hexdigest()}"'
+        self._gzip_body = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        # Sıkıştırılmış gövde ilk ihtiyaçta bir kez üretilir
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=9)
+        return self._gzip_body
+
+
+def gzip_etag(etag: str) -> str:
+    # Sıkıştırılmış gövde farklı byte'lar olduğu için ayrı bir ETag taşır
+    return etag[:-1] + '-gzip"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Sıkıştırma middleware'i ETag'i zayıflatabilir (W/"..."); karşılaştırma zayıf yapılır
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags or gzip_etag(etag) in tags
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "")
+
+
+def payload_response(
+    request: Request,
+    payload: CachedPayload,
+    headers: dict = None,
+    compress: bool = False,
+) -> Response:
+    """ETag eşleşirse 304, aksi halde önceden serileştirilmiş gövdeyi döner."""
+    use_gzip = compress and accepts_gzip(request)
+    headers = {
+        "ETag": gzip_etag(payload.etag) if use_gzip else payload.etag,
+        "Cache-Control": "private, no-cache",
+        **(headers or {}),
+    }
+    if compress:
+        headers["Vary"] = "Accept-Encoding"
+    if etag_matches(request, payload.etag):
+        return Response(status_code=304, headers=headers)
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(
+            content=payload.gzip_body, media_type="application/json", headers=headers
+        )
+    return Response(content=payload.body, media_type="application/json", headers=headers)
@@ -0,0 +1,55 @@
+import logging
+import os
+
+from PIL import Image, ImageOps
+
+from helpers.executor import offload
+
+logger = logging.getLogger(__name__)
+
+# Sipariş fotoğrafları için üretilen sabit boyutlar (en uzun kenar, px)
+DERIVATIVE_SIZES = {
+    "thumbnail": (320, 320),
+    "preview": (1280, 1280),
+}
+DERIVATIVE_QUALITY = 80
+
+def derivative_path(path: str, kind: str) -> str:
+    return f"{path}.{kind}.jpg"
+
+
+def make_derivatives(path: str) -> dict:
+    """
+    Orijinal fotoğraftan thumbnail ve preview JPEG'lerini üretir.
+    "image" havuzunda (ayrı süreç) çalışır; bu yüzden modül seviyesinde
+    tanımlı olmalı.
+    """
+    paths = {}
+    with Image.open(path) as img:
+        # Telefon fotoğraflarındaki EXIF yönünü uygula
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        for kind, size in DERIVATIVE_SIZES.items():
+            derivative = img.copy()
+            derivative.thumbnail(size, Image.LANCZOS)
+            target = derivative_path(path, kind)
+            derivative.save(target, "JPEG", quality=DERIVATIVE_QUALITY, optimize=True)
+            paths[kind] = target
+    return paths
+
+
+async def create_derivatives(path: str) -> dict:
+    """Türev görselleri ayrı süreçte üretir; hata olursa boş sözlük döner."""
+    try:
+        return await offload("image", make_derivatives, path)
+    except Exception:
+        logger.exception("Could not create derivatives for %s", path)
+        return {}
+
+
+def remove_derivatives(path: str):
+    for kind in DERIVATIVE_SIZES:
+        target = derivative_path(path, kind)
+        if os.path.exists(target):
+            os.remove(target)
@@ -0,0 +1,247 @@
+import functools
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import dotenv_values
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+config_credential = dotenv_values(".env")
+
+# Kapalıyken middleware eklenmez ve sorgu fonksiyonları sarılmaz
+METRICS_ENABLED = (config_credential.get("METRICS_ENABLED") or "false").lower() in ("1", "true", "yes")
+# Verilirse /metrics "Authorization: Bearer <token>" ister
+METRICS_TOKEN = config_credential.get("METRICS_TOKEN")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Route'a eşleşmeyen istekler (404) tek etiket altında toplanır
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self, name: str, labels: str) -> list:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RequestStats:
+    """Bir isteğin yürüttüğü sorgu sayısı ve toplam DB süresi."""
+
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+class RouteMetrics:
+    __slots__ = ("latency", "queries", "size", "db_time", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_time = 0.0
+        self.statuses: Dict[int, int] = {}
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Route şablonu (method, path) başına metrikler; Prometheus metin formatında sunulur."""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self.in_flight = 0
+        self.background_queries = 0
+        self.background_db_time = 0.0
+
+    def record_query(self, query: str, duration: float):
+        stats = _current_request.get()
+        if stats is None:
+            # Arka plan görevleri (outbox, kupon süpürücü, startup)
+            self.background_queries += 1
+            self.background_db_time += duration
+        else:
+            stats.queries += 1
+            stats.db_time += duration
+
+    def record_request(
+        self, method: str, route: str, status: int, duration: float, stats: RequestStats, size: int
+    ):
+        metrics = self.routes.get((method, route))
+        if metrics is None:
+            metrics = self.routes[(method, route)] = RouteMetrics()
+        metrics.latency.observe(duration)
+        metrics.queries.observe(stats.queries)
+        metrics.size.observe(size)
+        metrics.db_time += stats.db_time
+        metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def render(self) -> str:
+        families = {
+            "http_requests_total": ("counter", "Requests by route and status code.", []),
+            "http_request_duration_seconds": ("histogram", "Request latency by route.", []),
+            "http_request_db_queries": ("histogram", "ORM queries issued per request.", []),
+            "http_request_db_seconds_total": ("counter", "Time spent in ORM queries by route.", []),
+            "http_response_size_bytes": ("histogram", "Response body size sent by route.", []),
+        }
+        for (method, route), metrics in sorted(self.routes.items()):
+            labels = f'method="{_label(method)}",route="{_label(route)}"'
+            for status, count in sorted(metrics.statuses.items()):
+                families["http_requests_total"][2].append(
+                    f'http_requests_total{{{labels},status="{status}"}} {count}'
+                )
+            families["http_request_duration_seconds"][2].extend(
+                metrics.latency.render("http_request_duration_seconds", labels)
+            )
+            families["http_request_db_queries"][2].extend(
+                metrics.queries.render("http_request_db_queries", labels)
+            )
+            families["http_request_db_seconds_total"][2].append(
+                f"http_request_db_seconds_total{{{labels}}} {metrics.db_time}"
+            )
+            families["http_response_size_bytes"][2].extend(
+                metrics.size.render("http_response_size_bytes", labels)
+            )
+        families["http_requests_in_flight"] = ("gauge", "Requests currently being served.", [
+            f"http_requests_in_flight {self.in_flight}"
+        ])
+        families["db_background_queries_total"] = ("counter", "ORM queries outside requests.", [
+            f"db_background_queries_total {self.background_queries}"
+        ])
+        families["db_background_seconds_total"] = ("counter", "Time spent in ORM queries outside requests.", [
+            f"db_background_seconds_total {self.background_db_time}"
+        ])
+
+        lines = []
+        for name, (metric_type, help_text, samples) in families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+QUERY_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+
+
+# Her sorgudan sonra (sql, süre) ile çağrılır; metrikler ve N+1 dedektörü kullanır
+_query_listeners: List[Callable[[str, float], None]] = []
+
+
+def _instrument(method):
+    @functools.wraps(method)
+    async def wrapper(self, query, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(self, query, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            for listener in _query_listeners:
+                listener(query, duration)
+
+    wrapper.__metrics_wrapped__ = True
+    return wrapper
+
+
+def instrument_queries():
+    """
+    Tortoise'un sorgu kancası olmadığı için SQLite istemcisinin execute_*
+    metodları sarılır. Transaction içindeki sorgular da aynı metodlardan geçer.
+    """
+    from tortoise.backends.sqlite.client import SqliteClient, TransactionWrapper
+
+    for cls in (SqliteClient, TransactionWrapper):
+        for name in QUERY_METHODS:
+            method = cls.__dict__.get(name)
+            if method is not None and not getattr(method, "__metrics_wrapped__", False):
+                setattr(cls, name, _instrument(method))
+
+
+def on_query(listener: Callable[[str, float], None]):
+    """Sorgu dinleyicisi ekler; sorgu metodları ilk dinleyicide sarılır."""
+    instrument_queries()
+    _query_listeners.append(listener)
+
+
+def route_label(scope: Scope) -> str:
+    # FastAPI eşleşen route'u scope'a yazar; /static gibi mount'larda sadece endpoint olur
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        return f"{scope.get('root_path', '')}/{{path}}"
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """İstek süresini, sorgu sayısını/süresini ve gönderilen gövde boyutunu kaydeder."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_request.set(stats)
+        status = [500]
+        size = [0]
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                size[0] += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_flight -= 1
+            _current_request.reset(token)
+            registry.record_request(
+                scope["method"], route_label(scope), status[0],
+                time.perf_counter() - started, stats, size[0],
+            )
@@ -0,0 +1,120 @@
+import os
+from datetime import datetime, timezone
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+from models import Coupons, Files, Order, Photo
+
+# Tortoise'un generate_schemas'ı sadece eksik tabloları oluşturur; mevcut
+# tablolara sonradan eklenen kolonlar ve indeksler burada eklenir.
+ADDED_COLUMNS = {
+    Order: {
+        "coupon_code": "VARCHAR(50)",
+    },
+    Photo: {
+        "thumbnail_path": "VARCHAR(255)",
+        "preview_path": "VARCHAR(255)",
+        "file_name": "VARCHAR(255)",
+    },
+    Files: {
+        "file_name": "VARCHAR(255)",
+    },
+}
+
+# SQLite tarihleri metin olarak karşılaştırdığı için UTC'ye çevrilen kolonlar
+UTC_DATE_COLUMNS = {
+    Order: ("date",),
+    Coupons: ("start_date", "end_date"),
+}
+
+
+async def add_missing_columns(model, columns: dict):
+    conn = Tortoise.get_connection("default")
+    table = model._meta.db_table
+    rows = await conn.execute_query_dict(f'PRAGMA table_info("{table}")')
+    if not rows:
+        # Tablo henüz yok; generate_schemas tüm kolonlarıyla oluşturur
+        return
+    existing = {row["name"] for row in rows}
+    for column, column_type in columns.items():
+        if column not in existing:
+            await conn.execute_script(
+                f'ALTER TABLE "{table}" ADD COLUMN "{column}" {column_type}'
+            )
+
+
+async def fill_file_names(model):
+    """Eski kayıtlarda boş kalan file_name kolonunu path'ten doldurur."""
+    rows = await model.filter(file_name=None).values_list("id", "path")
+    for row_id, path in rows:
+        await model.filter(id=row_id).update(file_name=os.path.basename(path))
+
+
+async def normalize_dates(model, column: str):
+    """
+    Eski kayıtlarda İstanbul offset'iyle (+03:00) ya da offset'siz yazılmış
+    tarihleri UTC'ye çevirir. Tarihler metin olarak karşılaştırıldığı için
+    karışık offset'ler sıralamayı ve tarih filtrelerini bozar.
+    """
+    conn = Tortoise.get_connection("default")
+    table = model._meta.db_table
+    rows = await conn.execute_query_dict(
+        f'SELECT "id", "{column}" AS value FROM "{table}" WHERE "{column}" NOT LIKE \'%+00:00\''
+    )
+    if not rows:
+        return
+    async with in_transaction("default"):
+        for row in rows:
+            value = datetime.fromisoformat(row["value"])
+            if value.tzinfo is None:
+                # Tortoise offset'siz değerleri UTC olarak okur
+                value = value.replace(tzinfo=timezone.utc)
+            await model.filter(id=row["id"]).update(**{column: value.astimezone(timezone.utc)})
+
+
+async def ensure_indexes(model):
+    """
+    Modelde tanımlı indeksleri (index=True ve Meta.indexes) Tortoise'un
+    kullandığı isimlerle, yoksa oluşturur.
+    """
+    conn = Tortoise.get_connection("default")
+    generator = conn.schema_generator(conn)
+    table_sql = generator._get_table_sql(model, safe=True)["table_creation_string"]
+    statements = [
+        line for line in table_sql.splitlines() if line.startswith("CREATE INDEX")
+    ]
+    if statements:
+        await conn.execute_script("\n".join(statements))
+
+
+async def run_migrations():
+    """
+    Şemayı günceller. Sıra önemli: SQLite, CREATE INDEX içinde olmayan bir
+    kolonu çift tırnaklı string olarak kabul edip bozuk bir indeks
+    oluşturur. Bu yüzden indeksler kolonlar eklendikten sonra oluşturulur.
+    """
+    for model, columns in ADDED_COLUMNS.items():
+        await add_missing_columns(model, columns)
+    await Tortoise.generate_schemas(safe=True)
+    for model in (Photo, Files):
+        await fill_file_names(model)
+    for model, columns in UTC_DATE_COLUMNS.items():
+        for column in columns:
+            await normalize_dates(model, column)
+    for model in Tortoise.apps["models"].values():
+        await ensure_indexes(model)
+
+
+if __name__ == "__main__":
+    # Uygulamayı başlatmadan veritabanını güncellemek için:
+    #   cd backend && python -m helpers.migrations
+    from tortoise import run_async
+
+    from helpers.database import tortoise_config
+
+    async def main():
+        await Tortoise.init(config=tortoise_config())
+        await run_migrations()
+
+    run_async(main())
@@ -0,0 +1,234 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from typing import List
+
+import aiosmtplib
+from dotenv import dotenv_values
+
+from models import EmailOutbox
+
+config_credential = dotenv_values(".env")
+logger = logging.getLogger(__name__)
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = config_credential.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# SMTP ayarları; yerel test için MAIL_SERVER=localhost, MAIL_PORT=8025,
+# MAIL_STARTTLS=false, MAIL_USE_CREDENTIALS=false verilebilir (ör. aiosmtpd)
+MAIL_SERVER = config_credential.get("MAIL_SERVER") or "smtp.gmail.com"
+MAIL_PORT = int(config_credential.get("MAIL_PORT") or 587)
+MAIL_STARTTLS = _flag("MAIL_STARTTLS", True)
+MAIL_SSL_TLS = _flag("MAIL_SSL_TLS", False)
+MAIL_USE_CREDENTIALS = _flag("MAIL_USE_CREDENTIALS", True)
+MAIL_FROM = config_credential.get("MAIL_FROM") or config_credential.get("EMAIL")
+
+# Worker ayarları
+OUTBOX_BATCH_SIZE = int(config_credential.get("OUTBOX_BATCH_SIZE") or 20)
+OUTBOX_MAX_ATTEMPTS = int(config_credential.get("OUTBOX_MAX_ATTEMPTS") or 5)
+OUTBOX_BACKOFF = float(config_credential.get("OUTBOX_BACKOFF") or 30)  # saniye
+OUTBOX_MAX_BACKOFF = float(config_credential.get("OUTBOX_MAX_BACKOFF") or 3600)
+OUTBOX_RATE = float(config_credential.get("OUTBOX_RATE") or 5)  # mesaj/saniye
+OUTBOX_POLL_INTERVAL = float(config_credential.get("OUTBOX_POLL_INTERVAL") or 10)
+OUTBOX_IDLE_TIMEOUT = float(config_credential.get("OUTBOX_IDLE_TIMEOUT") or 30)
+
+
+def build_message(entry: EmailOutbox) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = MAIL_FROM
+    message["To"] = ", ".join(entry.recipients)
+    message["Subject"] = entry.subject
+    message.set_content(entry.body, subtype=entry.subtype)
+    return message
+
+
+def retry_delay(attempts: int) -> float:
+    return min(OUTBOX_BACKOFF * 2 ** (attempts - 1), OUTBOX_MAX_BACKOFF)
+
+
+class OutboxWorker:
+    """
+    EmailOutbox tablosunu arka planda boşaltır. SMTP bağlantısı iş olduğu
+    sürece açık tutulup mesajlar arasında yeniden kullanılır; gönderim hızı
+    OUTBOX_RATE ile sınırlanır, başarısız mesajlar üstel bekleme ile
+    yeniden denenir.
+    """
+
+    def __init__(self):
+        self._task = None
+        self._wake: asyncio.Event = None
+        self._smtp: aiosmtplib.SMTP = None
+        self._last_used = 0.0
+        self._last_send = 0.0
+        self.sent = 0
+        self.retried = 0
+        self.failed = 0
+        self.connections = 0
+
+    @property
+    def wake_event(self) -> asyncio.Event:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        return self._wake
+
+    def wake(self):
+        self.wake_event.set()
+
+    async def _connection(self) -> aiosmtplib.SMTP:
+        if self._smtp is None or not self._smtp.is_connected:
+            smtp = aiosmtplib.SMTP(
+                hostname=MAIL_SERVER,
+                port=MAIL_PORT,
+                use_tls=MAIL_SSL_TLS,
+                start_tls=MAIL_STARTTLS,
+            )
+            await smtp.connect()
+            if MAIL_USE_CREDENTIALS:
+                await smtp.login(config_credential["EMAIL"], config_credential["PASSWORD"])
+            self._smtp = smtp
+            self.connections += 1
+        return self._smtp
+
+    async def close(self):
+        if self._smtp is not None:
+            try:
+                await self._smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+    async def _throttle(self):
+        if OUTBOX_RATE <= 0:
+            return
+        wait = self._last_send + 1 / OUTBOX_RATE - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._last_send = time.monotonic()
+
+    async def _record_failure(self, entry: EmailOutbox, exc: Exception, retry: bool = True):
+        entry.attempts += 1
+        entry.last_error = str(exc) or type(exc).__name__
+        if not retry or entry.attempts >= OUTBOX_MAX_ATTEMPTS:
+            entry.status = "failed"
+            self.failed += 1
+            logger.error("Giving up on email %s: %s", entry.id, entry.last_error)
+        else:
+            entry.status = "pending"
+            entry.next_attempt_at = datetime.now(timezone.utc) + timedelta(
+                seconds=retry_delay(entry.attempts)
+            )
+            self.retried += 1
+        await entry.save(
+            update_fields=["attempts", "last_error", "status", "next_attempt_at"]
+        )
+
+    async def _deliver(self, entry: EmailOutbox):
+        try:
+            message = build_message(entry)
+        except Exception as exc:
+            # Bozuk kayıt; yeniden denemek sonucu değiştirmez
+            await self._record_failure(entry, exc, retry=False)
+            return
+
+        try:
+            await self._throttle()
+            smtp = await self._connection()
+            await smtp.send_message(message)
+            self._last_used = time.monotonic()
+        except Exception as exc:
+            # Bağlantı bozulmuş olabilir; bir sonraki mesajda yeniden açılır
+            await self.close()
+            await self._record_failure(entry, exc)
+            return
+
+        entry.status = "sent"
+        entry.attempts += 1
+        entry.sent_at = datetime.now(timezone.utc)
+        await entry.save(update_fields=["status", "attempts", "sent_at"])
+        self.sent += 1
+
+    async def drain_once(self) -> int:
+        """Zamanı gelmiş en fazla OUTBOX_BATCH_SIZE mesajı gönderir."""
+        due = await EmailOutbox.filter(
+            status="pending", next_attempt_at__lte=datetime.now(timezone.utc)
+        ).order_by("next_attempt_at", "id").limit(OUTBOX_BATCH_SIZE)
+
+        for entry in due:
+            # Aynı veritabanını kullanan başka bir süreç kaydı almış olabilir
+            claimed = await EmailOutbox.filter(id=entry.id, status="pending").update(
+                status="sending"
+            )
+            if not claimed:
+                continue
+            try:
+                await self._deliver(entry)
+            except Exception:
+                # Durum kaydedilemediyse kayıt "sending"de kalır ve bir
+                # sonraki başlangıçta kuyruğa geri alınır; diğerleri gönderilir
+                logger.exception("Email outbox delivery failed for %s", entry.id)
+        return len(due)
+
+    async def _run(self):
+        # Yarıda kalmış gönderimleri kuyruğa geri al
+        await EmailOutbox.filter(status="sending").update(status="pending")
+        while True:
+            # Drain sırasında gelen kayıtlar bir sonraki turu hemen tetikler
+            self.wake_event.clear()
+            try:
+                if await self.drain_once() >= OUTBOX_BATCH_SIZE:
+                    continue
+            except Exception:
+                logger.exception("Email outbox drain failed")
+
+            if self._smtp is not None and time.monotonic() - self._last_used > OUTBOX_IDLE_TIMEOUT:
+                await self.close()
+
+            try:
+                await asyncio.wait_for(self.wake_event.wait(), OUTBOX_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.close()
+        self._wake = None
+
+    def stats(self) -> dict:
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "failed": self.failed,
+            "connections": self.connections,
+            "connected": self._smtp is not None and self._smtp.is_connected,
+        }
+
+
+outbox_worker = OutboxWorker()
+
+
+async def enqueue_email(
+    recipients: List[str], subject: str, body: str, subtype: str = "html"
+) -> EmailOutbox:
+    """E-postayı outbox'a yazar ve worker'ı uyandırır; SMTP beklenmez."""
+    entry = await EmailOutbox.create(
+        recipients=list(recipients), subject=subject, body=body, subtype=subtype
+    )
+    outbox_worker.wake()
+    return entry
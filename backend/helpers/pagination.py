@@ -0,0 +1,62 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException
+from tortoise.expressions import Q
+
+# Sayfa boyutu sınırları (keyset pagination)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Sipariş tarihleri veritabanına UTC olarak yazılır. SQLite tarihleri metin
+# olarak karşılaştırdığı için tüm satırlar ve filtre değerleri aynı offset'te
+# olmalı; aksi halde keyset sayfaları satır atlar ya da tekrarlar.
+STORAGE_TZ = timezone.utc
+# Saat dilimi içermeyen kullanıcı girdileri ve gün sınırları İstanbul saatine göre
+LOCAL_TZ = ZoneInfo("Europe/Istanbul")
+
+
+def to_storage_tz(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=LOCAL_TZ)
+    return value.astimezone(STORAGE_TZ)
+
+
+def encode_cursor(value, row_id: int) -> str:
+    """(sıralama değeri, id) ikilisini URL'de taşınabilir opak bir cursor'a çevirir."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, is_datetime: bool = True) -> Tuple[object, int]:
+    """encode_cursor ile üretilmiş cursor'ı çözer; bozuk cursor için 400 döner."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if is_datetime:
+            value = to_storage_tz(datetime.fromisoformat(value))
+        return value, int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_filter(field: str, value, row_id: int, descending: bool = True) -> Q:
+    """
+    (field, id) sıralamasında cursor'dan sonraki satırları seçen koşul.
+    Aynı field değerine sahip satırlar id ile ayrıştırılır.
+    """
+    op = "lt" if descending else "gt"
+    return Q(**{f"{field}__{op}": value}) | Q(
+        **{field: value, f"id__{op}": row_id}
+    )
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
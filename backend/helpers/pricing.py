@@ -0,0 +1,234 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+from helpers.catalog_cache import catalog
+from helpers.coupons import coupon_is_active
+from helpers.database import CACHE_TTL
+from helpers.text import strip_html
+from models import (
+    Coupons,
+    EnvelopeColors,
+    EnvelopeSmell,
+    PaperColors,
+    Prices,
+    ShipmentType,
+    User,
+)
+
+CENT = Decimal("0.01")
+ZERO = Decimal(0)
+
+# Fiyatı etkileyen Order alanları
+ORDER_PRICE_FIELDS = (
+    "envelope_text",
+    "envelope_color",
+    "paper_color",
+    "cardpostals",
+    "photos",
+    "files",
+    "smell",
+    "shipment_type",
+)
+
+
+def money(value: Decimal) -> Decimal:
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class PriceTable:
+    """Fiyat tablolarının sipariş seçenekleriyle eşleşen anahtarlara göre derlenmiş hali."""
+
+    version: int
+    prices: dict  # price_name -> price_value
+    envelope_colors: dict  # color_code -> color_price
+    paper_colors: dict  # color_code -> color_price
+    smells: dict  # smell_name -> smell_price
+    shipments: dict  # type_name -> shipment_price
+
+    def price(self, name: str) -> Decimal:
+        return self.prices.get(name, ZERO)
+
+
+@dataclass
+class QuoteItem:
+    name: str
+    quantity: Decimal
+    unit_price: Decimal
+    amount: Decimal
+    discount: Decimal = ZERO
+
+
+@dataclass
+class Quote:
+    items: List[QuoteItem] = field(default_factory=list)
+    subtotal: Decimal = ZERO
+    discount: Decimal = ZERO
+    tax: Decimal = ZERO
+    total: Decimal = ZERO
+    coupon_code: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "items": [
+                {
+                    "name": item.name,
+                    "quantity": float(item.quantity),
+                    "unit_price": float(item.unit_price),
+                    "amount": float(item.amount),
+                    "discount": float(item.discount),
+                }
+                for item in self.items
+            ],
+            "subtotal": float(self.subtotal),
+            "discount": float(self.discount),
+            "tax": float(self.tax),
+            "total": float(self.total),
+            "coupon_code": self.coupon_code,
+        }
+
+
+async def compile_price_table(version: int) -> PriceTable:
+    return PriceTable(
+        version=version,
+        prices=dict(await Prices.all().values_list("price_name", "price_value")),
+        envelope_colors=dict(
+            await EnvelopeColors.all().values_list("color_code", "color_price")
+        ),
+        paper_colors=dict(await PaperColors.all().values_list("color_code", "color_price")),
+        smells=dict(await EnvelopeSmell.all().values_list("smell_name", "smell_price")),
+        shipments=dict(
+            await ShipmentType.all().values_list("type_name", "shipment_price")
+        ),
+    )
+
+
+class PricingEngine:
+    """
+    Fiyat tablosunu bellekte tutar. Fiyat tablolarını değiştiren admin
+    route'ları katalog sürümünü artırdığı için tablo da o sürüme göre
+    yeniden derlenir; diğer worker'lardaki değişiklikler için ttl dolunca da.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self._table: Optional[PriceTable] = None
+        self._compiled_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        table = self._table
+        return (
+            table is not None
+            and table.version == catalog.version
+            and time.monotonic() - self._compiled_at < self.ttl
+        )
+
+    async def table(self) -> PriceTable:
+        if self._fresh():
+            return self._table
+        async with self._lock:
+            if not self._fresh():
+                self._table = await compile_price_table(catalog.version)
+                self._compiled_at = time.monotonic()
+            return self._table
+
+
+pricing_engine = PricingEngine()
+
+
+def _count(value) -> int:
+    # Siparişte liste olarak, önizlemede adet olarak gelebilir
+    if isinstance(value, int):
+        return max(value, 0)
+    return len(value) if isinstance(value, (list, tuple)) else 0
+
+
+def quote(table: PriceTable, config: dict, coupon: Coupons = None) -> Quote:
+    """
+    Sipariş konfigürasyonunu (Order alanları) derlenmiş fiyat tablosu ile
+    fiyatlandırır. Veritabanına erişmez.
+    """
+    text = strip_html(config.get("envelope_text"))
+    photos = _count(config.get("photos"))
+    cardpostals = _count(config.get("cardpostals"))
+    files = _count(config.get("files"))
+
+    free_photos = coupon.photo_discount if coupon else 0
+    free_cardpostals = coupon.cardpostal_discount if coupon else 0
+    free_smell = bool(coupon and coupon.smell_discount)
+
+    lines = [
+        ("character", Decimal(len(text)) / 2, table.price("character_price"), 0),
+        ("envelope_color", 1, table.envelope_colors.get(config.get("envelope_color"), ZERO), 0),
+        ("paper_color", 1, table.paper_colors.get(config.get("paper_color"), ZERO), 0),
+        ("cardpostal", cardpostals, table.price("cardpostal_price"), min(free_cardpostals, cardpostals)),
+        ("photo", photos, table.price("photo_price"), min(free_photos, photos)),
+        ("file", files, table.price("file_price"), 0),
+        ("smell", 1, table.smells.get(config.get("smell"), ZERO), 1 if free_smell else 0),
+        ("shipment", 1, table.shipments.get(config.get("shipment_type"), ZERO), 0),
+    ]
+
+    result = Quote(coupon_code=coupon.coupon_code if coupon else None)
+    for name, quantity, unit_price, free_quantity in lines:
+        quantity = Decimal(quantity)
+        unit_price = Decimal(unit_price or 0)
+        amount = money(quantity * unit_price)
+        discount = money(Decimal(free_quantity) * unit_price)
+        result.items.append(QuoteItem(name, quantity, unit_price, amount, discount))
+        result.subtotal += amount
+        result.discount += discount
+
+    if coupon and coupon.discount_rate:
+        rate_discount = money(
+            (result.subtotal - result.discount) * Decimal(coupon.discount_rate) / 100
+        )
+        result.discount += rate_discount
+
+    taxable = result.subtotal - result.discount
+    result.tax = money(taxable * table.price("tax_rate") / 100)
+    result.total = money(taxable + result.tax)
+    return result
+
+
+async def get_coupon_for_user(coupon_code: str, user: User) -> Coupons:
+    """Kuponun var olduğunu, kullanıcıya atandığını ve geçerli olduğunu kontrol eder."""
+    coupon = await Coupons.get_or_none(coupon_code=coupon_code)
+    if not coupon:
+        raise HTTPException(status_code=404, detail="Coupon not found.")
+    if not await coupon.users.filter(id=user.id).exists():
+        raise HTTPException(status_code=400, detail="You do not have this coupon.")
+    if not coupon_is_active(coupon, datetime.now(timezone.utc)):
+        raise HTTPException(status_code=400, detail="Coupon is not valid at this time.")
+    return coupon
+
+
+async def price_order(order, user: User, coupon_code: Optional[str] = None) -> Quote:
+    """
+    Siparişin fiyat alanlarını (order_price, tax, discount) sunucu tarafında
+    hesaplayıp nesneye yazar. coupon_code verilmezse siparişte kayıtlı kupon
+    hâlâ geçerliyse kullanılır.
+    """
+    coupon = None
+    if coupon_code:
+        coupon = await get_coupon_for_user(coupon_code, user)
+    elif order.coupon_code:
+        try:
+            coupon = await get_coupon_for_user(order.coupon_code, user)
+        except HTTPException:
+            coupon = None
+
+    config = {name: getattr(order, name) for name in ORDER_PRICE_FIELDS}
+    result = quote(await pricing_engine.table(), config, coupon)
+
+    order.order_price = result.total
+    order.tax = result.tax
+    order.discount = result.discount
+    order.coupon_code = result.coupon_code
+    return result
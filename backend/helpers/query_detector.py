@@ -0,0 +1,144 @@
+import logging
+import os
+import re
+import traceback
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from dotenv import dotenv_values
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from helpers.metrics import route_label
+
+logger = logging.getLogger(__name__)
+
+config_credential = dotenv_values(".env")
+
+# Sadece geliştirme ortamı için; açıkken her sorgunun şekli çıkarılır
+N_PLUS_ONE_DETECTOR = (config_credential.get("N_PLUS_ONE_DETECTOR") or "false").lower() in ("1", "true", "yes")
+# Aynı şekildeki sorgu bir istekte bundan fazla çalışırsa işaretlenir
+N_PLUS_ONE_THRESHOLD = int(config_credential.get("N_PLUS_ONE_THRESHOLD") or 5)
+# Bulgular log'a ek olarak bu header ile de döner
+N_PLUS_ONE_HEADER = "X-N-Plus-One"
+STACK_EXCERPT_DEPTH = 4
+MAX_HEADER_SQL = 160
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IGNORED_FILES = {os.path.abspath(__file__), os.path.join(BACKEND_DIR, "helpers", "metrics.py")}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    """Değerleri atarak sorgunun şeklini çıkarır: literaller ve IN listeleri tek ?."""
+    shape = _STRING.sub("?", sql)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (?)", shape)
+    return _SPACES.sub(" ", shape).strip()
+
+
+def stack_excerpt() -> List[str]:
+    """Sorguyu tetikleyen uygulama kodunun (kütüphaneler hariç) son çerçeveleri."""
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(BACKEND_DIR)
+        and os.path.abspath(frame.filename) not in _IGNORED_FILES
+        and "site-packages" not in frame.filename
+        # Middleware zinciri (ASGI __call__) bilgi taşımaz
+        and frame.name != "__call__"
+    ]
+    return [
+        f"{os.path.relpath(frame.filename, BACKEND_DIR)}:{frame.lineno} in {frame.name}"
+        for frame in frames[-STACK_EXCERPT_DEPTH:]
+    ]
+
+
+class QueryShapes:
+    """Bir istekte çalışan sorguların şekil başına sayısı ve eşik aşıldığı andaki stack."""
+
+    __slots__ = ("counts", "stacks")
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.stacks: Dict[str, List[str]] = {}
+
+    def add(self, sql: str, threshold: int):
+        shape = normalize(sql)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if count == threshold + 1:
+            self.stacks[shape] = stack_excerpt()
+
+    def findings(self) -> List[dict]:
+        return [
+            {"shape": shape, "count": self.counts[shape], "stack": stack}
+            for shape, stack in self.stacks.items()
+        ]
+
+
+_current_shapes: ContextVar[Optional[QueryShapes]] = ContextVar("current_shapes", default=None)
+
+
+class NPlusOneDetector:
+    def __init__(self, threshold: int = N_PLUS_ONE_THRESHOLD):
+        self.threshold = threshold
+
+    def record(self, query: str, duration: float):
+        shapes = _current_shapes.get()
+        if shapes is not None:
+            shapes.add(query, self.threshold)
+
+
+detector = NPlusOneDetector()
+
+
+def header_value(findings: List[dict]) -> str:
+    parts = [f"{item['count']}x {item['shape'][:MAX_HEADER_SQL]}" for item in findings]
+    # Header değerleri latin-1 olmak zorunda
+    return " | ".join(parts).encode("latin-1", "replace").decode("latin-1")
+
+
+class NPlusOneMiddleware:
+    """
+    İstek boyunca çalışan sorguları şekillerine göre gruplar. Eşiği aşan
+    şekiller route ve stack özetiyle log'a yazılır ve yanıta
+    X-N-Plus-One header'ı eklenir.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        shapes = QueryShapes()
+        token = _current_shapes.set(shapes)
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                findings = shapes.findings()
+                if findings:
+                    headers = MutableHeaders(scope=message)
+                    headers[N_PLUS_ONE_HEADER] = header_value(findings)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_shapes.reset(token)
+            for item in shapes.findings():
+                logger.warning(
+                    "N+1 query on %s %s: %dx %s\n  %s",
+                    scope["method"],
+                    route_label(scope),
+                    item["count"],
+                    item["shape"],
+                    "\n  ".join(item["stack"]) or "(no application frames)",
+                )
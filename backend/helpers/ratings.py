@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+from fastapi import HTTPException, Request
+from tortoise.expressions import F
+from tortoise.functions import Count
+
+from helpers.database import CACHE_TTL
+from helpers.http_cache import CachedPayload, payload_response
+from helpers.pagination import DEFAULT_PAGE_SIZE, encode_cursor
+from models import Comment, Comment_Pydantic, RatingStats
+
+RATING_STATS_ID = 1
+STARS = range(1, 6)
+
+
+def validate_star(star: int):
+    if star not in STARS:
+        raise HTTPException(status_code=400, detail="Star must be between 1 and 5.")
+
+
+async def bump_rating(star: int, delta: int):
+    """
+    Özet satırını günceller. Yorum yazımıyla aynı transaction içinde
+    çağrılmalı ki özet ve yorumlar birbirinden ayrışmasın.
+    """
+    await RatingStats.filter(id=RATING_STATS_ID).update(
+        comment_count=F("comment_count") + delta,
+        star_sum=F("star_sum") + delta * star,
+        **{f"star_{star}": F(f"star_{star}") + delta},
+    )
+
+
+async def rebuild_rating_stats():
+    rows = await Comment.annotate(total=Count("id")).group_by("star").values("star", "total")
+    histogram = {star: 0 for star in STARS}
+    for row in rows:
+        if row["star"] in histogram:
+            histogram[row["star"]] = row["total"]
+    await RatingStats.update_or_create(
+        id=RATING_STATS_ID,
+        defaults={
+            "comment_count": sum(histogram.values()),
+            "star_sum": sum(star * count for star, count in histogram.items()),
+            **{f"star_{star}": count for star, count in histogram.items()},
+        },
+    )
+
+
+async def ensure_rating_stats():
+    if not await RatingStats.filter(id=RATING_STATS_ID).exists():
+        await rebuild_rating_stats()
+
+
+async def rating_summary() -> dict:
+    stats = await RatingStats.get_or_none(id=RATING_STATS_ID)
+    if stats is None:
+        return {"count": 0, "average": 0, "histogram": {str(star): 0 for star in STARS}}
+    return {
+        "count": stats.comment_count,
+        "average": stats.star_sum / stats.comment_count if stats.comment_count else 0,
+        "histogram": {str(star): getattr(stats, f"star_{star}") for star in STARS},
+    }
+
+
+async def comment_page(limit: int, after_id: int = None):
+    """Yorumları yeni → eski (id azalan) sırada döner; sonraki sayfa için cursor üretir."""
+    comments = Comment.all()
+    if after_id is not None:
+        comments = comments.filter(id__lt=after_id)
+    page = await Comment_Pydantic.from_queryset(
+        comments.order_by("-id").limit(limit + 1)
+    )
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(None, page[-1].id)
+    return [item.model_dump(mode="json") for item in page], next_cursor
+
+
+class CommentFeedCache:
+    """
+    Herkese açık yorum listesinin ilk sayfası için önbellek. Yorum ekleyen,
+    değiştiren ya da silen route'lar bump() çağırır; diğer worker'lardaki
+    değişiklikler için sayfa ttl dolunca da yeniden okunur.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._entry = None  # (version, CachedPayload, next_cursor)
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        entry = self._entry
+        return (
+            entry is not None
+            and entry[0] == self.version
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self):
+        if self._fresh():
+            return self._entry
+        async with self._lock:
+            if not self._fresh():
+                version = self.version
+                comments, next_cursor = await comment_page(DEFAULT_PAGE_SIZE)
+                self._entry = (version, CachedPayload(comments), next_cursor)
+                self._loaded_at = time.monotonic()
+            return self._entry
+
+    def bump(self):
+        self.version += 1
+
+    async def response(self, request: Request):
+        version, payload, next_cursor = await self.get()
+        headers = {"X-Comments-Version": str(version)}
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+        return payload_response(request, payload, headers)
+
+
+comment_feed = CommentFeedCache()
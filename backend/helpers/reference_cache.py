@@ -0,0 +1,97 @@
+import asyncio
+import time
+from collections import defaultdict
+
+from fastapi import HTTPException, Request
+
+from helpers.database import CACHE_TTL
+from helpers.http_cache import CachedPayload, payload_response
+from models import City, Jail, Town
+
+
+class ReferenceSnapshot:
+    """City/Town/Jail tablolarının id ve city_id üzerinden indekslenmiş kopyası."""
+
+    def __init__(self, version: int, cities: list, towns: list, jails: list):
+        self.version = version
+        self.cities = cities
+        self.towns = towns
+        self.jails = jails
+        self.cities_by_id = {row["city_id"]: row for row in cities}
+        self.towns_by_id = {row["town_id"]: row for row in towns}
+        self.jails_by_id = {row["id"]: row for row in jails}
+        self.towns_by_city = defaultdict(list)
+        for row in towns:
+            self.towns_by_city[row["city_id"]].append(row)
+        self.jails_by_city = defaultdict(list)
+        for row in jails:
+            self.jails_by_city[row["city_id"]].append(row)
+        self._payloads = {}
+
+    def payload(self, key, data) -> CachedPayload:
+        # Her gövde snapshot başına bir kez serileştirilir
+        cached = self._payloads.get(key)
+        if cached is None:
+            cached = self._payloads[key] = CachedPayload(data)
+        return cached
+
+
+class ReferenceData:
+    """
+    Sipariş sihirbazındaki şehir/ilçe/cezaevi verisi için bellek içi önbellek.
+    City, Town ve Jail üzerinde değişiklik yapan route'lar bump() çağırır;
+    bir sonraki okuma yeni bir snapshot yükler. Diğer worker'lardaki
+    değişiklikler için snapshot ttl dolunca da yeniden yüklenir.
+    """
+
+    def __init__(self, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        snapshot = self._snapshot
+        return (
+            snapshot is not None
+            and snapshot.version == self.version
+            and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self) -> ReferenceSnapshot:
+        if self._fresh():
+            return self._snapshot
+        async with self._lock:
+            if not self._fresh():
+                version = self.version
+                self._snapshot = ReferenceSnapshot(
+                    version,
+                    await City.all().order_by("city_id").values(),
+                    await Town.all().order_by("town_id").values(),
+                    await Jail.all().order_by("id").values(),
+                )
+                self._loaded_at = time.monotonic()
+            return self._snapshot
+
+    def bump(self):
+        self.version += 1
+
+
+reference_data = ReferenceData()
+
+
+async def reference_response(request: Request, key, select, not_found: str = None):
+    """
+    select(snapshot) ile seçilen veriyi önbellekli JSON olarak döner.
+    Sonuç boş/None ise ve not_found verildiyse 404 fırlatır.
+    """
+    snapshot = await reference_data.get()
+    data = select(snapshot)
+    if not_found and not data:
+        raise HTTPException(status_code=404, detail=not_found)
+    return payload_response(
+        request,
+        snapshot.payload(key, data),
+        {"X-Reference-Version": str(snapshot.version)},
+    )
@@ -0,0 +1,243 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, List, Optional
+
+from pydantic import ValidationError
+from tortoise.transactions import in_transaction
+
+from helpers.database import WRITER
+from helpers.reference_cache import reference_data
+from models import City, Jail, Town, city_pydantic, jail_pydantic, town_pydantic
+
+# Her parça tek transaction içinde bulk_create/bulk_update ile yazılır
+IMPORT_CHUNK_SIZE = 1000
+# Yanıtta dönen satır hatası sayısı; toplam sayı her zaman raporlanır
+MAX_REPORTED_ERRORS = 100
+FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class ImportKind:
+    model: type
+    schema: type
+    pk: str
+    # city_id'nin mevcut bir şehre ait olması gerekiyor mu
+    needs_city: bool
+
+
+IMPORT_KINDS = {
+    "cities": ImportKind(City, city_pydantic, "city_id", needs_city=False),
+    "towns": ImportKind(Town, town_pydantic, "town_id", needs_city=True),
+    "jails": ImportKind(Jail, jail_pydantic, "id", needs_city=True),
+}
+
+
+class ImportFormatError(ValueError):
+    """Dosyanın tamamını geçersiz kılan hata (ör. bilinmeyen CSV kolonu)."""
+
+
+@dataclass
+class ImportResult:
+    kind: str
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> dict:
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Byte parçalarını UTF-8 (BOM'lu da olabilir) satırlara böler."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def iter_csv(lines: AsyncIterator[str], kind: ImportKind) -> AsyncIterator[tuple]:
+    """
+    (satır numarası, dict) üretir. Tırnak içinde satır sonu olan kayıtlar
+    tırnaklar dengelenene kadar birleştirilir.
+    """
+    header = None
+    record, start_line, line_number = "", 0, 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            if not line.strip():
+                continue
+            record, start_line = line, line_number
+        else:
+            record = f"{record}\n{line}"
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = [name.strip() for name in values]
+            unknown = set(header) - set(kind.schema.model_fields)
+            if unknown:
+                raise ImportFormatError(f"Unknown columns: {', '.join(sorted(unknown))}")
+            if kind.pk not in header:
+                raise ImportFormatError(f"Missing '{kind.pk}' column")
+        elif len(values) != len(header):
+            yield start_line, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        else:
+            yield start_line, dict(zip(header, values))
+    if record:
+        yield start_line, ValueError("Unterminated quoted field")
+
+
+async def iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[tuple]:
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield line_number, ValueError("Each line must be a JSON object")
+        else:
+            yield line_number, row
+
+
+def describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+        for item in error.errors()
+    )
+
+
+async def upsert_chunk(kind: ImportKind, rows: Dict[int, dict], result: ImportResult):
+    """Parçadaki mevcut kayıtları günceller, olmayanları ekler (tek transaction)."""
+    model = kind.model
+    async with in_transaction(WRITER):
+        existing = set(
+            await model.filter(**{f"{kind.pk}__in": list(rows)}).values_list(kind.pk, flat=True)
+        )
+        created = [model(**row) for key, row in rows.items() if key not in existing]
+        updated = [model(**row) for key, row in rows.items() if key in existing]
+        if created:
+            await model.bulk_create(created)
+        if updated:
+            fields = [name for name in kind.schema.model_fields if name != kind.pk]
+            await model.bulk_update(updated, fields=fields)
+    result.created += len(created)
+    result.updated += len(updated)
+
+
+async def import_reference(
+    kind_name: str,
+    chunks: AsyncIterator[bytes],
+    data_format: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+) -> ImportResult:
+    """
+    CSV ya da NDJSON akışını satır satır doğrular ve parçalar halinde
+    upsert eder. Hatalı satırlar atlanıp raporlanır; sonunda referans
+    verisi önbelleği bir kez yenilenir.
+    """
+    kind = IMPORT_KINDS[kind_name]
+    if data_format not in FORMATS:
+        raise ImportFormatError(f"Unknown format '{data_format}'")
+
+    result = ImportResult(kind=kind_name)
+    city_ids: Optional[set] = None
+    if kind.needs_city:
+        city_ids = set(await City.all().values_list("city_id", flat=True))
+
+    lines = iter_lines(chunks)
+    rows = iter_csv(lines, kind) if data_format == "csv" else iter_ndjson(lines)
+    pending: Dict[int, dict] = {}
+    try:
+        async for line_number, row in rows:
+            result.rows += 1
+            if isinstance(row, Exception):
+                result.add_error(line_number, str(row))
+                continue
+            try:
+                values = kind.schema.model_validate(row).model_dump()
+            except ValidationError as e:
+                result.add_error(line_number, describe(e))
+                continue
+            if city_ids is not None and values["city_id"] not in city_ids:
+                result.add_error(line_number, f"city_id: unknown city {values['city_id']}")
+                continue
+
+            # Aynı anahtar dosyada tekrar ederse son satır geçerli olur
+            pending[values[kind.pk]] = values
+            if len(pending) >= chunk_size:
+                await upsert_chunk(kind, pending, result)
+                pending = {}
+        if pending:
+            await upsert_chunk(kind, pending, result)
+    finally:
+        if result.created or result.updated:
+            reference_data.bump()
+    return result
+
+
+async def file_chunks(path: str, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    from helpers.executor import offload
+
+    with open(path, "rb") as file:
+        while chunk := await offload("fs", file.read, size):
+            yield chunk
+
+
+if __name__ == "__main__":
+    # Komut satırından içe aktarma (çalışan uygulamanın önbelleği için
+    # POST /reference/import/{kind} kullanın ya da uygulamayı yeniden başlatın):
+    #   cd backend && python -m helpers.reference_import towns ilceler.csv
+    import argparse
+
+    from tortoise import Tortoise, run_async
+
+    from helpers.database import tortoise_config
+    from helpers.migrations import run_migrations
+
+    parser = argparse.ArgumentParser(description="Şehir/ilçe/cezaevi verisini CSV ya da NDJSON'dan yükler")
+    parser.add_argument("kind", choices=list(IMPORT_KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=FORMATS, help="varsayılan: dosya uzantısından")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+    data_format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+
+    async def main():
+        await Tortoise.init(config=tortoise_config())
+        await run_migrations()
+        result = await import_reference(
+            args.kind, file_chunks(args.path), data_format, args.chunk_size
+        )
+        print(json.dumps(result.to_dict(), ensure_ascii=False, indent=2))
+
+    run_async(main())
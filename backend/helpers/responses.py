@@ -0,0 +1,44 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# OPT_UTC_Z bilerek verilmez: datetime'lar jsonable_encoder'daki isoformat()
+# gibi "+00:00" ile yazılır. Pydantic modellerindeki datetime'lar ise
+# model_dump(mode="json") ile "Z" olur; response_model yolu da aynısını üretir.
+DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any):
+    # Pydantic modelleri response_model ile aynı çıktıyı versin diye JSON modunda
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    # jsonable_encoder ile aynı davranış: tam sayı Decimal → int, diğerleri → float
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """datetime/UUID'yi orjson'un kendisi, Decimal ve modelleri _default işler."""
+    return orjson.dumps(content, default=_default, option=DUMPS_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    orjson ile serileştiren JSON yanıtı. Uygulamanın varsayılan yanıt sınıfıdır.
+    Büyük listelerde route'tan doğrudan döndürülürse FastAPI'nin
+    response_model doğrulaması ve jsonable_encoder adımı da atlanır. Bu durumda
+    Response parametresine yazılan header'lar headers= ile ayrıca verilmeli.
+
+    Doğrudan döndüren route'lar (yalnızca response_model tipinde liste döner,
+    çıktı response_model yolu ile byte byte aynıdır):
+    GET /admin/orders, GET /admin/users, GET /blogs
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
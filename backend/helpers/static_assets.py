@@ -0,0 +1,190 @@
+import gzip
+import mimetypes
+import os
+import re
+import shutil
+import stat
+from typing import List, Optional
+
+from dotenv import dotenv_values
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # brotli kurulu değilse sadece gzip varyantı üretilir
+    brotli = None
+
+config_credential = dotenv_values(".env")
+
+# Bu boyutun altındaki dosyalar sıkıştırmaya değmez (byte)
+PRECOMPRESS_MIN_SIZE = int(config_credential.get("PRECOMPRESS_MIN_SIZE") or 1024)
+COMPRESSIBLE_EXTENSIONS = {
+    ".css", ".csv", ".html", ".js", ".json", ".map", ".md",
+    ".svg", ".txt", ".xml",
+}
+# Tercih sırasına göre: Content-Encoding → dosya uzantısı
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# İçerik hash'i taşıyan dosya adları (ör. foto_1.3f9a0c1b2d4e5f60.jpg) hiç
+# değişmeyeceği için uzun süre önbelleğe alınabilir
+HASH_LENGTH = 16
+HASHED_NAME = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}(\.|$)")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "public, no-cache"
+
+
+def hashed_name(file_name: str, digest: str) -> str:
+    """Dosya adına, uzantıdan önce içerik hash'ini ekler."""
+    stem, extension = os.path.splitext(file_name)
+    return f"{stem}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def is_hashed(path: str) -> bool:
+    return HASHED_NAME.search(os.path.basename(path)) is not None
+
+
+def is_compressible(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def _compress(source: str, target: str, compress):
+    temp = f"{target}.part"
+    with open(source, "rb") as file:
+        data = compress(file.read())
+    with open(temp, "wb") as file:
+        file.write(data)
+    shutil.copystat(source, temp)
+    os.replace(temp, target)
+
+
+def precompress(path: str) -> List[str]:
+    """
+    Metin benzeri dosyalar için .gz (ve brotli kuruluysa .br) varyantlarını
+    üretir. Varyant orijinalden yeniyse yeniden sıkıştırılmaz; sıkıştırma
+    kazanç sağlamıyorsa varyant bırakılmaz. "fs" havuzunda çalıştırılmalı.
+    """
+    if not is_compressible(path):
+        return []
+    source_stat = os.stat(path)
+    if source_stat.st_size < PRECOMPRESS_MIN_SIZE:
+        return []
+
+    compressors = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors["br"] = lambda data: brotli.compress(data, quality=11)
+
+    variants = []
+    for encoding, compress in compressors.items():
+        target = path + ENCODINGS[encoding]
+        if not _is_fresh(target, source_stat):
+            _compress(path, target, compress)
+        if os.path.getsize(target) >= source_stat.st_size:
+            os.remove(target)
+            continue
+        variants.append(target)
+    return variants
+
+
+def _is_fresh(variant: str, source_stat: os.stat_result) -> bool:
+    try:
+        return os.stat(variant).st_mtime >= source_stat.st_mtime
+    except OSError:
+        return False
+
+
+def remove_variants(path: str):
+    for extension in ENCODINGS.values():
+        if os.path.exists(path + extension):
+            os.remove(path + extension)
+
+
+def precompress_tree(directory: str) -> int:
+    """Dizindeki mevcut dosyaların eksik ya da eski varyantlarını üretir."""
+    count = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(tuple(ENCODINGS.values())) or name.endswith(".part"):
+                continue
+            count += len(precompress(os.path.join(root, name)))
+    return count
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Accept-Encoding başlığından q=0 olmayan kodlamaları döner."""
+    accepted = []
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name and quality > 0:
+            accepted.append(name.strip().lower())
+    return accepted
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles'ı, istemcinin Accept-Encoding başlığına göre önceden
+    sıkıştırılmış .br/.gz varyantını sunacak şekilde genişletir. İçerik
+    hash'li dosya adları immutable, diğerleri ETag ile yeniden doğrulanarak
+    önbelleğe alınır.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE if is_hashed(full_path) else REVALIDATE_CACHE,
+        }
+
+        serve_path, serve_stat = full_path, stat_result
+        if is_compressible(full_path):
+            headers["Vary"] = "Accept-Encoding"
+            # Range istekleri sıkıştırılmamış içerik üzerinden karşılanır
+            if "range" not in request_headers:
+                variant = self._select_variant(full_path, stat_result, request_headers)
+                if variant is not None:
+                    encoding, serve_path, serve_stat = variant
+                    headers["Content-Encoding"] = encoding
+
+        response = FileResponse(
+            serve_path,
+            status_code=status_code,
+            stat_result=serve_stat,
+            headers=headers,
+            media_type=mimetypes.guess_type(full_path)[0] or "text/plain",
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _select_variant(
+        full_path: str, stat_result: os.stat_result, request_headers: Headers
+    ) -> Optional[tuple]:
+        accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+        for encoding, extension in ENCODINGS.items():
+            if encoding not in accepted:
+                continue
+            try:
+                variant_stat = os.stat(full_path + extension)
+            except OSError:
+                continue
+            # Orijinalden eski varyant bayattır; sunulmaz
+            if stat.S_ISREG(variant_stat.st_mode) and variant_stat.st_mtime >= stat_result.st_mtime:
+                return encoding, full_path + extension, variant_stat
+        return None
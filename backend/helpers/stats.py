@@ -0,0 +1,197 @@
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Optional, Union
+
+from tortoise import Tortoise
+from tortoise.expressions import F
+from tortoise.functions import Count, Sum
+from tortoise.transactions import in_transaction
+
+from models import DailyStats, DailyStatusStats, Order, User
+from helpers.database import WRITER
+from helpers.pagination import LOCAL_TZ
+
+
+def stats_day(value: Union[datetime, str]) -> date:
+    """
+    Özet tablolarında kullanılan gün (İstanbul saatine göre). Veritabanından
+    ham metin olarak okunan tarihleri de kabul eder.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        # Tortoise offset'siz kayıtları UTC olarak okur
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(LOCAL_TZ).date()
+
+
+def order_snapshot(order: Order) -> tuple:
+    """Güncelleme öncesi siparişin özeti etkileyen alanları."""
+    return (order.date, order.order_price, order.status)
+
+
+async def _bump_day(day: date, orders: int = 0, revenue=0, new_users: int = 0):
+    await DailyStats.get_or_create(day=day)
+    await DailyStats.filter(day=day).update(
+        order_count=F("order_count") + orders,
+        revenue=F("revenue") + Decimal(revenue or 0),
+        new_users=F("new_users") + new_users,
+    )
+
+
+async def _bump_status(day: date, status: str, delta: int):
+    await DailyStatusStats.get_or_create(day=day, status=status)
+    await DailyStatusStats.filter(day=day, status=status).update(
+        order_count=F("order_count") + delta
+    )
+
+
+async def _apply_order(snapshot: tuple, sign: int):
+    order_date, price, status = snapshot
+    day = stats_day(order_date)
+    async with in_transaction(WRITER):
+        await _bump_day(day, orders=sign, revenue=sign * Decimal(price or 0))
+        await _bump_status(day, status, sign)
+
+
+class StatusCounter:
+    """
+    Tüm siparişler için durum bazında bellek içi sayaç. İlk kullanımda tek
+    bir GROUP BY ile yüklenir, sonra record_order_* fonksiyonlarıyla güncellenir.
+    """
+
+    def __init__(self):
+        self._counts: Optional[dict] = None
+
+    async def load(self):
+        rows = await Order.annotate(total=Count("id")).group_by("status").values(
+            "status", "total"
+        )
+        self._counts = {row["status"]: row["total"] for row in rows}
+
+    async def get(self, status: str) -> int:
+        if self._counts is None:
+            await self.load()
+        return self._counts.get(status, 0)
+
+    def apply(self, status: str, delta: int):
+        if self._counts is not None:
+            self._counts[status] = self._counts.get(status, 0) + delta
+
+    def reset(self):
+        self._counts = None
+
+
+status_counter = StatusCounter()
+
+
+async def record_order_created(order: Order):
+    await _apply_order(order_snapshot(order), 1)
+    status_counter.apply(order.status, 1)
+
+
+async def record_order_deleted(order: Order):
+    await _apply_order(order_snapshot(order), -1)
+    status_counter.apply(order.status, -1)
+
+
+async def record_order_updated(before: tuple, order: Order):
+    after = order_snapshot(order)
+    if before == after:
+        return
+    await _apply_order(before, -1)
+    await _apply_order(after, 1)
+    status_counter.apply(before[2], -1)
+    status_counter.apply(after[2], 1)
+
+
+async def record_user_created(user: User):
+    await _bump_day(stats_day(user.join_date), new_users=1)
+
+
+async def record_user_deleted(user: User):
+    await _bump_day(stats_day(user.join_date), new_users=-1)
+
+
+async def rebuild_daily_stats():
+    """
+    Özet tablolarını sipariş ve kullanıcı tablolarından baştan hesaplar.
+    Özet tablosu boşken (ilk kurulum) startup'ta çalıştırılır.
+    """
+    conn = Tortoise.get_connection("default")
+    order_table = Order._meta.db_table
+    user_table = User._meta.db_table
+
+    # Günler İstanbul saatine göre; kayıtlar UTC ya da farklı offset'lerle
+    # yazılmış olabileceği için metnin ilk 10 karakteri yerine Python'da çevrilir
+    order_rows = await conn.execute_query_dict(
+        f'SELECT "date", "status", "order_price" FROM "{order_table}"'
+    )
+    user_rows = await conn.execute_query_dict(
+        f'SELECT "join_date" FROM "{user_table}"'
+    )
+
+    days = {}
+    status_counts = {}
+    for row in order_rows:
+        day = stats_day(row["date"])
+        totals = days.setdefault(day, {"order_count": 0, "revenue": Decimal(0), "new_users": 0})
+        totals["order_count"] += 1
+        totals["revenue"] += Decimal(str(row["order_price"] or 0))
+        key = (day, row["status"])
+        status_counts[key] = status_counts.get(key, 0) + 1
+    for row in user_rows:
+        day = stats_day(row["join_date"])
+        totals = days.setdefault(day, {"order_count": 0, "revenue": Decimal(0), "new_users": 0})
+        totals["new_users"] += 1
+    status_rows = [
+        DailyStatusStats(day=day, status=status, order_count=count)
+        for (day, status), count in status_counts.items()
+    ]
+
+    async with in_transaction(WRITER):
+        await DailyStats.all().delete()
+        await DailyStatusStats.all().delete()
+        await DailyStats.bulk_create(
+            [DailyStats(day=day, **totals) for day, totals in days.items()]
+        )
+        await DailyStatusStats.bulk_create(status_rows)
+
+
+async def ensure_daily_stats():
+    if not await DailyStats.exists() and (
+        await Order.exists() or await User.exists()
+    ):
+        await rebuild_daily_stats()
+
+
+async def window_totals(
+    start: Optional[date] = None, end: Optional[date] = None
+) -> dict:
+    """[start, end) aralığındaki sipariş, ciro ve yeni kullanıcı toplamları."""
+    query = DailyStats.all()
+    if start is not None:
+        query = query.filter(day__gte=start)
+    if end is not None:
+        query = query.filter(day__lt=end)
+    rows = await query.annotate(
+        orders=Sum("order_count"),
+        revenue_sum=Sum("revenue"),
+        users=Sum("new_users"),
+    ).values("orders", "revenue_sum", "users")
+    row = rows[0] if rows else {}
+    return {
+        "orders": int(row.get("orders") or 0),
+        "revenue": Decimal(str(row.get("revenue_sum") or 0)).quantize(Decimal("0.01")),
+        "new_users": int(row.get("users") or 0),
+    }
+
+
+async def status_totals() -> dict:
+    """Tüm zamanlar için durum bazında sipariş sayıları."""
+    rows = (
+        await DailyStatusStats.annotate(total=Sum("order_count"))
+        .group_by("status")
+        .values("status", "total")
+    )
+    return {row["status"]: int(row["total"] or 0) for row in rows if row["total"]}
@@ -0,0 +1,9 @@
+import re
+
+# Payment.js ile aynı desen; kapanmamış son etiketi de siler
+HTML_TAG = re.compile(r"</?[^>]+(>|$)")
+
+
+def strip_html(text: str) -> str:
+    """Zarf metnindeki HTML etiketlerini atar (karakter sayımı ve önizleme için)."""
+    return HTML_TAG.sub("", text or "")
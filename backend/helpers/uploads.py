@@ -0,0 +1,190 @@
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Callable, List
+
+from dotenv import dotenv_values
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from helpers.executor import offload
+from helpers.responses import FastJSONResponse
+from helpers.static_assets import hashed_name, precompress, remove_variants
+
+config_credential = dotenv_values(".env")
+
+# Yükleme dosyası parça boyutu ve limitler (byte)
+CHUNK_SIZE = 1024 * 1024
+MAX_FILE_SIZE = int(config_credential.get("UPLOAD_MAX_FILE_SIZE") or 20 * 1024 * 1024)
+MAX_REQUEST_SIZE = int(
+    config_credential.get("UPLOAD_MAX_REQUEST_SIZE") or 100 * 1024 * 1024
+)
+
+
+@dataclass
+class SavedUpload:
+    path: str
+    size: int
+    sha256: str
+
+
+def request_too_large(limit: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"Upload too large. Request limit is {limit} bytes.",
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """
+    multipart/form-data isteklerini MAX_REQUEST_SIZE ile sınırlar. Starlette
+    dosyaları ayrıştırırken diske aldığı için kontrol ayrıştırmadan önce
+    yapılır: Content-Length limiti aşıyorsa gövde hiç okunmaz, Content-Length
+    yoksa (chunked) okunan byte'lar sayılır ve limit aşılınca 413 döner.
+    """
+
+    def __init__(self, app: ASGIApp, max_request_size: int = MAX_REQUEST_SIZE):
+        self.app = app
+        self.max_request_size = max_request_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_request_size:
+            error = request_too_large(self.max_request_size)
+            response = FastJSONResponse({"detail": error.detail}, status_code=error.status_code)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_request_size:
+                    # FastAPI middleware'den gelen HTTPException'ı olduğu gibi döner
+                    raise request_too_large(self.max_request_size)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class UploadBudget:
+    """Bir istekteki tüm dosyalar için kalan byte hakkı."""
+
+    def __init__(self, max_request_size: int = MAX_REQUEST_SIZE):
+        self.limit = max_request_size
+        self.remaining = max_request_size
+
+    def consume(self, size: int):
+        self.remaining -= size
+        if self.remaining < 0:
+            raise request_too_large(self.limit)
+
+
+def _open_temp(directory: str):
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.NamedTemporaryFile(
+        dir=directory, prefix=".upload_", suffix=".part", delete=False
+    )
+
+
+def _write_chunk(buffer, digest, chunk: bytes):
+    buffer.write(chunk)
+    digest.update(chunk)
+
+
+def _discard(buffer):
+    buffer.close()
+    if os.path.exists(buffer.name):
+        os.remove(buffer.name)
+
+
+def remove_file(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+    remove_variants(path)
+
+
+async def save_upload(
+    file: UploadFile,
+    directory: str,
+    file_name: str,
+    budget: UploadBudget = None,
+    max_file_size: int = MAX_FILE_SIZE,
+    content_hash: bool = False,
+) -> SavedUpload:
+    """
+    Yüklenen dosyayı sabit boyutlu parçalar halinde geçici bir dosyaya yazar
+    ve bitince atomik olarak yerine taşır. Starlette dosyayı bu noktada
+    zaten ayrıştırıp diske almıştır; istek boyutu ayrıştırmadan önce
+    UploadSizeLimitMiddleware'de sınırlanır, burada dosya başına limit ve
+    istekteki dosyaların toplamı kontrol edilir. content_hash=True ise dosya adına içerik hash'i eklenir
+    (immutable URL). Metin benzeri dosyaların sıkıştırılmış varyantları da
+    burada bir kez üretilir. Disk işlemleri event loop dışında çalışır.
+    """
+    budget = budget or UploadBudget()
+    digest = hashlib.sha256()
+    size = 0
+
+    buffer = await offload("fs", _open_temp, directory)
+    try:
+        while chunk := await file.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > max_file_size:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"File '{file.filename}' is too large. Limit is {max_file_size} bytes.",
+                )
+            budget.consume(len(chunk))
+            await offload("fs", _write_chunk, buffer, digest, chunk)
+        await offload("fs", buffer.close)
+        if content_hash:
+            file_name = hashed_name(file_name, digest.hexdigest())
+        final_path = os.path.join(directory, file_name)
+        await offload("fs", os.replace, buffer.name, final_path)
+        await offload("fs", precompress, final_path)
+    except BaseException:
+        await offload("fs", _discard, buffer)
+        raise
+
+    return SavedUpload(path=final_path, size=size, sha256=digest.hexdigest())
+
+
+async def save_uploads(
+    files: List[UploadFile],
+    directory: str,
+    make_name: Callable[[UploadFile], str],
+    content_hash: bool = False,
+) -> List[SavedUpload]:
+    """
+    Bir istekteki dosyaları ortak byte limitiyle kaydeder. Herhangi biri
+    başarısız olursa bu istekte kaydedilen dosyalar silinir.
+    """
+    budget = UploadBudget()
+    saved = []
+    try:
+        for file in files:
+            saved.append(await save_upload(
+                file, directory, make_name(file), budget, content_hash=content_hash
+            ))
+    except BaseException:
+        await discard_uploads(saved)
+        raise
+    return saved
+
+
+async def discard_uploads(saved: List[SavedUpload]):
+    for upload in saved:
+        await offload("fs", remove_file, upload.path)
@@ -0,0 +1,79 @@
+import copy
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import dotenv_values
+
+from models import User
+
+config_credential = dotenv_values(".env")
+
+
+class UserCache:
+    """
+    Kimliği doğrulanmış kullanıcılar için boyut sınırlı TTL/LRU önbellek.
+    Her istekte JWT'den gelen id için veritabanına gitmemek amacıyla kullanılır.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        # Handler'lar kullanıcı nesnesini değiştirebildiği için kopya döndürülür
+        return copy.copy(user)
+
+    def put(self, user: User):
+        self._entries[user.id] = (time.monotonic() + self.ttl, copy.copy(user))
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0,
+        }
+
+
+user_cache = UserCache(
+    maxsize=int(config_credential.get("USER_CACHE_SIZE") or 1024),
+    ttl=float(config_credential.get("USER_CACHE_TTL") or 60),
+)
+
+
+async def get_cached_user(user_id: int) -> User:
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await User.get(id=user_id)
+        user_cache.put(user)
+    return user
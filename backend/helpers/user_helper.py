@@ -3,13 +3,14 @@ from fastapi import HTTPException, status, Depends
 # Authentication
 from authentication import *
 from fastapi.security import OAuth2PasswordBearer
+from helpers.user_cache import get_cached_user
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, config_credential["SECRET"], algorithms=["HS256"])
-        user = await User.get(id=payload.get("id"))
+        user = await get_cached_user(payload.get("id"))
     except:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -17,18 +18,12 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return await user
+    return user
 
 async def get_current_admin_user(token: str = Depends(oauth2_scheme)):
     try:
         payload = jwt.decode(token, config_credential["SECRET"], algorithms=["HS256"])
-        user = await User.get(id=payload.get("id"))
-        if user.privilege != "Admin":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Operation not permitted. Admin privileges required.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+        user = await get_cached_user(payload.get("id"))
     except:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -36,4 +31,11 @@ async def get_current_admin_user(token: str = Depends(oauth2_scheme)):
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return await user
\ No newline at end of file
+    if user.privilege != "Admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation not permitted. Admin privileges required.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return user
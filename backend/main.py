@@ -1,14 +1,30 @@
 from fastapi import FastAPI
 from tortoise.contrib.fastapi import register_tortoise
 from routers import routers  # Import the routers list
+from helpers.stats import ensure_daily_stats
+from helpers.ratings import ensure_rating_stats
+from helpers.cardpostal_images import cardpostal_images
+from helpers.migrations import run_migrations
+from helpers.executor import offload, shutdown_executors
+from helpers.coupons import start_coupon_sweeper, stop_coupon_sweeper
+from helpers.outbox import outbox_worker
+from helpers.database import tortoise_config
+from helpers.static_assets import PrecompressedStaticFiles, precompress_tree
+from helpers.responses import FastJSONResponse
+from helpers.compression import CompressionMiddleware
+from helpers.metrics import METRICS_ENABLED, MetricsMiddleware, on_query, registry
+from helpers.query_detector import N_PLUS_ONE_DETECTOR, NPlusOneMiddleware, detector
+from helpers.uploads import UploadSizeLimitMiddleware
 # Authentication
 from authentication import *
 from fastapi.middleware.cors import CORSMiddleware
 
-# image uplaod
-from fastapi.staticfiles import StaticFiles
+# JSON yanıtları orjson ile serileştirilir
+app = FastAPI(default_response_class=FastJSONResponse)
 
-app = FastAPI()
+# Dosya yüklemeleri ayrıştırılmadan önce UPLOAD_MAX_REQUEST_SIZE ile sınırlanır
+# (CORS'tan önce eklenir ki 413 yanıtları da CORS header'larını alsın)
+app.add_middleware(UploadSizeLimitMiddleware)
 
 # Allow CORS for your frontend domain (replace with your frontend URL)
 app.add_middleware(
@@ -17,10 +33,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods like GET, POST, OPTIONS, etc.
     allow_headers=["*"],  # Allows all headers
+    # Pagination headers ve geliştirme ortamındaki N+1 uyarısı
+    expose_headers=["X-Next-Cursor", "X-Total-Estimate", "X-N-Plus-One"],
 )
 
+# COMPRESS_MIN_SIZE üzerindeki JSON/metin yanıtlarını brotli ya da gzip ile sıkıştır
+app.add_middleware(CompressionMiddleware)
+
+# METRICS_ENABLED ise route başına gecikme/sorgu/boyut metrikleri (/metrics)
+if METRICS_ENABLED:
+    on_query(registry.record_query)
+    app.add_middleware(MetricsMiddleware)
+
+# Geliştirme: bir istekte aynı şekildeki sorgu N'den fazla çalışırsa uyar
+if N_PLUS_ONE_DETECTOR:
+    on_query(detector.record)
+    app.add_middleware(NPlusOneMiddleware)
+
 # static file config
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Önceden sıkıştırılmış .br/.gz varyantları Accept-Encoding'e göre sunulur
+app.mount("/static", PrecompressedStaticFiles(directory="static"), name="static")
 
 @app.get("/")
 def index():
@@ -28,12 +60,42 @@ def index():
 
 register_tortoise(
     app,
-    db_url="sqlite://database.sqlite3",
-    modules={"models": ["models"]},
-    generate_schemas=True,
+    # DB_PROFILE / DB_PATH / DB_READERS ile .env üzerinden seçilir
+    config=tortoise_config(),
+    # Şema run_migrations içinde oluşturulur/güncellenir
+    generate_schemas=False,
     add_exception_handlers=True,
 )
 
+@app.on_event("startup")
+async def migrate_schema():
+    # Eksik tabloları oluştur, mevcut tablolara yeni kolon ve indeksleri ekle
+    await run_migrations()
+
+@app.on_event("startup")
+async def build_daily_stats():
+    # İlk kurulumda günlük özet tablosunu mevcut verilerden doldur
+    await ensure_daily_stats()
+    # Yorum puan özeti yoksa mevcut yorumlardan oluştur
+    await ensure_rating_stats()
+    # Kartpostal görsel indeksini ilk istekten önce oluştur
+    await cardpostal_images.get()
+    # Mevcut statik dosyaların eksik sıkıştırılmış varyantlarını üret
+    await offload("fs", precompress_tree, "static")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    # Süresi dolan kuponları periyodik olarak pasife çek
+    start_coupon_sweeper()
+    # Outbox'taki e-postaları arka planda gönder
+    outbox_worker.start()
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    await stop_coupon_sweeper()
+    await outbox_worker.stop()
+    shutdown_executors()
+
 for router in routers:
     app.include_router(router)
 
@@ -1,6 +1,5 @@
 from tortoise import Tortoise, fields, Model
-from datetime import datetime
-import pytz
+from datetime import datetime, timezone
 
 
 class User(Model):
@@ -11,7 +10,7 @@ class User(Model):
     phone_number = fields.CharField(max_length=50, null=False, unique=True, default="")
     password = fields.CharField(max_length=100, null=False, default="")
     is_verified = fields.BooleanField(default=False)
-    join_date = fields.DatetimeField(default=datetime.now)
+    join_date = fields.DatetimeField(default=lambda: datetime.now(timezone.utc))
     privilege = fields.CharField(max_length=20, default="Müşteri")
 
 
@@ -19,9 +18,8 @@ class Order(Model):
     id = fields.IntField(pk=True, index=True)
 
     # General Info
-    date = fields.DatetimeField(
-        default=lambda: datetime.now(pytz.timezone("Europe/Istanbul"))
-    )
+    # UTC yazılır; keyset pagination ve tarih filtreleri metin karşılaştırır
+    date = fields.DatetimeField(default=lambda: datetime.now(timezone.utc))
     customer_name = fields.CharField(max_length=100)
     customer_id = fields.IntField(max_length=50)
 
@@ -58,23 +56,46 @@ class Order(Model):
     shipment_type = fields.CharField(max_length=50, default="")
     tax = fields.DecimalField(max_digits=10, decimal_places=2, default=0)
     discount = fields.DecimalField(max_digits=10, decimal_places=2, default=0)
+    coupon_code = fields.CharField(max_length=50, null=True)  # Sunucuda doğrulanan kupon
     shipment_date = fields.CharField(max_length=50, default="")
     add_date = fields.IntField(default=1)
     track_id = fields.CharField(max_length=50, default="")
     track_link = fields.TextField(default="")
 
+    class Meta:
+        # Admin sipariş listesi (date, id) üzerinden keyset pagination yapar
+        indexes = (
+            ("date", "id"),
+            ("status", "date", "id"),
+            # Müşterinin siparişleri (/profile, yorum kontrolü)
+            ("customer_id", "date", "id"),
+            # /check_status: müşterinin belirli durumda siparişi var mı
+            ("customer_id", "status"),
+        )
+
 
 class Photo(Model):
     id = fields.IntField(pk=True, index=True)
     path = fields.CharField(max_length=255)  # Path to the photo
+    thumbnail_path = fields.CharField(max_length=255, null=True)  # Küçük önizleme
+    preview_path = fields.CharField(max_length=255, null=True)  # Orta boy önizleme
+    file_name = fields.CharField(max_length=255, null=True)  # path'in son parçası
     order = fields.ForeignKeyField("models.Order", related_name="photo_set")
 
+    class Meta:
+        # Silme işlemi sipariş + dosya adı ile birebir eşleşme yapar
+        indexes = (("order_id", "file_name"),)
+
 
 class Files(Model):
     id = fields.IntField(pk=True, index=True)
     path = fields.CharField(max_length=255)  # Path to the photo
+    file_name = fields.CharField(max_length=255, null=True)  # path'in son parçası
     order = fields.ForeignKeyField("models.Order", related_name="file_set")
 
+    class Meta:
+        indexes = (("order_id", "file_name"),)
+
 
 class EnvelopeColors(Model):
     id = fields.IntField(pk=True, index=True)
@@ -116,6 +137,12 @@ class Coupons(Model):
     end_date = fields.DatetimeField()
     users = fields.ManyToManyField("models.User", related_name="coupons")
 
+    class Meta:
+        indexes = (
+            ("is_active", "end_date"),  # Süresi dolan kuponların taranması
+            ("start_date", "end_date"),  # Şu an geçerli kuponlar
+        )
+
 
 # Category Modeli
 class Category(Model):
@@ -235,6 +262,61 @@ class Features(Model):
     updated_at = fields.DatetimeField(auto_now=True)
 
 
+class DailyStats(Model):
+    """Günlük sipariş/ciro/yeni kullanıcı özeti; /status bu tablodan okur."""
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField(unique=True)
+    order_count = fields.IntField(default=0)
+    revenue = fields.DecimalField(max_digits=14, decimal_places=2, default=0)
+    new_users = fields.IntField(default=0)
+
+
+class DailyStatusStats(Model):
+    """Gün ve sipariş durumu bazında sipariş sayısı."""
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    status = fields.CharField(max_length=100)
+    order_count = fields.IntField(default=0)
+
+    class Meta:
+        unique_together = (("day", "status"),)
+
+
+class RatingStats(Model):
+    """Yorum puanlarının tek satırlık özeti; yorum route'ları tarafından güncellenir."""
+
+    id = fields.IntField(pk=True)
+    comment_count = fields.IntField(default=0)
+    star_sum = fields.IntField(default=0)
+    star_1 = fields.IntField(default=0)
+    star_2 = fields.IntField(default=0)
+    star_3 = fields.IntField(default=0)
+    star_4 = fields.IntField(default=0)
+    star_5 = fields.IntField(default=0)
+
+
+class EmailOutbox(Model):
+    """Gönderilmeyi bekleyen e-postalar; arka plandaki worker tarafından gönderilir."""
+
+    id = fields.IntField(pk=True)
+    recipients = fields.JSONField(default=[])
+    subject = fields.CharField(max_length=255)
+    body = fields.TextField()
+    subtype = fields.CharField(max_length=10, default="html")
+    status = fields.CharField(max_length=10, default="pending")  # pending / sent / failed
+    attempts = fields.IntField(default=0)
+    last_error = fields.TextField(null=True)
+    next_attempt_at = fields.DatetimeField(default=lambda: datetime.now(timezone.utc))
+    created_at = fields.DatetimeField(auto_now_add=True)
+    sent_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        # Worker bekleyen ve zamanı gelmiş kayıtları sırayla çeker
+        indexes = (("status", "next_attempt_at", "id"),)
+
+
 # Pydantic modelleri oluşturulması
 from tortoise.contrib.pydantic import pydantic_model_creator
 
@@ -259,6 +341,7 @@ order_pydanticIn = pydantic_model_creator(
         "customer_name",
         "customer_id",
         "date",
+        "coupon_code",
     ),
 )
 order_pydanticOut = pydantic_model_creator(Order, name="OrderOut")
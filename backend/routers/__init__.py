@@ -24,6 +24,10 @@ from .prices import router as prices_router
 from .features import router as feature_router
 from .files import router as files_router
 from .status import router as status_router
+from .catalog import router as catalog_router
+from .quote import router as quote_router
+from .metrics import router as metrics_router
+from .reference_import import router as reference_import_router
 
 # Group routers for easy inclusion
 routers = [
@@ -52,5 +56,9 @@ routers = [
     prices_router,
     feature_router,
     files_router,
-    status_router
+    status_router,
+    catalog_router,
+    quote_router,
+    metrics_router,
+    reference_import_router,
 ]
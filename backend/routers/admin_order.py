@@ -1,21 +1,115 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from models import *
 from helpers.user_helper import get_current_admin_user
-from typing import List
+from helpers.stats import (
+    order_snapshot,
+    record_order_created,
+    record_order_deleted,
+    record_order_updated,
+)
+from helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    to_storage_tz,
+)
+from helpers.database import WRITER, read_only
+from helpers.responses import FastJSONResponse
+from typing import List, Optional
 from tortoise.exceptions import DoesNotExist, ValidationError
+from tortoise.transactions import in_transaction
 
 # Authentication
 from authentication import *
 
 router = APIRouter()
 
-@router.get("/admin/orders", response_model=List[order_pydanticOut])
-async def get_all_orders(current_admin: User = Depends(get_current_admin_user)):
-    # Fetch all orders as a QuerySet
-    orders = Order.all()  # Don't await here as we need to keep it as a QuerySet
-    
-    # Return the orders using `from_queryset` to handle the QuerySet
-    return await order_pydanticOut.from_queryset(orders)
+ORDER_SORTS = {
+    "date_desc": True,
+    "date_asc": False,
+}
+
+
+@router.get("/admin/orders", response_model=List[order_pydanticOut], dependencies=[Depends(read_only)])
+async def get_all_orders(
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    sort: str = "date_desc",
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    customer_id: Optional[int] = None,
+    receiver_city: Optional[str] = None,
+    jail_name: Optional[str] = None,
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Siparişleri (date, id) üzerinden keyset pagination ile döner.
+    Sonraki sayfanın cursor'ı `X-Next-Cursor`, toplam kayıt tahmini ise
+    ilk sayfada `X-Total-Estimate` header'ı ile gönderilir.
+    """
+    if sort not in ORDER_SORTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid sort. Choose one of: {', '.join(ORDER_SORTS)}",
+        )
+    descending = ORDER_SORTS[sort]
+    limit = clamp_limit(limit)
+
+    # Filtreler; index'li kolonlar üzerinden daraltılır
+    filters = {}
+    if status:
+        filters["status"] = status
+    if date_from:
+        filters["date__gte"] = to_storage_tz(date_from)
+    if date_to:
+        filters["date__lt"] = to_storage_tz(date_to)
+    if customer_id is not None:
+        filters["customer_id"] = customer_id
+    if receiver_city:
+        filters["receiver_city"] = receiver_city
+    if jail_name:
+        filters["jail_name"] = jail_name
+
+    orders = Order.filter(**filters)
+
+    # Toplam sayı sadece ilk sayfada hesaplanır
+    if cursor is None:
+        response.headers["X-Total-Estimate"] = str(
+            await estimate_order_count(filters)
+        )
+    else:
+        date_value, order_id = decode_cursor(cursor)
+        orders = orders.filter(
+            keyset_filter("date", date_value, order_id, descending)
+        )
+
+    ordering = ("-date", "-id") if descending else ("date", "id")
+    page = await order_pydanticOut.from_queryset(
+        orders.order_by(*ordering).limit(limit + 1)
+    )
+
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1].date, page[-1].id)
+
+    # Sayfa zaten order_pydanticOut; response_model ile ikinci kez doğrulanmaz
+    return FastJSONResponse(page, headers=response.headers)
+
+
+async def estimate_order_count(filters: dict) -> int:
+    """
+    Filtre yoksa tabloyu taramadan en büyük id'yi tahmin olarak kullanır,
+    filtre varsa index üzerinden sayım yapar.
+    """
+    if filters:
+        return await Order.filter(**filters).count()
+    last_id = await Order.all().order_by("-id").first().values_list("id", flat=True)
+    return last_id or 0
+
 
 @router.post("/admin/orders", response_model=order_pydanticOut)
 async def create_order(
@@ -28,8 +122,10 @@ async def create_order(
         order_values["customer_name"] = f"{current_admin.name} {current_admin.surname}"
         order_values["customer_id"] = current_admin.id  # Fill in customer_id from the current user
 
-        # Yeni siparişi veritabanına kaydet
-        new_order = await Order.create(**order_values)
+        # Yeni siparişi veritabanına kaydet; istatistik özetleri aynı transaction'da
+        async with in_transaction(WRITER):
+            new_order = await Order.create(**order_values)
+            await record_order_created(new_order)
 
         return await order_pydanticOut.from_tortoise_orm(new_order)
 
@@ -56,11 +152,14 @@ async def update_order(
 
     # Gelen verileri dinamik olarak güncelle
     updated_values = updated_data.dict(exclude_unset=True)  # Sadece gelen verileri al
+    before = order_snapshot(order_to_update)
     for field, value in updated_values.items():
         setattr(order_to_update, field, value)
 
     # Veritabanında güncelleme yap
-    await order_to_update.save()
+    async with in_transaction(WRITER):
+        await order_to_update.save()
+        await record_order_updated(before, order_to_update)
 
     return await order_pydanticOut.from_tortoise_orm(order_to_update)
 
@@ -74,12 +173,14 @@ async def delete_order(order_id: int, current_user: User = Depends(get_current_a
         raise HTTPException(status_code=404, detail="Order not found")
 
     # Siparişi sil
-    await order_to_delete.delete()
+    async with in_transaction(WRITER):
+        await order_to_delete.delete()
+        await record_order_deleted(order_to_delete)
 
     return {"message": "Order deleted successfully"}
 
 
-@router.get("/admin/orders/{order_id}", response_model=order_pydanticOut)
+@router.get("/admin/orders/{order_id}", response_model=order_pydanticOut, dependencies=[Depends(read_only)])
 async def get_order_by_id(order_id: int, current_admin: User = Depends(get_current_admin_user)):
     """
     Belirtilen order_id ile bir siparişi döner.
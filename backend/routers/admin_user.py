@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends
 from models import *
 from helpers.user_helper import get_current_admin_user
+from helpers.stats import record_user_created, record_user_deleted
+from helpers.user_cache import user_cache
+from helpers.responses import FastJSONResponse
 from tortoise.exceptions import DoesNotExist
 from typing import List
 
@@ -14,7 +17,14 @@ router = APIRouter()
 async def get_all_customers(current_admin: User = Depends(get_current_admin_user)):
     # Fetch all customers as a QuerySet
     customers_query = User.all()
-    return await user_pydanticOut.from_queryset(customers_query)
+    # Liste zaten user_pydanticOut; response_model ile ikinci kez doğrulanmaz
+    return FastJSONResponse(await user_pydanticOut.from_queryset(customers_query))
+
+
+@router.get("/admin/user_cache")
+async def get_user_cache_stats(current_admin: User = Depends(get_current_admin_user)):
+    # Kimlik doğrulama önbelleğinin isabet/ıskalama sayaçları
+    return user_cache.stats()
 
 
 @router.delete("/admin/users/{user_id}")
@@ -28,6 +38,8 @@ async def delete_user(
 
     # Kullanıcıyı veritabanından sil
     await user_to_delete.delete()
+    user_cache.invalidate(user_id)
+    await record_user_deleted(user_to_delete)
 
     return {"message": "User deleted successfully"}
 
@@ -44,7 +56,7 @@ async def create_user(
         surname=user.surname,
         email=user.email,
         phone_number=user.phone_number,
-        password=get_hashed_password(user.password),  # Şifreyi hash'le
+        password=await get_hashed_password(user.password),  # Şifreyi hash'le
         is_verified=is_verified_value,  # Gelen veya varsayılan değer
     )
     try:
@@ -54,6 +66,7 @@ async def create_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Bu e-posta veya telefon numarası zaten kayıtlı.",
         )
+    await record_user_created(user_obj)
     return await user_pydanticOut.from_tortoise_orm(user_obj)
 
 
@@ -84,7 +97,7 @@ async def update_user(
 
     # If password is being updated, hash it before saving
     if "password" in updated_data_dict:
-        updated_data_dict["password"] = get_hashed_password(
+        updated_data_dict["password"] = await get_hashed_password(
             updated_data_dict["password"]
         )
 
@@ -94,6 +107,7 @@ async def update_user(
 
     # Save the changes to the database
     await user_to_update.save()
+    user_cache.invalidate(user_id)
 
     # Return the updated user as the response
     return await user_pydanticOut.from_tortoise_orm(user_to_update)
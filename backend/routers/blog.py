@@ -5,6 +5,8 @@ from models import *
 from typing import Optional
 from helpers.user_helper import get_current_admin_user
 import re
+from helpers.uploads import save_upload
+from helpers.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -30,19 +32,14 @@ async def create_blog(
     icon_path = None
     main_photo_path = None
     upload_folder = "static/uploads/blogs"
-    os.makedirs(upload_folder, exist_ok=True)
     
     if icon:
         icon_filename = f"{slug}_icon_{icon.filename}"
-        icon_path = os.path.join(upload_folder, icon_filename)
-        with open(icon_path, "wb") as buffer:
-            buffer.write(await icon.read())
+        icon_path = (await save_upload(icon, upload_folder, icon_filename, content_hash=True)).path
     
     if main_photo:
         main_photo_filename = f"{slug}_main_{main_photo.filename}"
-        main_photo_path = os.path.join(upload_folder, main_photo_filename)
-        with open(main_photo_path, "wb") as buffer:
-            buffer.write(await main_photo.read())
+        main_photo_path = (await save_upload(main_photo, upload_folder, main_photo_filename, content_hash=True)).path
     
     # Create the Blog entry in the database
     new_blog = await Blog.create(
@@ -57,7 +54,8 @@ async def create_blog(
 
 @router.get("/blogs", response_model=list[Blog_Pydantic])
 async def get_all_blogs():
-    return await Blog_Pydantic.from_queryset(Blog.all())
+    # Liste zaten Blog_Pydantic; response_model ile ikinci kez doğrulanmaz
+    return FastJSONResponse(await Blog_Pydantic.from_queryset(Blog.all()))
 
 @router.put("/blogs/{blog_id}", response_model=Blog_Pydantic)
 async def update_blog(blog_id: int, blog_data: BlogIn_Pydantic, icon: Optional[UploadFile] = File(None), main_photo: Optional[UploadFile] = File(None), current_user=Depends(get_current_admin_user)):
@@ -78,18 +76,12 @@ async def update_blog(blog_id: int, blog_data: BlogIn_Pydantic, icon: Optional[U
     # Handle icon update
     if icon:
         icon_filename = f"{blog.slug}_icon_{icon.filename}"
-        icon_path = os.path.join("static/uploads/", icon_filename)
-        with open(icon_path, "wb") as buffer:
-            buffer.write(await icon.read())
-        blog.icon = icon_path
+        blog.icon = (await save_upload(icon, "static/uploads/", icon_filename, content_hash=True)).path
 
     # Handle main photo update
     if main_photo:
         main_photo_filename = f"{blog.slug}_main_{main_photo.filename}"
-        main_photo_path = os.path.join("static/uploads/", main_photo_filename)
-        with open(main_photo_path, "wb") as buffer:
-            buffer.write(await main_photo.read())
-        blog.main_photo = main_photo_path
+        blog.main_photo = (await save_upload(main_photo, "static/uploads/", main_photo_filename, content_hash=True)).path
 
     # Save changes
     await blog.save()
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Depends
-from fastapi.responses import FileResponse
 from models import *
 from helpers.user_helper import get_current_user, get_current_admin_user
+from helpers.catalog_cache import catalog
+from helpers.cardpostal_images import cardpostal_images
+from fastapi import Request
+from typing import Optional
 from fastapi import File, UploadFile
 import os
 from typing import List
@@ -16,22 +19,22 @@ router = APIRouter()
 @router.get("/cardpostals")
 async def get_cardpostals():
     cardpostals = await Cardpostal.all().prefetch_related("category")
+    await cardpostal_images.get()
     return [
         {
             "name": cardpostal.name,
-            "image_path": f"/cardpostals/images/{cardpostal.id}",  # Görsel için özel bir endpoint
+            "image_path": cardpostal_images.url(cardpostal.id),  # İçerik hash'i ile sürümlü görsel URL'i
             "category": cardpostal.category.name if cardpostal.category else None
         }
         for cardpostal in cardpostals
     ]
 
 @router.get("/cardpostals/images/{cardpostal_id}")
-async def get_cardpostal_image(cardpostal_id: int):
-    cardpostal = await Cardpostal.get_or_none(id=cardpostal_id)
-    if not cardpostal or not os.path.exists(cardpostal.image_path):
-        raise HTTPException(status_code=404, detail="Image not found")
-
-    return FileResponse(cardpostal.image_path)
+async def get_cardpostal_image(
+    request: Request, cardpostal_id: int, v: Optional[str] = None
+):
+    # Bellek içi indeksten sunulur; ETag/If-Modified-Since ile 304, Range desteklenir
+    return await cardpostal_images.response(request, cardpostal_id, v)
 
 @router.get("/cardpostals/{category_id}")
 async def get_cardpostals_by_category(category_id: int):
@@ -39,11 +42,12 @@ async def get_cardpostals_by_category(category_id: int):
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
 
+    await cardpostal_images.get()
     return [
         {
             "id": cardpostal.id,
             "name": cardpostal.name,
-            "image_path": f"/cardpostals/images/{cardpostal.id}",  # Görsel için özel bir endpoint
+            "image_path": cardpostal_images.url(cardpostal.id),  # İçerik hash'i ile sürümlü görsel URL'i
             "category": category.name
         }
         for cardpostal in category.cardpostals
@@ -52,6 +56,7 @@ async def get_cardpostals_by_category(category_id: int):
 @router.post("/categories")
 async def create_category(name: str, user = Depends(get_current_admin_user)):
     category = await Category.create(name=name)
+    catalog.bump()
     return {"message": "Category created successfully", "category": category}
 
 @router.get("/categories")
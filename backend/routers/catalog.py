@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends, Request
+from helpers.catalog_cache import catalog
+from helpers.database import read_only
+
+router = APIRouter()
+
+
+@router.get("/catalog", dependencies=[Depends(read_only)])
+async def get_catalog(request: Request):
+    """
+    Renkler, kağıtlar, kokular, gönderim tipleri, fiyatlar, özellikler,
+    kartpostallar ve şablonlar tek bir önbellekli yanıtta döner.
+    """
+    return await catalog.response(request)
@@ -1,25 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 from models import *
 from helpers.user_helper import get_current_user
+from helpers.reference_cache import reference_data, reference_response
 
 router = APIRouter()
 
 
 # City Routes
 @router.get("/cities", response_model=List[city_pydantic])
-async def get_cities(user: dict = Depends(get_current_user)):
-    return await city_pydantic.from_queryset(City.all())
+async def get_cities(request: Request, user: dict = Depends(get_current_user)):
+    return await reference_response(request, "cities", lambda ref: ref.cities)
 
 
 @router.get("/cities/{city_id}", response_model=city_pydantic)
-async def get_city(city_id: int, user: dict = Depends(get_current_user)):
-    return await city_pydantic.from_queryset_single(City.get(city_id=city_id))
+async def get_city(
+    city_id: int, request: Request, user: dict = Depends(get_current_user)
+):
+    return await reference_response(
+        request,
+        ("city", city_id),
+        lambda ref: ref.cities_by_id.get(city_id),
+        not_found="Object does not exist",
+    )
 
 
 @router.post("/cities", response_model=city_pydantic)
 async def create_city(city: city_pydanticIn, user: dict = Depends(get_current_user)):
     city_obj = await City.create(**city.dict(exclude_unset=True))
+    reference_data.bump()
     return await city_pydantic.from_tortoise_orm(city_obj)
 
 
@@ -28,6 +37,7 @@ async def update_city(
     city_id: int, city: city_pydanticIn, user: dict = Depends(get_current_user)
 ):
     await City.filter(city_id=city_id).update(**city.dict(exclude_unset=True))
+    reference_data.bump()
     return await city_pydantic.from_queryset_single(City.get(city_id=city_id))
 
 
@@ -43,5 +53,6 @@ async def delete_city(city_id: int, user: dict = Depends(get_current_user)):
 
     # Delete the city
     await city.delete()
+    reference_data.bump()
 
     return {"message": f"City {city_id} and its related towns deleted successfully"}
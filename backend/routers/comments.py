@@ -1,6 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from tortoise.transactions import in_transaction
 from models import *
 from helpers.user_helper import get_current_user, get_current_admin_user
+from helpers.database import WRITER, read_only
+from helpers.pagination import DEFAULT_PAGE_SIZE, clamp_limit, decode_cursor
+from helpers.ratings import (
+    bump_rating,
+    comment_feed,
+    comment_page,
+    rating_summary,
+    validate_star,
+)
 
 router = APIRouter()
 
@@ -9,24 +21,30 @@ router = APIRouter()
 async def create_comment(
     comment: CommentIn_Pydantic, current_user: User = Depends(get_current_user)
 ):
-    # Kullanıcının en az bir siparişinin olup olmadığını kontrol et
-    orders = await Order.filter(customer_id=current_user.id)
+    # Kullanıcının durumu "Sipariş Bekleniyor"dan farklı en az bir siparişi var mı
+    has_order = await Order.filter(customer_id=current_user.id).exclude(
+        status="Sipariş Bekleniyor"
+    ).exists()
 
-    # Kullanıcının en az bir siparişinin durumu "Sipariş Bekleniyor"dan farklı mı kontrol et
-    if not orders or all(order.status == "Sipariş Bekleniyor" for order in orders):
+    if not has_order:
         raise HTTPException(
             status_code=403,
             detail="You must have made at least one order that is not in 'Pending' status to leave a comment.",
         )
 
-    # Yorumu oluştur
-    comment_obj = await Comment.create(
-        title=comment.title,
-        text=comment.text,
-        star=comment.star,
-        customer_name=current_user.name,
-        customer_id=current_user.id,
-    )
+    validate_star(comment.star)
+
+    # Yorumu oluştur; puan özeti aynı transaction içinde güncellenir
+    async with in_transaction(WRITER):
+        comment_obj = await Comment.create(
+            title=comment.title,
+            text=comment.text,
+            star=comment.star,
+            customer_name=current_user.name,
+            customer_id=current_user.id,
+        )
+        await bump_rating(comment_obj.star, 1)
+    comment_feed.bump()
     return await Comment_Pydantic.from_tortoise_orm(comment_obj)
 
 
@@ -35,16 +53,21 @@ async def admin_create_comment(
     comment: CommentInAdmin_Pydantic,
     current_user: User = Depends(get_current_admin_user),
 ):
+    validate_star(comment.star)
+
     try:
-        comment_obj = await Comment.create(
-            title=comment.title,
-            text=comment.text,
-            star=comment.star,
-            customer_name=comment.customer_name,  # Admin can set any customer name
-            customer_id=(
-                comment.customer_id if comment.customer_id else None
-            ),  # Optional customer_id
-        )
+        async with in_transaction(WRITER):
+            comment_obj = await Comment.create(
+                title=comment.title,
+                text=comment.text,
+                star=comment.star,
+                customer_name=comment.customer_name,  # Admin can set any customer name
+                customer_id=(
+                    comment.customer_id if comment.customer_id else None
+                ),  # Optional customer_id
+            )
+            await bump_rating(comment_obj.star, 1)
+        comment_feed.bump()
         return await Comment_Pydantic.from_tortoise_orm(comment_obj)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error creating comment: {str(e)}")
@@ -60,10 +83,20 @@ async def update_comment(
     if not comment_obj:
         raise HTTPException(status_code=404, detail="Comment not found")
 
+    update_data = comment_data.dict(exclude_unset=True)
+    if "star" in update_data:
+        validate_star(update_data["star"])
+    old_star = comment_obj.star
+
     try:
         # Yorumun verilerini güncelle
-        await comment_obj.update_from_dict(comment_data.dict(exclude_unset=True))
-        await comment_obj.save()
+        async with in_transaction(WRITER):
+            await comment_obj.update_from_dict(update_data)
+            await comment_obj.save()
+            if comment_obj.star != old_star:
+                await bump_rating(old_star, -1)
+                await bump_rating(comment_obj.star, 1)
+        comment_feed.bump()
         return await Comment_Pydantic.from_tortoise_orm(comment_obj)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error updating comment: {str(e)}")
@@ -78,14 +111,39 @@ async def delete_comment(
         raise HTTPException(status_code=404, detail="Comment not found")
 
     try:
-        await comment_obj.delete()
+        async with in_transaction(WRITER):
+            await comment_obj.delete()
+            await bump_rating(comment_obj.star, -1)
+        comment_feed.bump()
         return {"detail": "Comment deleted successfully."}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error deleting comment: {str(e)}")
 
 
-@router.get("/comments", response_model=list[Comment_Pydantic])
-async def get_comments():
-    # Fetch all comments as a queryset, without awaiting
-    comments = Comment.all()
-    return await Comment_Pydantic.from_queryset(comments)
+@router.get("/comments", response_model=list[Comment_Pydantic], dependencies=[Depends(read_only)])
+async def get_comments(
+    request: Request,
+    response: Response,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+):
+    """
+    Yorumları yeni → eski sırada sayfalı döner; sonraki sayfanın cursor'ı
+    `X-Next-Cursor` header'ında gelir. Varsayılan ilk sayfa önbellekten
+    ETag ile sunulur.
+    """
+    limit = clamp_limit(limit)
+    if cursor is None and limit == DEFAULT_PAGE_SIZE:
+        return await comment_feed.response(request)
+
+    after_id = decode_cursor(cursor, is_datetime=False)[1] if cursor else None
+    comments, next_cursor = await comment_page(limit, after_id)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return comments
+
+
+@router.get("/comments/summary", dependencies=[Depends(read_only)])
+async def get_comment_summary():
+    # Yorum sayısı, ortalama puan ve 1-5 yıldız dağılımı
+    return await rating_summary()
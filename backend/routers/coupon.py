@@ -2,9 +2,19 @@ from fastapi import APIRouter, Depends
 from models import *
 from helpers.user_helper import get_current_user, get_current_admin_user
 from datetime import datetime, timezone
-from typing import List
-from zoneinfo import ZoneInfo
+from typing import List, Optional
 from tortoise.exceptions import DoesNotExist
+from helpers.coupons import coupon_is_active
+from helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    to_storage_tz,
+)
+from helpers.database import read_only
+from tortoise.functions import Count
+from tortoise.query_utils import Prefetch
 
 # Authentication
 from authentication import *
@@ -19,32 +29,32 @@ async def create_coupon(
     current_user: User = Depends(get_current_admin_user),
 ):
     current_date = datetime.now(timezone.utc)
+    # Tarihler UTC saklanır; offset'siz değerler İstanbul saati kabul edilir
+    coupon_values = coupon.dict()
+    coupon_values["start_date"] = to_storage_tz(coupon.start_date)
+    coupon_values["end_date"] = to_storage_tz(coupon.end_date)
 
-    if coupon.start_date < current_date:
+    if coupon_values["start_date"] < current_date:
         raise HTTPException(status_code=400, detail="Start date cannot be in the past.")
 
-    if coupon.end_date < coupon.start_date:
+    if coupon_values["end_date"] < coupon_values["start_date"]:
         raise HTTPException(
             status_code=400, detail="End date cannot be earlier than start date."
         )
 
-    coupon_obj = await Coupons.create(**coupon.dict())
+    coupon_obj = await Coupons.create(**coupon_values)
     users_to_assign = await User.filter(id__in=user_ids)
     await coupon_obj.users.add(*users_to_assign)
 
     return await coupon_pydanticOut.from_tortoise_orm(coupon_obj)
 
 
-@router.get("/coupons")
+@router.get("/coupons", dependencies=[Depends(read_only)])
 async def get_user_coupons(current_user: User = Depends(get_current_user)):
-    current_date = datetime.now(ZoneInfo("Europe/Istanbul"))
+    current_date = datetime.now(timezone.utc)
     coupons = await current_user.coupons.all()
 
-    for coupon in coupons:
-        if not (coupon.start_date <= current_date <= coupon.end_date):
-            coupon.is_active = False
-            await coupon.save()
-
+    # Süresi dolan kuponlar arka planda pasife çekilir; burada sadece okunur
     return {
         "status": "success",
         "coupons": [
@@ -57,23 +67,52 @@ async def get_user_coupons(current_user: User = Depends(get_current_user)):
                 "discount_description": coupon.discount_description,
                 "start_date": coupon.start_date,
                 "end_date": coupon.end_date,
-                "is_active": coupon.is_active,
+                "is_active": coupon_is_active(coupon, current_date),
             }
             for coupon in coupons
         ],
     }
 
 
-@router.get("/coupons/all")
-async def get_all_coupons(current_user: User = Depends(get_current_admin_user)):
-    current_date = datetime.now(ZoneInfo("Europe/Istanbul"))
-    coupons = await Coupons.all()
+@router.get("/coupons/all", dependencies=[Depends(read_only)])
+async def get_all_coupons(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    include_users: bool = True,
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Kuponları id sırasıyla sayfalı döner. Kullanıcılar tek bir prefetch
+    sorgusuyla yüklenir; include_users=false ise sadece kullanıcı sayısı döner.
+    """
+    current_date = datetime.now(timezone.utc)
+    limit = clamp_limit(limit)
 
-    for coupon in coupons:
-        if not (coupon.start_date <= current_date <= coupon.end_date):
-            coupon.is_active = False
-            await coupon.save()
+    coupons_query = Coupons.all().order_by("id")
+    if cursor:
+        _, last_id = decode_cursor(cursor, is_datetime=False)
+        coupons_query = coupons_query.filter(id__gt=last_id)
 
+    if include_users:
+        coupons_query = coupons_query.prefetch_related(
+            Prefetch("users", queryset=User.all().only("id", "email"))
+        )
+    else:
+        coupons_query = coupons_query.annotate(user_count=Count("users"))
+
+    coupons = await coupons_query.limit(limit + 1)
+    next_cursor = None
+    if len(coupons) > limit:
+        coupons = coupons[:limit]
+        next_cursor = encode_cursor(None, coupons[-1].id)
+
+    def coupon_users(coupon):
+        if include_users:
+            users = [{"id": user.id, "email": user.email} for user in coupon.users]
+            return {"users": users, "user_count": len(users)}
+        return {"user_count": coupon.user_count}
+
+    # Süresi dolan kuponlar arka planda pasife çekilir; burada sadece okunur
     return {
         "status": "success",
         "coupons": [
@@ -86,14 +125,12 @@ async def get_all_coupons(current_user: User = Depends(get_current_admin_user)):
                 "discount_description": coupon.discount_description,
                 "start_date": coupon.start_date,
                 "end_date": coupon.end_date,
-                "is_active": coupon.is_active,
-                "users": [
-                    {"id": user.id, "email": user.email}
-                    for user in await coupon.users.all()
-                ],
+                "is_active": coupon_is_active(coupon, current_date),
+                **coupon_users(coupon),
             }
             for coupon in coupons
         ],
+        "next_cursor": next_cursor,
     }
 
 
@@ -129,7 +166,7 @@ async def validate_coupon(
         raise HTTPException(status_code=404, detail="Coupon not found.")
 
     # Kuponun geçerlilik tarihlerini kontrol et
-    current_date = datetime.now(ZoneInfo("Europe/Istanbul"))
+    current_date = datetime.now(timezone.utc)
     if not (coupon.start_date <= current_date <= coupon.end_date):
         raise HTTPException(status_code=400, detail="Coupon is not valid at this time.")
 
@@ -147,7 +184,7 @@ async def validate_coupon(
                 "discount_description": coupon.discount_description,
                 "start_date": coupon.start_date,
                 "end_date": coupon.end_date,
-                "is_active": coupon.is_active,
+                "is_active": coupon_is_active(coupon, current_date),
             },
         }
 
@@ -163,7 +200,7 @@ async def validate_coupon(
             "cardpostal_discount": coupon.cardpostal_discount,
             "start_date": coupon.start_date,
             "end_date": coupon.end_date,
-            "is_active": coupon.is_active,
+            "is_active": coupon_is_active(coupon, current_date),
         },
     }
 
@@ -199,18 +236,18 @@ async def update_coupon(
         coupon = await Coupons.get(coupon_code=coupon_code)
         coupon_details = coupon_data.get("coupon", {})
 
-        # Convert string dates to datetime objects
+        # Convert string dates to datetime objects (UTC saklanır)
         if "start_date" in coupon_details:
             start_date = datetime.fromisoformat(
                 coupon_details["start_date"].replace("Z", "+00:00")
             )
-            coupon_details["start_date"] = start_date
+            coupon_details["start_date"] = to_storage_tz(start_date)
 
         if "end_date" in coupon_details:
             end_date = datetime.fromisoformat(
                 coupon_details["end_date"].replace("Z", "+00:00")
             )
-            coupon_details["end_date"] = end_date
+            coupon_details["end_date"] = to_storage_tz(end_date)
 
         # Update coupon fields
         for key, value in coupon_details.items():
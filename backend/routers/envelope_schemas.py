@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from models import *
 from tortoise.exceptions import DoesNotExist
 from helpers.user_helper import get_current_admin_user, get_current_user
+from helpers.catalog_cache import catalog
 
 router = APIRouter()
 
@@ -14,6 +15,7 @@ async def get_envelope_schemas():
 @router.post("/schemas", response_model=EnvelopeSchemasOut_Pydantic)
 async def create_envelope_schema(schema: EnvelopeSchemasIn_Pydantic, admin_user=Depends(get_current_admin_user)):
     schema_obj = await EnvelopeSchemas.create(**schema.dict())
+    catalog.bump()
     return await EnvelopeSchemasOut_Pydantic.from_tortoise_orm(schema_obj)
 
 # PUT route: Var olan veriyi güncelleme (sadece admin)
@@ -26,6 +28,7 @@ async def update_envelope_schema(schema_id: int, schema_data: EnvelopeSchemasIn_
     
     await schema_obj.update_from_dict(schema_data.dict())
     await schema_obj.save()
+    catalog.bump()
     return await EnvelopeSchemasOut_Pydantic.from_tortoise_orm(schema_obj)
 
 # DELETE route: Var olan veriyi silme (sadece admin)
@@ -37,4 +40,5 @@ async def delete_envelope_schema(schema_id: int, admin_user=Depends(get_current_
         raise HTTPException(status_code=404, detail="Envelope schema not found")
     
     await schema_obj.delete()
+    catalog.bump()
     return {"detail": "Envelope schema deleted successfully"}
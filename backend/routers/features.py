@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from tortoise.contrib.pydantic import pydantic_queryset_creator
 from models import *
 from helpers.user_helper import get_current_admin_user
+from helpers.catalog_cache import catalog
 from typing import List
 
 router = APIRouter()
@@ -14,6 +15,7 @@ async def create_feature(feature: features_pydanticIn, user=Depends(get_current_
     Only accessible by authorized admin users.
     """
     obj = await Features.create(**feature.dict())
+    catalog.bump()
     return await features_pydantic.from_tortoise_orm(obj)
 
 @router.get("/features", response_model=List[features_pydantic])
@@ -69,6 +71,7 @@ async def update_feature(feature_id: int, updated_feature: features_pydanticIn,
             detail=f"Featue with ID {feature_id} not found."
         )
     await feature.update_from_dict(updated_feature.dict()).save()
+    catalog.bump()
     return await features_pydantic.from_tortoise_orm(feature)
 
 # Delete
@@ -85,4 +88,5 @@ async def delete_feature(feature_id: int, user=Depends(get_current_admin_user)):
             detail=f"Feature with ID {feature_id} not found."
         )
     await feature.delete()
+    catalog.bump()
     return {"detail": f"Feature with ID {feature_id} has been deleted successfully."}
@@ -5,6 +5,8 @@ from typing import List
 import os
 import secrets
 from datetime import datetime
+from helpers.uploads import save_uploads, remove_file
+from helpers.executor import offload
 
 router = APIRouter()
 
@@ -33,27 +35,25 @@ async def upload_files(
     # Define the directory where files will be saved
     UPLOAD_DIRECTORY = "static/uploads/files/"
 
-    # Ensure the upload directory exists
-    if not os.path.exists(UPLOAD_DIRECTORY):
-        os.makedirs(UPLOAD_DIRECTORY)
-
+    # Check if the file extensions are allowed
     for file in files:
-        # Check if the file extension is allowed
         if not allowed_file(file.filename):
             raise HTTPException(status_code=400, detail="Invalid file type. Only PDF, Word, and Excel files are allowed.")
 
+    def upload_name(file: UploadFile) -> str:
         # Generate a unique file name using timestamp and user ID
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         file_extension = file.filename.split(".")[-1]
-        file_name = f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}.{file_extension}"
-        file_path = os.path.join(UPLOAD_DIRECTORY, file_name)
+        return f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}.{file_extension}"
 
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+    # Stream the files to disk
+    uploads = await save_uploads(files, UPLOAD_DIRECTORY, upload_name, content_hash=True)
 
+    for upload in uploads:
         # Save the file record in the database
-        file_obj = await Files.create(order=order, path=file_path)
+        file_obj = await Files.create(
+            order=order, path=upload.path, file_name=os.path.basename(upload.path)
+        )
         saved_files.append(await file_pydantic.from_tortoise_orm(file_obj))
 
         # Add the file path to the Order's JSON field (make sure it's a list)
@@ -65,7 +65,12 @@ async def upload_files(
     # Save the updated Order with the new file paths
     await order.save()
 
-    return {"status": "success", "files": saved_files, "file_paths": order.files}
+    return {
+        "status": "success",
+        "files": saved_files,
+        "file_paths": order.files,
+        "checksums": {upload.path: upload.sha256 for upload in uploads},
+    }
 
 @router.get("/files/{order_id}")
 async def get_files(order_id: int, current_user: User = Depends(get_current_user)):
@@ -100,17 +105,15 @@ async def delete_file(
         raise HTTPException(status_code=403, detail="Not authorized to delete files for this order")
 
     # Find the specific file by its name
-    file = await Files.filter(order=order, path__contains=file_name).first()
+    file = await Files.filter(order=order, file_name=file_name).first()
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
 
-    # Define the path to the file in the file system
-    UPLOAD_DIRECTORY = "static/uploads/files/"
-    file_path = os.path.join(UPLOAD_DIRECTORY, file.path)
+    # The stored path already includes the upload directory
+    file_path = file.path
 
     # Delete the file from the file system
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    await offload("fs", remove_file, file_path)
 
     # Remove the file record from the database
     await file.delete()
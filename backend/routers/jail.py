@@ -1,34 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 from models import *
 from helpers.user_helper import get_current_admin_user, get_current_user
+from helpers.reference_cache import reference_data, reference_response
 
 router = APIRouter()
 
 # Jail Routes
 @router.get("/jails", response_model=List[jail_pydantic])
-async def get_jails(user: dict = Depends(get_current_user)):
-    return await jail_pydantic.from_queryset(Jail.all())
+async def get_jails(request: Request, user: dict = Depends(get_current_user)):
+    return await reference_response(request, "jails", lambda ref: ref.jails)
 
 @router.get("/jails/{jail_id}", response_model=jail_pydantic)
-async def get_jail(jail_id: int, user: dict = Depends(get_current_user)):
-    return await jail_pydantic.from_queryset_single(Jail.get(id=jail_id))
+async def get_jail(jail_id: int, request: Request, user: dict = Depends(get_current_user)):
+    return await reference_response(
+        request,
+        ("jail", jail_id),
+        lambda ref: ref.jails_by_id.get(jail_id),
+        not_found="Object does not exist",
+    )
 
 @router.get("/jails/city/{city_id}", response_model=List[jail_pydantic])
-async def get_jails_by_city(city_id: int, user: dict = Depends(get_current_user)):
-    jails = await Jail.filter(city_id=city_id).all()
-    if not jails:
-        raise HTTPException(status_code=404, detail="No jails found for this city")
-    return await jail_pydantic.from_queryset(Jail.filter(city_id=city_id))
+async def get_jails_by_city(city_id: int, request: Request, user: dict = Depends(get_current_user)):
+    return await reference_response(
+        request,
+        ("jails_by_city", city_id),
+        lambda ref: ref.jails_by_city.get(city_id, []),
+        not_found="No jails found for this city",
+    )
 
 @router.post("/jails", response_model=jail_pydantic)
 async def create_jail(jail: jail_pydanticIn, user: dict = Depends(get_current_admin_user)):
     jail_obj = await Jail.create(**jail.dict())
+    reference_data.bump()
     return await jail_pydantic.from_tortoise_orm(jail_obj)
 
 @router.put("/jails/{jail_id}", response_model=jail_pydantic)
 async def update_jail(jail_id: int, jail: jail_pydanticIn, user: dict = Depends(get_current_admin_user)):
     await Jail.filter(id=jail_id).update(**jail.dict())
+    reference_data.bump()
     return await jail_pydantic.from_queryset_single(Jail.get(id=jail_id))
 
 @router.delete("/jails/{jail_id}", response_model=dict)
@@ -36,4 +46,5 @@ async def delete_jail(jail_id: int, user: dict = Depends(get_current_admin_user)
     delete_obj = await Jail.filter(id=jail_id).delete()
     if not delete_obj:
         raise HTTPException(status_code=404, detail="Jail not found")
+    reference_data.bump()
     return {"message": "Jail deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,23 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from helpers.metrics import METRICS_ENABLED, METRICS_TOKEN, registry
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    # Prometheus metin formatında route metrikleri
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    if METRICS_TOKEN:
+        expected = f"Bearer {METRICS_TOKEN}".encode()
+        provided = request.headers.get("authorization", "").encode()
+        if not secrets.compare_digest(provided, expected):
+            raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,6 +1,18 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends
+from tortoise.transactions import in_transaction
 from models import *
+from helpers.database import WRITER
 from helpers.user_helper import get_current_user
+from helpers.pricing import price_order
+from helpers.stats import (
+    order_snapshot,
+    record_order_created,
+    record_order_deleted,
+    record_order_updated,
+    status_counter,
+)
 
 # Authentication
 from authentication import *
@@ -10,6 +22,7 @@ router = APIRouter()
 @router.post("/order", response_model=order_pydanticOut)
 async def create_order(
     order: order_pydanticIn,
+    coupon_code: Optional[str] = None,
     current_user: User = Depends(get_current_user),
 ):
     # Ensure the user is logged in and has a customer privilege
@@ -21,7 +34,13 @@ async def create_order(
     # Automatically set customer_name and customer_id from the current user
     order_data["customer_name"] = f"{current_user.name} {current_user.surname}"
     order_data["customer_id"] = current_user.id  # Fill in customer_id from the current user
-    order_obj = await Order.create(**order_data)
+    # Fiyat alanları istemciden alınmaz, sunucuda hesaplanır
+    order_obj = Order(**order_data)
+    await price_order(order_obj, current_user, coupon_code)
+    # Sipariş ve istatistik özetleri birlikte yazılır
+    async with in_transaction(WRITER):
+        await order_obj.save()
+        await record_order_created(order_obj)
 
     return await order_pydanticOut.from_tortoise_orm(order_obj)
 
@@ -29,6 +48,7 @@ async def create_order(
 async def update_order(
     order_id: int,
     order_update: order_pydanticIn,
+    coupon_code: Optional[str] = None,
     current_user: User = Depends(get_current_user)
 ):
     # Ensure the user is logged in and has a customer privilege
@@ -50,10 +70,14 @@ async def update_order(
 
     # Update the order with provided data
     update_data = order_update.dict(exclude_unset=True)
+    before = order_snapshot(order_obj)
     for key, value in update_data.items():
         setattr(order_obj, key, value)
-    
-    await order_obj.save()  # Save the updated order
+    await price_order(order_obj, current_user, coupon_code)
+
+    async with in_transaction(WRITER):
+        await order_obj.save()  # Save the updated order
+        await record_order_updated(before, order_obj)
 
     return await order_pydanticOut.from_tortoise_orm(order_obj)
 
@@ -75,7 +99,9 @@ async def delete_order(
     if order_obj.customer_id != current_user.id:
         raise HTTPException(status_code=403, detail="You are not authorized to delete this order")
 
-    await order_obj.delete()  # Delete the order
+    async with in_transaction(WRITER):
+        await order_obj.delete()  # Delete the order
+        await record_order_deleted(order_obj)
 
     return {"detail": "Order deleted successfully"}
 
@@ -97,16 +123,24 @@ async def get_order(
 
 @router.get("/check_status", response_model=dict)
 async def check_order_status(
+    scope: str = "user",
     current_user: User = Depends(get_current_user)
 ):
     # Kullanıcının "Müşteri" veya "Admin" olarak yetkili olup olmadığını kontrol et
     if current_user.privilege not in ["Müşteri", "Admin"]:
         raise HTTPException(status_code=403, detail="Operation not permitted")
 
-    # "Sipariş Bekleniyor" statüsüne sahip bir sipariş olup olmadığını kontrol et
-    orders = await Order.filter(status="Sipariş Bekleniyor").all()
-
-    # Eğer en az bir siparişin durumu "Sipariş Bekleniyor" ise not_send True, yoksa False döndür
-    not_send = len(orders) > 0
-
-    return {"not_send": not_send}
\ No newline at end of file
+    if scope == "all":
+        # Tüm siparişler için bellek içi sayaç kullanılır (sadece admin)
+        if current_user.privilege != "Admin":
+            raise HTTPException(status_code=403, detail="Operation not permitted")
+        not_send = await status_counter.get("Sipariş Bekleniyor") > 0
+    elif scope == "user":
+        # Kullanıcının "Sipariş Bekleniyor" durumunda siparişi var mı (indeksli EXISTS)
+        not_send = await Order.filter(
+            customer_id=current_user.id, status="Sipariş Bekleniyor"
+        ).exists()
+    else:
+        raise HTTPException(status_code=400, detail="scope must be 'user' or 'all'")
+
+    return {"not_send": not_send}
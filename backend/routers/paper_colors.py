@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from models import *
 from helpers.user_helper import get_current_admin_user
+from helpers.catalog_cache import catalog
 
 # Authentication
 from authentication import *
@@ -30,7 +31,9 @@ async def create_paper_color(
     paper_color: paper_color_pydanticIn,
     current_user: User = Depends(get_current_admin_user),
 ):
-    return await PaperColors.create(**paper_color.dict())
+    color_instance = await PaperColors.create(**paper_color.dict())
+    catalog.bump()
+    return color_instance
 
 
 # PUT method to update a PaperColor
@@ -45,6 +48,7 @@ async def update_paper_color(
         raise HTTPException(status_code=404, detail="Paper color not found")
 
     await color_instance.update_from_dict(paper_color.dict()).save()
+    catalog.bump()
     return await paper_color_pydantic.from_tortoise_orm(color_instance)
 
 
@@ -58,4 +62,5 @@ async def delete_paper_color(
         raise HTTPException(status_code=404, detail="Paper color not found")
 
     await color_instance.delete()
+    catalog.bump()
     return {"detail": "Paper color deleted successfully"}
@@ -7,6 +7,10 @@ import os
 import secrets
 from PIL import Image
 from tortoise.exceptions import DoesNotExist
+from helpers.uploads import save_uploads, discard_uploads, remove_file
+from helpers.executor import offload
+from helpers.images import create_derivatives, remove_derivatives
+import asyncio
 
 # Authentication
 from authentication import *
@@ -14,6 +18,11 @@ from authentication import *
 router = APIRouter()
 
 
+def verify_image(path: str):
+    with Image.open(path) as img:
+        img.verify()
+
+
 @router.post("/photo")
 async def upload_photos(
     order_id: int,
@@ -35,29 +44,36 @@ async def upload_photos(
     # Define the directory where photos will be saved
     UPLOAD_DIRECTORY = "static/uploads/photos/"
 
-    # Ensure the upload directory exists
-    if not os.path.exists(UPLOAD_DIRECTORY):
-        os.makedirs(UPLOAD_DIRECTORY)
-
-    for file in files:
+    def photo_name(file: UploadFile) -> str:
         # Generate a unique file name using timestamp and user ID
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_name = f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}"
-        file_path = os.path.join(UPLOAD_DIRECTORY, file_name)
+        return f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}"
 
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+    # Stream the files to disk
+    uploads = await save_uploads(files, UPLOAD_DIRECTORY, photo_name, content_hash=True)
 
-        # Verify the image
+    # Verify the images
+    for upload in uploads:
         try:
-            img = Image.open(file_path)
-            img.verify()
+            await offload("image", verify_image, upload.path)
         except (IOError, SyntaxError):
+            await discard_uploads(uploads)
             raise HTTPException(status_code=400, detail="Invalid image file")
 
+    # Create thumbnail and preview images in the process pool
+    derivatives = await asyncio.gather(
+        *(create_derivatives(upload.path) for upload in uploads)
+    )
+
+    for upload, derived in zip(uploads, derivatives):
         # Save the photo in the database
-        photo_obj = await Photo.create(order=order, path=file_path)
+        photo_obj = await Photo.create(
+            order=order,
+            path=upload.path,
+            file_name=os.path.basename(upload.path),
+            thumbnail_path=derived.get("thumbnail"),
+            preview_path=derived.get("preview"),
+        )
         saved_files.append(await photo_pydantic.from_tortoise_orm(photo_obj))
 
         # Add the photo path to the Order's JSON field
@@ -66,7 +82,12 @@ async def upload_photos(
     # Save the updated Order with the new photo paths
     await order.save()
 
-    return {"status": "success", "photos": saved_files, "photo_paths": order.photos}
+    return {
+        "status": "success",
+        "photos": saved_files,
+        "photo_paths": order.photos,
+        "checksums": {upload.path: upload.sha256 for upload in uploads},
+    }
 
 
 @router.get("/photos/{order_id}")
@@ -85,8 +106,19 @@ async def get_photos(order_id: int, current_user: User = Depends(get_current_use
     # Get all photos associated with the order
     photos = await Photo.filter(order=order).all()
 
-    # Return the list of photo paths
-    return {"status": "success", "photos": [photo.path for photo in photos]}
+    # Return the list of photo paths with their thumbnail/preview versions
+    return {
+        "status": "success",
+        "photos": [photo.path for photo in photos],
+        "derivatives": [
+            {
+                "path": photo.path,
+                "thumbnail": photo.thumbnail_path or photo.path,
+                "preview": photo.preview_path or photo.path,
+            }
+            for photo in photos
+        ],
+    }
 
 
 @router.delete("/photos/{order_id}/{photo_name}")
@@ -105,17 +137,16 @@ async def delete_photo(
         )
 
     # Find the specific photo by its name
-    photo = await Photo.filter(order=order, path__contains=photo_name).first()
+    photo = await Photo.filter(order=order, file_name=photo_name).first()
     if not photo:
         raise HTTPException(status_code=404, detail="Photo not found")
 
-    # Define the path to the photo in the file system
-    UPLOAD_DIRECTORY = "static/uploads/photos/"
-    photo_path = os.path.join(UPLOAD_DIRECTORY, photo.path)
+    # The stored path already includes the upload directory
+    photo_path = photo.path
 
-    # Delete the photo file from the file system
-    if os.path.exists(photo_path):
-        os.remove(photo_path)
+    # Delete the photo file and its derivatives from the file system
+    await offload("fs", remove_file, photo_path)
+    await offload("fs", remove_derivatives, photo_path)
 
     # Remove the photo record from the database
     await photo.delete()
@@ -165,24 +196,14 @@ async def upload_media(
     # Set the upload directory based on the model type
     UPLOAD_DIRECTORY = f"static/uploads/{model_type}/"
 
-    # Ensure the upload directory exists
-    if not os.path.exists(UPLOAD_DIRECTORY):
-        os.makedirs(UPLOAD_DIRECTORY)
-
-    saved_files = []
-
-    # Process each file
-    for file in files:
+    def media_name(file: UploadFile) -> str:
         # Generate a unique file name
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_name = f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}.{file.filename.split('.')[-1]}"
-        file_path = os.path.join(UPLOAD_DIRECTORY, file_name)
-
-        # Save the file
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+        return f"{timestamp}_{current_user.id}_{secrets.token_hex(4)}.{file.filename.split('.')[-1]}"
 
-        saved_files.append(file_path)
+    # Stream the files to disk
+    uploads = await save_uploads(files, UPLOAD_DIRECTORY, media_name, content_hash=True)
+    saved_files = [upload.path for upload in uploads]
 
     # Update the specified model and field
     if model_type == "blog":
@@ -218,6 +239,7 @@ async def upload_media(
     return {
         "status": "success",
         "saved_files": saved_files,
+        "checksums": {upload.path: upload.sha256 for upload in uploads},
     }
 
 
@@ -247,9 +269,7 @@ async def delete_media(
 
             # Delete physical files
             for photo_path in photos_to_delete:
-                full_path = photo_path
-                if os.path.exists(full_path):
-                    os.remove(full_path)
+                await offload("fs", remove_file, photo_path)
 
             return {"message": "Photos deleted successfully"}
 
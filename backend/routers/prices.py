@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from tortoise.contrib.pydantic import pydantic_queryset_creator
 from models import *
 from helpers.user_helper import get_current_admin_user
+from helpers.catalog_cache import catalog
 from typing import List
 
 router = APIRouter()
@@ -17,6 +18,7 @@ async def create_price(price: prices_pydanticIn, user=Depends(get_current_admin_
     Only accessible by authorized admin users.
     """
     obj = await Prices.create(**price.dict())
+    catalog.bump()
     return await prices_pydantic.from_tortoise_orm(obj)
 
 
@@ -84,6 +86,7 @@ async def update_price(
             detail=f"Price with ID {price_id} not found.",
         )
     await price.update_from_dict(updated_price.dict()).save()
+    catalog.bump()
     return await prices_pydantic.from_tortoise_orm(price)
 
 
@@ -101,4 +104,5 @@ async def delete_price(price_id: int, user=Depends(get_current_admin_user)):
             detail=f"Price with ID {price_id} not found.",
         )
     await price.delete()
+    catalog.bump()
     return {"detail": f"Price with ID {price_id} has been deleted successfully."}
@@ -0,0 +1,54 @@
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+
+from models import User
+from helpers.user_helper import get_current_user
+from helpers.pricing import get_coupon_for_user, pricing_engine, quote
+
+router = APIRouter()
+
+MAX_QUOTE_BATCH = 100
+
+
+class QuoteConfig(BaseModel):
+    envelope_text: Optional[str] = ""
+    envelope_color: Optional[str] = ""
+    paper_color: Optional[str] = ""
+    # Liste (siparişteki gibi) ya da doğrudan adet
+    cardpostals: Union[int, list] = 0
+    photos: Union[int, list] = 0
+    files: Union[int, list] = 0
+    smell: Optional[str] = ""
+    shipment_type: Optional[str] = ""
+
+
+class QuoteBatch(BaseModel):
+    configs: List[QuoteConfig]
+    coupon_code: Optional[str] = None
+
+
+@router.post("/quote/batch", response_model=dict)
+async def quote_batch(
+    batch: QuoteBatch,
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Birden fazla sipariş konfigürasyonunu tek istekte fiyatlandırır.
+    Fiyat tablosu ve kupon bir kez yüklenir, konfigürasyonlar bellekte hesaplanır.
+    """
+    if len(batch.configs) > MAX_QUOTE_BATCH:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {MAX_QUOTE_BATCH} configurations can be quoted at once.",
+        )
+
+    coupon = None
+    if batch.coupon_code:
+        coupon = await get_coupon_for_user(batch.coupon_code, current_user)
+
+    table = await pricing_engine.table()
+    quotes = [quote(table, config.dict(), coupon).to_dict() for config in batch.configs]
+
+    return {"price_version": table.version, "quotes": quotes}
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from helpers.reference_import import FORMATS, IMPORT_KINDS, ImportFormatError, import_reference
+from helpers.user_helper import get_current_admin_user
+from models import User
+
+router = APIRouter()
+
+CONTENT_TYPE_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@router.post("/reference/import/{kind}")
+async def import_reference_data(
+    kind: str,
+    request: Request,
+    format: Optional[str] = None,
+    current_admin: User = Depends(get_current_admin_user),
+):
+    """
+    Şehir/ilçe/cezaevi verisini istek gövdesinden (CSV ya da NDJSON) akış
+    halinde yükler. Var olan kayıtlar güncellenir, olmayanlar eklenir;
+    hatalı satırlar atlanır ve satır numaralarıyla raporlanır.
+
+        curl -X POST -H "Content-Type: text/csv" --data-binary @ilceler.csv \\
+            -H "Authorization: Bearer ..." /reference/import/towns
+    """
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown kind. Choose one of: {', '.join(IMPORT_KINDS)}",
+        )
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    data_format = format or CONTENT_TYPE_FORMATS.get(content_type)
+    if data_format not in FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format. Use ?format= one of: {', '.join(FORMATS)}",
+        )
+
+    try:
+        result = await import_reference(kind, request.stream(), data_format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return result.to_dict()
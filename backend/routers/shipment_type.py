@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends
 from models import *
 from helpers.user_helper import get_current_admin_user
+from helpers.catalog_cache import catalog
 
 # Authentication
 from authentication import *
@@ -10,7 +11,9 @@ router = APIRouter()
 # POST and GET methods for ShipmentType
 @router.post("/shipment_type", response_model=shipment_type_pydantic)
 async def create_shipment_type(shipment_type: shipment_type_pydantic, current_user: User = Depends(get_current_admin_user)):
-    return await ShipmentType.create(**shipment_type.dict())
+    shipment = await ShipmentType.create(**shipment_type.dict())
+    catalog.bump()
+    return shipment
 
 @router.get("/shipment_type", response_model=list[shipment_type_pydantic])
 async def get_shipment_type():
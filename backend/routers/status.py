@@ -1,97 +1,117 @@
 from fastapi import APIRouter, Depends, HTTPException
-from tortoise import Tortoise
-from models import User, Order, City, Town, Jail, Photo, Coupons, Comment
-from datetime import datetime, timedelta
-from tortoise.exceptions import DoesNotExist
+from models import User, Order, City, Town, Jail, Photo, Coupons, EmailOutbox
+from datetime import datetime, timedelta, timezone
 from helpers.user_helper import get_current_admin_user
+from helpers.stats import window_totals, status_totals
+from helpers.pagination import LOCAL_TZ
+from helpers.executor import executor_stats
+from helpers.outbox import outbox_worker
+from helpers.ratings import rating_summary
+from helpers.database import read_only
+import time
 
 router = APIRouter()
 
-@router.get("/status")
-async def get_status():
-    # Date ranges for calculations
-    today = datetime.now()
+# Dashboard verisi kısa süreliğine önbellekte tutulur
+STATUS_CACHE_TTL = 30  # saniye
+_status_cache = {"expires_at": 0.0, "data": None}
+
+
+def percent_change(current, previous):
+    return 0 if not previous else ((current - previous) / previous) * 100
+
+
+@router.get("/status", dependencies=[Depends(read_only)])
+async def get_status(current_admin: User = Depends(get_current_admin_user)):
+    if _status_cache["data"] is not None and time.monotonic() < _status_cache["expires_at"]:
+        return _status_cache["data"]
+
+    # Date ranges for calculations (günlük özet tablosu üzerinden)
+    today = datetime.now(LOCAL_TZ).date()
     this_week_start = today - timedelta(days=today.weekday())
     this_month_start = today.replace(day=1)
     this_year_start = today.replace(month=1, day=1)
-    
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+    last_week_start = this_week_start - timedelta(days=7)
+    last_year_start = this_year_start.replace(year=today.year - 1)
+
     # Query total counts
     total_users = await User.all().count()
-    total_orders = await Order.all().count()
     total_cities = await City.all().count()
     total_towns = await Town.all().count()
     total_jails = await Jail.all().count()
     total_photos = await Photo.all().count()
-    active_coupons = await Coupons.filter(is_active=True).count()
-    
-    # Query comments and calculate average stars
-    comments = await Comment.all()
-    average_star_rating = sum(comment.star for comment in comments) / len(comments) if comments else 0
-
-    # Calculate new users (based on join date)
-    new_users_today = await User.filter(join_date__gte=today).count()
-    new_users_this_week = await User.filter(join_date__gte=this_week_start).count()
-    new_users_this_month = await User.filter(join_date__gte=this_month_start).count()
-    new_users_this_year = await User.filter(join_date__gte=this_year_start).count()
-    
-    # Calculate new orders (based on order date)
-    new_orders_today = await Order.filter(date__gte=today).count()
-    new_orders_this_week = await Order.filter(date__gte=this_week_start).count()
-    new_orders_this_month = await Order.filter(date__gte=this_month_start).count()
-    new_orders_this_year = await Order.filter(date__gte=this_year_start).count()
-    
-    # Calculate revenue for the current and past periods
-    last_month_start = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
-    last_week_start = today - timedelta(days=today.weekday() + 7)
-    last_year_start = today.replace(year=today.year - 1)
-
-    # Revenue calculations using a loop-based sum
-    revenue_last_month = sum(order.order_price for order in await Order.filter(date__gte=last_month_start, date__lt=this_month_start))
-    revenue_this_month = sum(order.order_price for order in await Order.filter(date__gte=this_month_start))
-    revenue_last_week = sum(order.order_price for order in await Order.filter(date__gte=last_week_start, date__lt=this_week_start))
-    revenue_this_week = sum(order.order_price for order in await Order.filter(date__gte=this_week_start))
-    revenue_last_year = sum(order.order_price for order in await Order.filter(date__gte=last_year_start, date__lt=this_year_start))
-    revenue_this_year = sum(order.order_price for order in await Order.filter(date__gte=this_year_start))
-
-    # Calculate percentage changes
-    percent_change_month = 0 if not revenue_last_month else ((revenue_this_month - revenue_last_month) / revenue_last_month) * 100
-    percent_change_week = 0 if not revenue_last_week else ((revenue_this_week - revenue_last_week) / revenue_last_week) * 100
-    percent_change_year = 0 if not revenue_last_year else ((revenue_this_year - revenue_last_year) / revenue_last_year) * 100
-    
-    # Return status data
-    return {
+    # Kupon tarihleri UTC olarak saklanıyor
+    now = datetime.now(timezone.utc)
+    active_coupons = await Coupons.filter(
+        is_active=True, start_date__lte=now, end_date__gte=now
+    ).count()
+
+    # Average star rating (yorum özet tablosundan)
+    average_star_rating = (await rating_summary())["average"]
+
+    # Period totals from the daily rollup
+    all_time = await window_totals()
+    today_totals = await window_totals(today)
+    this_week = await window_totals(this_week_start)
+    last_week = await window_totals(last_week_start, this_week_start)
+    this_month = await window_totals(this_month_start)
+    last_month = await window_totals(last_month_start, this_month_start)
+    this_year = await window_totals(this_year_start)
+    last_year = await window_totals(last_year_start, this_year_start)
+
+    data = {
         "total_users": total_users,
-        "total_orders": total_orders,
+        "total_orders": all_time["orders"],
         "total_cities": total_cities,
         "total_towns": total_towns,
         "total_jails": total_jails,
         "total_photos": total_photos,
         "active_coupons": active_coupons,
         "average_star_rating": average_star_rating,
-        
+        "orders_by_status": await status_totals(),
+
         # New user stats
-        "new_users_today": new_users_today,
-        "new_users_this_week": new_users_this_week,
-        "new_users_this_month": new_users_this_month,
-        "new_users_this_year": new_users_this_year,
-        
+        "new_users_today": today_totals["new_users"],
+        "new_users_this_week": this_week["new_users"],
+        "new_users_this_month": this_month["new_users"],
+        "new_users_this_year": this_year["new_users"],
+
         # New order stats
-        "new_orders_today": new_orders_today,
-        "new_orders_this_week": new_orders_this_week,
-        "new_orders_this_month": new_orders_this_month,
-        "new_orders_this_year": new_orders_this_year,
+        "new_orders_today": today_totals["orders"],
+        "new_orders_this_week": this_week["orders"],
+        "new_orders_this_month": this_month["orders"],
+        "new_orders_this_year": this_year["orders"],
 
         # Revenue stats
-        "revenue_current_month": revenue_this_month,
-        "revenue_last_month": revenue_last_month,
-        "revenue_this_week": revenue_this_week,
-        "revenue_last_week": revenue_last_week,
-        "revenue_current_year": revenue_this_year,
-        "revenue_last_year": revenue_last_year,
-        
+        "revenue_current_month": this_month["revenue"],
+        "revenue_last_month": last_month["revenue"],
+        "revenue_this_week": this_week["revenue"],
+        "revenue_last_week": last_week["revenue"],
+        "revenue_current_year": this_year["revenue"],
+        "revenue_last_year": last_year["revenue"],
+
         # Revenue percentage change
-        "revenue_month_percentage": percent_change_month,
-        "revenue_week_percentage": percent_change_week,
-        "revenue_year_percentage": percent_change_year,
-        
+        "revenue_month_percentage": percent_change(this_month["revenue"], last_month["revenue"]),
+        "revenue_week_percentage": percent_change(this_week["revenue"], last_week["revenue"]),
+        "revenue_year_percentage": percent_change(this_year["revenue"], last_year["revenue"]),
     }
+
+    _status_cache["data"] = data
+    _status_cache["expires_at"] = time.monotonic() + STATUS_CACHE_TTL
+    return data
+
+
+@router.get("/status/executors")
+async def get_executor_status(current_admin: User = Depends(get_current_admin_user)):
+    # Havuz başına kuyruk derinliği ve bekleme süresi metrikleri
+    return executor_stats()
+
+
+@router.get("/status/outbox")
+async def get_outbox_status(current_admin: User = Depends(get_current_admin_user)):
+    # E-posta kuyruğunun durumu ve worker sayaçları
+    data = outbox_worker.stats()
+    for state in ("pending", "sending", "sent", "failed"):
+        data[state + "_count"] = await EmailOutbox.filter(status=state).count()
+    return data
@@ -1,33 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 from models import *
 from helpers.user_helper import get_current_user
+from helpers.reference_cache import reference_data, reference_response
 
 router = APIRouter()
 
 
 # Town Routes
 @router.get("/towns", response_model=List[town_pydantic])
-async def get_towns(user: dict = Depends(get_current_user)):
-    return await town_pydantic.from_queryset(Town.all())
+async def get_towns(request: Request, user: dict = Depends(get_current_user)):
+    return await reference_response(request, "towns", lambda ref: ref.towns)
 
 
 @router.get("/towns/city/{city_id}", response_model=List[town_pydantic])
-async def get_towns_by_city(city_id: int, user: dict = Depends(get_current_user)):
-    towns = await Town.filter(city_id=city_id).all()
-    if not towns:
-        raise HTTPException(status_code=404, detail="No towns found for this city")
-    return await town_pydantic.from_queryset(Town.filter(city_id=city_id))
+async def get_towns_by_city(
+    city_id: int, request: Request, user: dict = Depends(get_current_user)
+):
+    return await reference_response(
+        request,
+        ("towns_by_city", city_id),
+        lambda ref: ref.towns_by_city.get(city_id, []),
+        not_found="No towns found for this city",
+    )
 
 
 @router.get("/towns/{town_id}", response_model=town_pydantic)
-async def get_town(town_id: int, user: dict = Depends(get_current_user)):
-    return await town_pydantic.from_queryset_single(Town.get(town_id=town_id))
+async def get_town(
+    town_id: int, request: Request, user: dict = Depends(get_current_user)
+):
+    return await reference_response(
+        request,
+        ("town", town_id),
+        lambda ref: ref.towns_by_id.get(town_id),
+        not_found="Object does not exist",
+    )
 
 
 @router.post("/towns", response_model=town_pydantic)
 async def create_town(town: town_pydanticIn, user: dict = Depends(get_current_user)):
     town_obj = await Town.create(**town.dict(exclude_unset=True))
+    reference_data.bump()
     return await town_pydantic.from_tortoise_orm(town_obj)
 
 
@@ -36,6 +49,7 @@ async def update_town(
     town_id: int, town: town_pydanticIn, user: dict = Depends(get_current_user)
 ):
     await Town.filter(town_id=town_id).update(**town.dict(exclude_unset=True))
+    reference_data.bump()
     return await town_pydantic.from_queryset_single(Town.get(town_id=town_id))
 
 
@@ -44,4 +58,5 @@ async def delete_town(town_id: int, user: dict = Depends(get_current_user)):
     deleted_count = await Town.filter(town_id=town_id).delete()
     if not deleted_count:
         raise HTTPException(status_code=404, detail=f"Town {town_id} not found")
+    reference_data.bump()
     return {"message": f"Town {town_id} deleted successfully"}
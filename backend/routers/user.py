@@ -3,7 +3,20 @@ from typing import Optional
 from pydantic import EmailStr
 from models import *
 from helpers.user_helper import get_current_user
+from helpers.stats import record_user_created, record_user_deleted
+from helpers.user_cache import user_cache
+from helpers.database import read_only
+from helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+)
+from helpers.text import strip_html
 from tortoise.exceptions import DoesNotExist
+from tortoise.functions import Function
+from pypika.terms import Function as SqlFunction
 
 # Authentication
 from authentication import *
@@ -43,24 +56,85 @@ async def user_login(request: Request):
 @router.post("/register")
 async def user_registeration(user: user_pydanticIn):
     user_info = user.dict(exclude_unset=True)
-    user_info["password"] = get_hashed_password(user_info["password"])
+    user_info["password"] = await get_hashed_password(user_info["password"])
     user_info["is_verified"] = False  # is_verified false olarak atanıyor
-    user_info["join_date"] = datetime.now()  # join_date şu anki zaman olarak atanıyor
+    user_info["join_date"] = datetime.now(timezone.utc)  # join_date şu anki zaman olarak atanıyor
     user_info["privilege"] = "Müşteri"  # privilege "Müşteri" olarak atanıyor
     user_obj = await User.create(**user_info)
+    await record_user_created(user_obj)
     new_user = await user_pydantic.from_tortoise_orm(user_obj)
     return {
         "status": "ok",
         "data": f"Hello, {new_user.name} thanks for registering. Please check your email for verification link",
     }
 
-@router.get("/profile")
-async def get_profile(current_user: User = Depends(get_current_user)):
-    # Kullanıcıya ait siparişleri al
-    orders = await Order.filter(customer_id=current_user.id)
+# Profil sayfasındaki sipariş listesi için okunan kolonlar
+ORDER_SUMMARY_FIELDS = (
+    "id",
+    "date",
+    "status",
+    "letter_type",
+    "order_price",
+    "receiver_name",
+    "receiver_surname",
+    "jail_name",
+    "track_id",
+    "track_link",
+)
+ENVELOPE_PREVIEW_LENGTH = 100
 
-    # Sipariş bilgilerini JSON formatında döndürmek için
-    order_data = [await order_pydanticOut.from_tortoise_orm(order) for order in orders]
+
+class _SqlSubstr(SqlFunction):
+    def __init__(self, term, start, length, alias=None):
+        super().__init__("SUBSTR", term, start, length, alias=alias)
+
+
+class Substr(Function):
+    database_func = _SqlSubstr
+
+
+async def order_summaries(
+    customer_id: int, limit: int, cursor: Optional[str] = None, status: Optional[str] = None
+):
+    """
+    Kullanıcının siparişlerini (date, id) üzerinden yeni → eski sıralı,
+    sadece özet kolonlarla döner. Mektup metninin yalnızca başı okunur.
+    """
+    orders = Order.filter(customer_id=customer_id)
+    if status:
+        orders = orders.filter(status=status)
+    if cursor:
+        date_value, order_id = decode_cursor(cursor)
+        orders = orders.filter(keyset_filter("date", date_value, order_id))
+
+    rows = await (
+        orders.annotate(
+            envelope_head=Substr("envelope_text", 1, ENVELOPE_PREVIEW_LENGTH * 4)
+        )
+        .order_by("-date", "-id")
+        .limit(limit + 1)
+        .values(*ORDER_SUMMARY_FIELDS, "envelope_head")
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["date"], rows[-1]["id"])
+
+    for row in rows:
+        text = strip_html(row.pop("envelope_head"))
+        row["envelope_preview"] = text[:ENVELOPE_PREVIEW_LENGTH]
+    return rows, next_cursor
+
+
+@router.get("/profile", dependencies=[Depends(read_only)])
+async def get_profile(
+    limit: int = DEFAULT_PAGE_SIZE,
+    current_user: User = Depends(get_current_user),
+):
+    # Kullanıcıya ait siparişlerin ilk sayfası (özet); devamı /profile/orders,
+    # tam sipariş GET /order/{order_id} ile alınır
+    orders, next_cursor = await order_summaries(current_user.id, clamp_limit(limit))
 
     # Kullanıcı profil bilgileri ve sipariş bilgilerini döndür
     return {
@@ -72,9 +146,22 @@ async def get_profile(current_user: User = Depends(get_current_user)):
             "phone_number": current_user.phone_number,
             "join_date": current_user.join_date
         },
-        "orders": order_data
+        "orders": orders,
+        "next_cursor": next_cursor,
     }
 
+@router.get("/profile/orders", dependencies=[Depends(read_only)])
+async def get_profile_orders(
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+):
+    orders, next_cursor = await order_summaries(
+        current_user.id, clamp_limit(limit), cursor, status
+    )
+    return {"orders": orders, "next_cursor": next_cursor}
+
 @router.put("/update_password")
 async def update_password(request: Request, user: User = Depends(get_current_user)):
     try:
@@ -86,12 +173,13 @@ async def update_password(request: Request, user: User = Depends(get_current_use
             raise HTTPException(status_code=400, detail={"error": "Eski şifre ve yeni şifre gereklidir."})
 
         # Şifre kontrolü
-        if not verify_password(old_password, user.password):
+        if not await verify_password(old_password, user.password):
             raise HTTPException(status_code=400, detail={"error": "Eski şifre hatalı."})
 
         # Yeni şifreyi güncelle
-        user.password = get_hashed_password(new_password)
+        user.password = await get_hashed_password(new_password)
         await user.save()
+        user_cache.invalidate(user.id)
         
         return {"message": "Şifre başarıyla güncellendi."}
 
@@ -109,6 +197,7 @@ async def update_email(new_email: str, user: User = Depends(get_current_user)):
         # E-posta güncelle
         user.email = new_email
         await user.save()
+        user_cache.invalidate(user.id)
         return {"message": "E-posta başarıyla güncellendi."}
 
     except DoesNotExist:
@@ -121,6 +210,7 @@ async def update_name(new_first_name: str, new_last_name: str, user: User = Depe
         user.first_name = new_first_name
         user.last_name = new_last_name
         await user.save()
+        user_cache.invalidate(user.id)
         return {"message": "Ad ve soyadı başarıyla güncellendi."}
 
     except DoesNotExist:
@@ -156,6 +246,7 @@ async def update_user_info(
 
         # Değişiklikleri kaydet
         await user.save()
+        user_cache.invalidate(user.id)
 
         return {"message": "Kullanıcı bilgileri başarıyla güncellendi."}
 
@@ -166,6 +257,8 @@ async def update_user_info(
 async def delete_user(user: User = Depends(get_current_user)):
     try:
         await user.delete()
+        user_cache.invalidate(user.id)
+        await record_user_deleted(user)
         return {"message": "Kullanıcı başarıyla silindi."}
     except DoesNotExist:
         raise HTTPException(status_code=404, detail={"error": "Kullanıcı bulunamadı."})
\ No newline at end of file
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Request
 from models import *
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
+from helpers.user_cache import user_cache
 
 # Authentication
 from authentication import *
@@ -16,6 +17,7 @@ async def email_verification(request: Request, token: str):
     if user and not user.is_verified:
         user.is_verified = True
         await user.save()
+        user_cache.invalidate(user.id)
         return templates.TemplateResponse(
             "verification.html", {"request": request, "name": user.name}
         )
@@ -0,0 +1,32 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Uygulama modülleri backend dizininden import edilir (models, helpers, routers)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def run_with_db(test):
+    """Testi boş bir bellek içi veritabanında, şema güncellenmiş halde çalıştırır."""
+    from tortoise import Tortoise
+
+    from helpers.migrations import run_migrations
+
+    async def main():
+        await Tortoise.init(db_url="sqlite://:memory:", modules={"models": ["models"]})
+        try:
+            await run_migrations()
+            await test()
+        finally:
+            await Tortoise.close_connections()
+
+    asyncio.run(main())
+
+
+@pytest.fixture
+def run_db():
+    return run_with_db
@@ -0,0 +1,174 @@
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import helpers.catalog_cache as catalog_cache
+from helpers.cardpostal_images import CardpostalImageIndex
+from helpers.catalog_cache import CatalogCache
+from helpers.pricing import PricingEngine
+from helpers.ratings import CommentFeedCache
+from helpers.reference_cache import ReferenceData
+from models import Cardpostal, Category, City, Comment, Prices
+
+
+async def add_city(city_id: int):
+    await City.create(
+        city_id=city_id, country_id=1, city_name=f"Şehir {city_id}", plate_no=city_id, phone_code=""
+    )
+
+
+def test_reference_snapshot_reloads_after_ttl(run_db):
+    async def test():
+        cache = ReferenceData(ttl=3600)
+        await add_city(1)
+        assert [row["city_id"] for row in (await cache.get()).cities] == [1]
+
+        # Başka bir worker'ın yaptığı değişiklik: bu süreçte bump() çağrılmaz
+        await add_city(2)
+        assert [row["city_id"] for row in (await cache.get()).cities] == [1]
+
+        cache.ttl = 0
+        assert [row["city_id"] for row in (await cache.get()).cities] == [1, 2]
+
+        cache.ttl = 3600
+        await add_city(3)
+        cache.bump()
+        assert [row["city_id"] for row in (await cache.get()).cities] == [1, 2, 3]
+
+    run_db(test)
+
+
+async def catalog_prices(cache: CatalogCache) -> list:
+    version, payload = await cache.get()
+    return [price["price_name"] for price in json.loads(payload.body)["prices"]]
+
+
+def test_catalog_and_price_table_reload_after_ttl(run_db):
+    async def test():
+        cache = CatalogCache(ttl=3600)
+        engine = PricingEngine(ttl=3600)
+        await Prices.create(price_name="photo_price", price_description="", price_value=3)
+        assert await catalog_prices(cache) == ["photo_price"]
+        assert list((await engine.table()).prices) == ["photo_price"]
+
+        await Prices.create(price_name="file_price", price_description="", price_value=2)
+        assert await catalog_prices(cache) == ["photo_price"]
+        assert list((await engine.table()).prices) == ["photo_price"]
+
+        cache.ttl = engine.ttl = 0
+        assert await catalog_prices(cache) == ["photo_price", "file_price"]
+        assert list((await engine.table()).prices) == ["photo_price", "file_price"]
+
+    run_db(test)
+
+
+async def feed_titles(cache: CommentFeedCache) -> list:
+    version, payload, next_cursor = await cache.get()
+    return [comment["title"] for comment in json.loads(payload.body)]
+
+
+def test_comment_feed_reloads_after_ttl(run_db):
+    async def test():
+        cache = CommentFeedCache(ttl=3600)
+        await Comment.create(title="ilk", text="", star=5, customer_name="A", customer_id=1)
+        assert await feed_titles(cache) == ["ilk"]
+
+        await Comment.create(title="ikinci", text="", star=4, customer_name="B", customer_id=2)
+        assert await feed_titles(cache) == ["ilk"]
+
+        cache.ttl = 0
+        assert await feed_titles(cache) == ["ikinci", "ilk"]
+
+    run_db(test)
+
+
+def test_cardpostal_index_rescans_after_ttl(run_db, tmp_path):
+    async def test():
+        index = CardpostalImageIndex(ttl=3600)
+        changes = []
+        index.on_change(lambda: changes.append(True))
+        category = await Category.create(name="Doğum günü")
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.jpg").write_bytes(name.encode())
+
+        first = await Cardpostal.create(name="a", category=category, image_path=str(tmp_path / "a.jpg"))
+        assert list(await index.get()) == [first.id]
+
+        second = await Cardpostal.create(name="b", category=category, image_path=str(tmp_path / "b.jpg"))
+        assert list(await index.get()) == [first.id]
+
+        index.ttl = 0
+        assert list(await index.get()) == [first.id, second.id]
+        assert len(changes) == 2
+
+    run_db(test)
+
+
+def test_catalog_stores_build_under_version_bumped_by_image_index(run_db, tmp_path, monkeypatch):
+    async def test():
+        index = CardpostalImageIndex(ttl=3600)
+        cache = CatalogCache(ttl=3600)
+        index.on_change(cache.bump)
+        monkeypatch.setattr(catalog_cache, "cardpostal_images", index)
+
+        category = await Category.create(name="Doğum günü")
+        (tmp_path / "a.jpg").write_bytes(b"a")
+        await Cardpostal.create(name="a", category=category, image_path=str(tmp_path / "a.jpg"))
+
+        # İlk build indeksi doldurur ve sürümü artırır; kayıt güncel sürümde olmalı
+        version, payload = await cache.get()
+        assert version == cache.version == 1
+        assert json.loads(payload.body)["version"] == 1
+        assert await cache.get() == (version, payload)
+
+    run_db(test)
+
+
+async def serve_image(index: CardpostalImageIndex, cardpostal_id: int):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    response = await index.response(Request(scope), cardpostal_id)
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await response(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return response.headers, body
+
+
+def test_cardpostal_image_changed_between_scans_is_not_served_stale(run_db, tmp_path):
+    async def test():
+        index = CardpostalImageIndex(ttl=3600)
+        category = await Category.create(name="Doğum günü")
+        path = tmp_path / "a.jpg"
+        path.write_bytes(b"eski")
+        cardpostal = await Cardpostal.create(name="a", category=category, image_path=str(path))
+
+        headers, body = await serve_image(index, cardpostal.id)
+        assert body == b"eski"
+        old_etag = headers["etag"]
+
+        # İndeks TTL'i dolmadan dosya yerinde değişir
+        path.write_bytes(b"yeni resim")
+        stat_result = os.stat(path)
+        os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+        headers, body = await serve_image(index, cardpostal.id)
+        assert body == b"yeni resim"
+        assert headers["content-length"] == str(len(b"yeni resim"))
+        assert headers["etag"] != old_etag
+        assert index.url(cardpostal.id).endswith((await index.get())[cardpostal.id].version)
+
+        path.unlink()
+        with pytest.raises(HTTPException) as error:
+            await serve_image(index, cardpostal.id)
+        assert error.value.status_code == 404
+
+    run_db(test)
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+
+from tortoise import Tortoise
+
+from helpers.coupons import expire_coupons
+from helpers.migrations import normalize_dates
+from helpers.pagination import LOCAL_TZ
+from models import Coupons, coupon_pydanticIn
+from routers.coupon import create_coupon
+
+
+async def create_coupon_row(code: str, end_date: datetime) -> Coupons:
+    return await Coupons.create(
+        coupon_code=code,
+        discount_rate=10,
+        start_date=end_date - timedelta(days=30),
+        end_date=end_date,
+    )
+
+
+async def set_raw(coupon: Coupons, column: str, text: str):
+    conn = Tortoise.get_connection("default")
+    await conn.execute_query(
+        f'UPDATE "{Coupons._meta.db_table}" SET "{column}" = ? WHERE "id" = ?', [text, coupon.id]
+    )
+
+
+def test_expire_coupons_uses_utc_after_normalizing_offsets(run_db):
+    async def test():
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        # İki saat önce bitmiş ama +03:00 ile yazıldığı için metinde "gelecekte" görünen kupon
+        expired_local = await create_coupon_row("ESKI", now)
+        await set_raw(expired_local, "end_date", (now - timedelta(hours=2)).astimezone(LOCAL_TZ).isoformat(" "))
+        # Offset'siz yazılmış, bir saat sonra bitecek kupon (Tortoise UTC okur)
+        valid_naive = await create_coupon_row("NAIVE", now)
+        await set_raw(valid_naive, "end_date", (now + timedelta(hours=1)).replace(tzinfo=None).isoformat(" "))
+
+        await normalize_dates(Coupons, "end_date")
+        assert await expire_coupons() == 1
+
+        statuses = dict(await Coupons.all().values_list("coupon_code", "is_active"))
+        assert statuses == {"ESKI": False, "NAIVE": True}
+
+    run_db(test)
+
+
+def test_create_coupon_stores_dates_in_utc(run_db):
+    async def test():
+        start = (datetime.now(LOCAL_TZ) + timedelta(days=1)).replace(microsecond=0)
+        coupon = coupon_pydanticIn(
+            coupon_code="YENI",
+            discount_rate=10,
+            # Offset'siz girilen tarih İstanbul saati kabul edilir
+            start_date=start.replace(tzinfo=None),
+            end_date=start + timedelta(days=7),
+        )
+        await create_coupon(coupon=coupon, user_ids=[], current_user=None)
+
+        conn = Tortoise.get_connection("default")
+        row = (await conn.execute_query_dict(
+            f'SELECT "start_date", "end_date" FROM "{Coupons._meta.db_table}"'
+        ))[0]
+        assert row["start_date"] == start.astimezone(timezone.utc).isoformat(" ")
+        assert row["end_date"] == (start + timedelta(days=7)).astimezone(timezone.utc).isoformat(" ")
+
+    run_db(test)
@@ -0,0 +1,114 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.metrics
+from helpers.metrics import Histogram, MetricsMiddleware, MetricsRegistry, RequestStats, registry
+
+
+def samples(text: str, name: str) -> dict:
+    """Prometheus çıktısındaki `name` ile başlayan örnekler: {etiketli ad: değer}."""
+    result = {}
+    for line in text.splitlines():
+        if line.startswith(name):
+            key, _, value = line.rpartition(" ")
+            result[key] = value
+    return result
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    histogram = Histogram((0.1, 1, 10))
+    # Sınıra eşit değer o kovaya girer (le = küçük eşit)
+    for value in (0.05, 0.1, 0.5, 20):
+        histogram.observe(value)
+
+    lines = histogram.render("latency", 'route="/a"')
+    assert lines == [
+        'latency_bucket{route="/a",le="0.1"} 2',
+        'latency_bucket{route="/a",le="1"} 3',
+        'latency_bucket{route="/a",le="10"} 3',
+        'latency_bucket{route="/a",le="+Inf"} 4',
+        'latency_sum{route="/a"} 20.65',
+        'latency_count{route="/a"} 4',
+    ]
+
+
+def test_render_escapes_labels_and_declares_families():
+    metrics = MetricsRegistry()
+    stats = RequestStats()
+    stats.queries = 3
+    stats.db_time = 0.5
+    metrics.record_request("GET", 'a\\b"c\nd', 200, 0.02, stats, 1500)
+    metrics.record_request("GET", 'a\\b"c\nd', 200, 0.03, RequestStats(), 10)
+    metrics.record_request("GET", 'a\\b"c\nd', 404, 0.01, RequestStats(), 10)
+    text = metrics.render()
+
+    labels = 'method="GET",route="a\\\\b\\"c\\nd"'
+    assert samples(text, "http_requests_total") == {
+        f'http_requests_total{{{labels},status="200"}}': "2",
+        f'http_requests_total{{{labels},status="404"}}': "1",
+    }
+    assert samples(text, "http_request_db_queries_bucket")[
+        f'http_request_db_queries_bucket{{{labels},le="5"}}'
+    ] == "3"
+    assert samples(text, "http_request_db_seconds_total")[
+        f"http_request_db_seconds_total{{{labels}}}"
+    ] == "0.5"
+    assert samples(text, "http_response_size_bytes_count")[
+        f"http_response_size_bytes_count{{{labels}}}"
+    ] == "3"
+    # Ham satır sonu etiket değerinde kalmamalı: her satır bir örnek ya da yorum
+    for line in text.splitlines():
+        assert line.startswith(("# HELP ", "# TYPE ", "http_", "db_"))
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert "# TYPE http_requests_in_flight gauge" in text
+    assert text.endswith("\n")
+
+
+def test_middleware_labels_requests_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        for item_id in (1, 2):
+            assert client.get(f"/metrics-test/{item_id}").status_code == 200
+        assert client.get("/metrics-test/x").status_code == 422
+
+    metrics = registry.routes[("GET", "/metrics-test/{item_id}")]
+    assert metrics.statuses == {200: 2, 422: 1}
+    assert metrics.latency.count == 3
+    assert metrics.size.sum > 0
+
+
+@pytest.fixture
+def metrics_client(monkeypatch):
+    monkeypatch.setattr(routers.metrics, "METRICS_ENABLED", True)
+    monkeypatch.setattr(routers.metrics, "METRICS_TOKEN", None)
+    app = FastAPI()
+    app.include_router(routers.metrics.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_metrics_endpoint_is_hidden_when_disabled(metrics_client, monkeypatch):
+    monkeypatch.setattr(routers.metrics, "METRICS_ENABLED", False)
+    assert metrics_client.get("/metrics").status_code == 404
+
+
+def test_metrics_endpoint_without_token(metrics_client):
+    response = metrics_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == routers.metrics.PROMETHEUS_CONTENT_TYPE
+    assert "# TYPE http_requests_total counter" in response.text
+
+
+def test_metrics_endpoint_checks_bearer_token(metrics_client, monkeypatch):
+    monkeypatch.setattr(routers.metrics, "METRICS_TOKEN", "gizli")
+    for headers in ({}, {"Authorization": "Bearer yanlis"}, {"Authorization": "gizli"}):
+        assert metrics_client.get("/metrics", headers=headers).status_code == 401
+    response = metrics_client.get("/metrics", headers={"Authorization": "Bearer gizli"})
+    assert response.status_code == 200
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+import routers.order
+from helpers.catalog_cache import catalog
+from helpers.stats import record_order_created
+from models import Coupons, DailyStats, Order, Prices, User, order_pydanticIn
+from routers.order import create_order, delete_order, update_order
+
+
+async def seed_prices():
+    await Prices.create(price_name="photo_price", price_description="", price_value=3)
+    await Prices.create(price_name="tax_rate", price_description="", price_value=20)
+    # Fiyat motoru tabloyu katalog sürümüne göre yeniden derler
+    catalog.bump()
+
+
+async def make_coupon(user: User, code: str, **values) -> Coupons:
+    now = datetime.now(timezone.utc)
+    values = {
+        "discount_rate": 0,
+        "photo_discount": 1,
+        "start_date": now - timedelta(days=1),
+        "end_date": now + timedelta(days=1),
+        **values,
+    }
+    coupon = await Coupons.create(coupon_code=code, **values)
+    await coupon.users.add(user)
+    return coupon
+
+
+def test_client_order_price_is_ignored(run_db):
+    async def test():
+        await seed_prices()
+        user = await User.create(email="a@test.local", phone_number="1")
+        await make_coupon(user, "FOTO")
+
+        payload = order_pydanticIn(order_price=999, tax=0, discount=500, photos=["a", "b"])
+        created = await create_order(payload, coupon_code=None, current_user=user)
+        # 2 * 3 + %20 vergi
+        assert (created.order_price, created.tax, created.discount) == (
+            Decimal("7.20"), Decimal("1.20"), Decimal("0.00")
+        )
+
+        payload = order_pydanticIn(order_price=999, photos=["a", "b", "c"])
+        updated = await update_order(created.id, payload, coupon_code="FOTO", current_user=user)
+        # Kupon bir fotoğrafı ücretsiz yapar: (9 - 3) * 1.2
+        assert (updated.order_price, updated.discount) == (Decimal("7.20"), Decimal("3.00"))
+
+        stored = await Order.get(id=created.id)
+        assert stored.order_price == Decimal("7.20")
+        assert stored.coupon_code == "FOTO"
+
+    run_db(test)
+
+
+def test_invalid_coupon_code_is_rejected(run_db):
+    async def test():
+        await seed_prices()
+        user = await User.create(email="a@test.local", phone_number="1")
+        other = await User.create(email="b@test.local", phone_number="2")
+        await make_coupon(other, "BASKASININ")
+        await make_coupon(user, "PASIF", is_active=False)
+
+        payload = order_pydanticIn(order_price=999, photos=["a"])
+        for code, status in (("YOK", 404), ("BASKASININ", 400), ("PASIF", 400)):
+            with pytest.raises(HTTPException) as error:
+                await create_order(payload, coupon_code=code, current_user=user)
+            assert error.value.status_code == status
+        assert await Order.all().count() == 0
+
+        created = await create_order(payload, coupon_code=None, current_user=user)
+        with pytest.raises(HTTPException) as error:
+            await update_order(created.id, payload, coupon_code="PASIF", current_user=user)
+        assert error.value.status_code == 400
+        stored = await Order.get(id=created.id)
+        assert stored.order_price == Decimal("3.60")
+        assert stored.coupon_code is None
+
+    run_db(test)
+
+
+def test_order_and_stats_are_written_together(run_db, monkeypatch):
+    async def test():
+        await seed_prices()
+        user = await User.create(email="a@test.local", phone_number="1")
+        payload = order_pydanticIn(photos=["a"])
+
+        created = await create_order(payload, coupon_code=None, current_user=user)
+        assert await DailyStats.all().values_list("order_count", flat=True) == [1]
+
+        async def failing_record(order):
+            await record_order_created(order)
+            raise RuntimeError("stats failed")
+
+        monkeypatch.setattr(routers.order, "record_order_created", failing_record)
+        with pytest.raises(RuntimeError):
+            await create_order(payload, coupon_code=None, current_user=user)
+        # Sipariş de özet de geri alınır
+        assert await Order.all().values_list("id", flat=True) == [created.id]
+        assert await DailyStats.all().values_list("order_count", flat=True) == [1]
+
+        await delete_order(created.id, current_user=user)
+        assert await Order.all().count() == 0
+        assert await DailyStats.all().values_list("order_count", flat=True) == [0]
+
+    run_db(test)
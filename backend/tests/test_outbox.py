@@ -0,0 +1,176 @@
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiosmtpd.controller import Controller
+
+import helpers.outbox as outbox
+from helpers.outbox import OutboxWorker, retry_delay
+from models import EmailOutbox
+
+BACKOFF = 30
+
+
+class RecordingHandler:
+    """Gelen mesajları ve bağlantıları kaydeder; refused adreslerine 451 döner."""
+
+    def __init__(self):
+        self.messages = []
+        self.peers = set()
+        self.refused = set()
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address in self.refused:
+            return "451 Try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        self.peers.add(session.peer)
+        return "250 OK"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    monkeypatch.setattr(outbox, "MAIL_SERVER", "127.0.0.1")
+    monkeypatch.setattr(outbox, "MAIL_PORT", controller.port)
+    monkeypatch.setattr(outbox, "MAIL_STARTTLS", False)
+    monkeypatch.setattr(outbox, "MAIL_SSL_TLS", False)
+    monkeypatch.setattr(outbox, "MAIL_USE_CREDENTIALS", False)
+    monkeypatch.setattr(outbox, "MAIL_FROM", "noreply@test.local")
+    monkeypatch.setattr(outbox, "OUTBOX_RATE", 0)
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF", BACKOFF)
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_BACKOFF", 3600)
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_ATTEMPTS", 3)
+    yield handler
+    controller.stop()
+
+
+async def enqueue(*recipients, subject="Test") -> list:
+    return [
+        await EmailOutbox.create(recipients=[recipient], subject=subject, body="<p>Merhaba</p>")
+        for recipient in recipients
+    ]
+
+
+async def make_due():
+    await EmailOutbox.filter(status="pending").update(
+        next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1)
+    )
+
+
+def test_retry_delay_doubles_up_to_the_cap(monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_BACKOFF", 30)
+    monkeypatch.setattr(outbox, "OUTBOX_MAX_BACKOFF", 100)
+    assert [retry_delay(attempt) for attempt in (1, 2, 3, 4)] == [30, 60, 100, 100]
+
+
+def test_batch_reuses_one_connection(run_db, smtp):
+    async def test():
+        await enqueue(*(f"user{i}@test.local" for i in range(5)))
+        worker = OutboxWorker()
+        try:
+            assert await worker.drain_once() == 5
+        finally:
+            await worker.close()
+
+        assert await EmailOutbox.filter(status="sent").count() == 5
+        assert len(smtp.messages) == 5
+        assert len(smtp.peers) == 1
+        assert worker.connections == 1
+
+    run_db(test)
+
+
+def test_failed_delivery_backs_off_exponentially_then_gives_up(run_db, smtp):
+    async def test():
+        smtp.refused.add("later@test.local")
+        (entry,) = await enqueue("later@test.local")
+        worker = OutboxWorker()
+        try:
+            for attempt in (1, 2):
+                started = datetime.now(timezone.utc)
+                await worker.drain_once()
+                await entry.refresh_from_db()
+                assert entry.status == "pending"
+                assert entry.attempts == attempt
+                assert "451" in entry.last_error
+                delay = (entry.next_attempt_at - started).total_seconds()
+                assert BACKOFF * 2 ** (attempt - 1) <= delay < BACKOFF * 2 ** (attempt - 1) + 5
+
+                # Zamanı gelmeden tekrar denenmez
+                assert await worker.drain_once() == 0
+                await make_due()
+
+            await worker.drain_once()
+            await entry.refresh_from_db()
+        finally:
+            await worker.close()
+
+        assert entry.status == "failed"
+        assert entry.attempts == 3
+        assert worker.retried == 2
+        assert worker.failed == 1
+        assert await worker.drain_once() == 0
+
+    run_db(test)
+
+
+def test_failure_does_not_stop_the_batch(run_db, smtp):
+    async def test():
+        smtp.refused.add("later@test.local")
+        first, refused, last = await enqueue(
+            "first@test.local", "later@test.local", "last@test.local"
+        )
+        # Header'da satır sonu olan konu build_message'da ValueError verir
+        (broken,) = await enqueue("broken@test.local", subject="Kırık\nkonu")
+        worker = OutboxWorker()
+        try:
+            assert await worker.drain_once() == 4
+        finally:
+            await worker.close()
+
+        statuses = dict(await EmailOutbox.all().values_list("id", "status"))
+        assert statuses == {
+            first.id: "sent",
+            refused.id: "pending",
+            last.id: "sent",
+            broken.id: "failed",
+        }
+        await broken.refresh_from_db()
+        assert broken.attempts == 1 and "linefeed" in broken.last_error
+        assert sorted(envelope.rcpt_tos[0] for envelope in smtp.messages) == [
+            "first@test.local",
+            "last@test.local",
+        ]
+
+    run_db(test)
+
+
+def test_rate_limit_spaces_out_messages(run_db, smtp, monkeypatch):
+    monkeypatch.setattr(outbox, "OUTBOX_RATE", 20)
+
+    async def test():
+        await enqueue(*(f"user{i}@test.local" for i in range(5)))
+        worker = OutboxWorker()
+        started = time.monotonic()
+        try:
+            await worker.drain_once()
+        finally:
+            await worker.close()
+        # 20 mesaj/saniye: ilk mesajdan sonraki 4 mesaj en az 50 ms arayla
+        assert time.monotonic() - started >= 4 / 20
+        assert len(smtp.messages) == 5
+
+    run_db(test)
@@ -0,0 +1,126 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from tortoise import Tortoise
+
+from helpers.migrations import normalize_dates
+from helpers.pagination import LOCAL_TZ
+from models import Order
+from routers.admin_order import get_all_orders
+from routers.user import order_summaries
+
+ORDER_COUNT = 45
+PAGE_SIZE = 7
+
+
+async def raw_dates() -> dict:
+    conn = Tortoise.get_connection("default")
+    rows = await conn.execute_query_dict(f'SELECT "id", "date" FROM "{Order._meta.db_table}"')
+    return {row["id"]: row["date"] for row in rows}
+
+
+async def create_mixed_orders(start: datetime) -> list:
+    """
+    Eski veritabanlarındaki gibi tarihleri karışık offset'lerle yazar:
+    İstanbul (+03:00), UTC (+00:00) ve offset'siz.
+    """
+    conn = Tortoise.get_connection("default")
+    table = Order._meta.db_table
+    ids = []
+    for i in range(ORDER_COUNT):
+        order = await Order.create(customer_name="Test", customer_id=i % 3 + 1)
+        value = start + timedelta(minutes=7 * i)
+        if i % 3 == 0:
+            text = value.astimezone(LOCAL_TZ).isoformat(" ")
+        elif i % 3 == 1:
+            text = value.isoformat(" ")
+        else:
+            text = value.replace(tzinfo=None).isoformat(" ")
+        await conn.execute_query(f'UPDATE "{table}" SET "date" = ? WHERE "id" = ?', [text, order.id])
+        ids.append(order.id)
+    return ids
+
+
+async def admin_pages(sort: str = "date_desc", **filters) -> list:
+    pages = []
+    cursor = None
+    while True:
+        response = await get_all_orders(
+            response=Response(),
+            limit=PAGE_SIZE,
+            cursor=cursor,
+            sort=sort,
+            status=None,
+            date_from=filters.get("date_from"),
+            date_to=filters.get("date_to"),
+            customer_id=None,
+            receiver_city=None,
+            jail_name=None,
+            current_admin=None,
+        )
+        pages.append(json.loads(response.body))
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+def test_new_orders_are_stored_in_utc(run_db):
+    async def test():
+        await Order.create(customer_name="Test", customer_id=1)
+        order = await Order.create(customer_name="Test", customer_id=1)
+        await order.save()
+        assert all(value.endswith("+00:00") for value in (await raw_dates()).values())
+
+    run_db(test)
+
+
+def test_keyset_pages_mixed_offsets_once_in_order(run_db):
+    async def test():
+        start = datetime(2024, 3, 1, 20, 0, tzinfo=timezone.utc)
+        ids = await create_mixed_orders(start)
+        await normalize_dates(Order, "date")
+        assert all(value.endswith("+00:00") for value in (await raw_dates()).values())
+
+        for sort, expected in (("date_desc", ids[::-1]), ("date_asc", ids)):
+            pages = await admin_pages(sort)
+            seen = [row["id"] for page in pages for row in page]
+            assert seen == expected
+            assert all(len(page) <= PAGE_SIZE for page in pages)
+
+    run_db(test)
+
+
+def test_date_filters_match_stored_offsets(run_db):
+    async def test():
+        start = datetime(2024, 3, 1, 20, 0, tzinfo=timezone.utc)
+        ids = await create_mixed_orders(start)
+        await normalize_dates(Order, "date")
+
+        # Offset'siz filtre değerleri İstanbul saati kabul edilir
+        date_from = (start + timedelta(minutes=70)).astimezone(LOCAL_TZ).replace(tzinfo=None)
+        date_to = start + timedelta(minutes=140)
+        pages = await admin_pages(date_from=date_from, date_to=date_to)
+        seen = [row["id"] for page in pages for row in page]
+        assert seen == ids[10:20][::-1]
+
+    run_db(test)
+
+
+def test_profile_order_summaries_page_mixed_offsets_once(run_db):
+    async def test():
+        start = datetime(2024, 3, 1, 20, 0, tzinfo=timezone.utc)
+        ids = await create_mixed_orders(start)
+        await normalize_dates(Order, "date")
+
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = await order_summaries(1, PAGE_SIZE, cursor)
+            seen.extend(row["id"] for row in rows)
+            if cursor is None:
+                break
+        # create_mixed_orders müşterileri 1, 2, 3 diye sırayla dağıtır
+        assert seen == ids[::3][::-1]
+
+    run_db(test)
@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from helpers.pricing import PriceTable, get_coupon_for_user, quote
+from models import Coupons, User
+from routers.quote import MAX_QUOTE_BATCH, QuoteBatch, QuoteConfig, quote_batch
+
+
+def price_table(**prices) -> PriceTable:
+    return PriceTable(
+        version=1,
+        prices={
+            "character_price": Decimal("0.10"),
+            "cardpostal_price": Decimal("5"),
+            "photo_price": Decimal("3"),
+            "file_price": Decimal("2"),
+            "tax_rate": Decimal("20"),
+            **prices,
+        },
+        envelope_colors={"red": Decimal("4.50")},
+        paper_colors={"white": Decimal("1")},
+        smells={"lavanta": Decimal("7")},
+        shipments={"Kargo": Decimal("30")},
+    )
+
+
+ORDER = {
+    # Etiketler atılınca "Merhaba dünya": 13 karakter
+    "envelope_text": "<p>Merhaba <b>dünya</b></p>",
+    "envelope_color": "red",
+    "paper_color": "white",
+    "cardpostals": ["a.jpg", "b.jpg"],
+    "photos": ["1.jpg", "2.jpg", "3.jpg"],
+    "files": ["x.pdf"],
+    "smell": "lavanta",
+    "shipment_type": "Kargo",
+}
+
+
+def coupon(**values) -> Coupons:
+    defaults = {
+        "coupon_code": "KUPON",
+        "discount_rate": Decimal(0),
+        "smell_discount": False,
+        "photo_discount": 0,
+        "cardpostal_discount": 0,
+    }
+    return Coupons(**{**defaults, **values})
+
+
+def amounts(result) -> dict:
+    return {item.name: (item.amount, item.discount) for item in result.items}
+
+
+def test_quote_without_coupon_adds_tax():
+    result = quote(price_table(), ORDER)
+
+    assert amounts(result)["character"] == (Decimal("0.65"), 0)
+    # 0.65 + 4.50 + 1 + 2*5 + 3*3 + 2 + 7 + 30
+    assert result.subtotal == Decimal("64.15")
+    assert result.discount == 0
+    assert result.tax == Decimal("12.83")
+    assert result.total == Decimal("76.98")
+    assert result.coupon_code is None
+
+
+def test_character_count_ignores_html_tags():
+    table = price_table(character_price=Decimal("1"))
+    plain = quote(table, {"envelope_text": "Merhaba dünya"})
+    tagged = quote(table, {"envelope_text": '<p class="x">Merhaba</p> <br/><i>dünya</i>'})
+    # İki karakter bir birim (Payment.js ile aynı)
+    assert amounts(plain)["character"] == (Decimal("6.50"), 0)
+    assert amounts(tagged)["character"] == amounts(plain)["character"]
+
+
+def test_fixed_coupon_discounts_free_items_capped_at_quantity():
+    result = quote(
+        price_table(),
+        ORDER,
+        coupon(photo_discount=5, cardpostal_discount=1, smell_discount=True),
+    )
+    items = amounts(result)
+    # 5 ücretsiz fotoğraf hakkı siparişteki 3 fotoğrafla sınırlı
+    assert items["photo"] == (Decimal("9.00"), Decimal("9.00"))
+    assert items["cardpostal"] == (Decimal("10.00"), Decimal("5.00"))
+    assert items["smell"] == (Decimal("7.00"), Decimal("7.00"))
+    assert result.discount == Decimal("21.00")
+    assert result.tax == Decimal("8.63")
+    assert result.total == Decimal("51.78")
+    assert result.coupon_code == "KUPON"
+
+
+def test_percent_coupon_applies_after_fixed_discounts():
+    result = quote(
+        price_table(),
+        ORDER,
+        coupon(discount_rate=Decimal(10), photo_discount=2, cardpostal_discount=1, smell_discount=True),
+    )
+    # Sabit indirim 6 + 5 + 7 = 18; kalan 46.15'in %10'u 4.615 -> 4.62
+    assert result.discount == Decimal("22.62")
+    # (64.15 - 22.62) * %20 = 8.306 -> 8.31
+    assert result.tax == Decimal("8.31")
+    assert result.total == Decimal("49.84")
+
+
+def test_amounts_round_half_up_to_cents():
+    table = price_table(character_price=Decimal("0.05"), tax_rate=Decimal("18"))
+    result = quote(table, {"envelope_text": "abc"})
+    # 1.5 * 0.05 = 0.075 -> 0.08; vergi 0.0144 -> 0.01
+    assert amounts(result)["character"] == (Decimal("0.08"), 0)
+    assert result.tax == Decimal("0.01")
+    assert result.total == Decimal("0.09")
+
+
+def test_counts_accepted_as_lists_or_numbers():
+    table = price_table()
+    as_lists = quote(table, {"photos": ["a", "b"], "cardpostals": ["c"], "files": []})
+    as_counts = quote(table, {"photos": 2, "cardpostals": 1, "files": -3})
+    assert as_lists.total == as_counts.total == Decimal("13.20")
+
+
+def test_coupon_must_be_assigned_active_and_in_date(run_db):
+    async def test():
+        now = datetime.now(timezone.utc)
+        user = await User.create(email="a@test.local", phone_number="1")
+        other = await User.create(email="b@test.local", phone_number="2")
+
+        async def make(code, **values):
+            values = {
+                "discount_rate": 10,
+                "start_date": now - timedelta(days=1),
+                "end_date": now + timedelta(days=1),
+                **values,
+            }
+            created = await Coupons.create(coupon_code=code, **values)
+            await created.users.add(user)
+            return created
+
+        await make("GECERLI")
+        await make("SURESI_DOLMUS", end_date=now - timedelta(hours=1))
+        await make("HENUZ_BASLAMADI", start_date=now + timedelta(hours=1))
+        await make("PASIF", is_active=False)
+
+        assert (await get_coupon_for_user("GECERLI", user)).coupon_code == "GECERLI"
+        for code in ("SURESI_DOLMUS", "HENUZ_BASLAMADI", "PASIF"):
+            with pytest.raises(HTTPException) as error:
+                await get_coupon_for_user(code, user)
+            assert error.value.status_code == 400
+        with pytest.raises(HTTPException) as error:
+            await get_coupon_for_user("GECERLI", other)
+        assert error.value.status_code == 400
+        with pytest.raises(HTTPException) as error:
+            await get_coupon_for_user("YOK", user)
+        assert error.value.status_code == 404
+
+    run_db(test)
+
+
+def test_quote_batch_limit(run_db):
+    async def test():
+        user = await User.create(email="a@test.local", phone_number="1")
+        config = QuoteConfig(photos=1)
+
+        result = await quote_batch(QuoteBatch(configs=[config] * MAX_QUOTE_BATCH), current_user=user)
+        assert len(result["quotes"]) == MAX_QUOTE_BATCH
+
+        with pytest.raises(HTTPException) as error:
+            await quote_batch(QuoteBatch(configs=[config] * (MAX_QUOTE_BATCH + 1)), current_user=user)
+        assert error.value.status_code == 400
+
+    run_db(test)
@@ -0,0 +1,96 @@
+import importlib
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import helpers.metrics as metrics
+import helpers.query_detector as query_detector
+from helpers.query_detector import N_PLUS_ONE_HEADER, NPlusOneDetector, NPlusOneMiddleware, normalize
+
+
+def test_normalize_ignores_literals():
+    assert normalize("SELECT * FROM order WHERE id=5") == normalize("SELECT * FROM order WHERE id=17")
+    assert normalize("SELECT * FROM user WHERE name='O''Brien' LIMIT 1") == normalize(
+        "SELECT  *\nFROM user WHERE name='Ali'   LIMIT 20"
+    )
+    assert normalize("SELECT * FROM town WHERE city_id IN (?,?,?)") == normalize(
+        "SELECT * FROM town WHERE city_id IN (?)"
+    )
+    assert normalize("SELECT * FROM order WHERE price>2.5") == "SELECT * FROM order WHERE price>?"
+    # Farklı kolonlar farklı şekildir
+    assert normalize("SELECT * FROM order WHERE id=5") != normalize(
+        "SELECT * FROM order WHERE customer_id=5"
+    )
+
+
+@pytest.fixture
+def client():
+    detector = NPlusOneDetector(threshold=3)
+    app = FastAPI()
+    app.add_middleware(NPlusOneMiddleware)
+
+    @app.get("/queries/{count}")
+    async def queries(count: int):
+        for order_id in range(count):
+            detector.record(f"SELECT * FROM order WHERE id={order_id}", 0.0)
+        detector.record("SELECT COUNT(*) FROM order", 0.0)
+        return {}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def test_header_only_when_shape_exceeds_threshold(client):
+    # Eşik 3: aynı şekilde 3 sorgu normal, 4. sorgu N+1 olarak işaretlenir
+    assert N_PLUS_ONE_HEADER not in client.get("/queries/3").headers
+    header = client.get("/queries/4").headers[N_PLUS_ONE_HEADER]
+    assert header == "4x SELECT * FROM order WHERE id=?"
+    assert client.get("/queries/10").headers[N_PLUS_ONE_HEADER].startswith("10x ")
+
+
+def test_record_outside_a_request_is_ignored():
+    detector = NPlusOneDetector(threshold=0)
+    detector.record("SELECT 1", 0.0)
+    assert query_detector._current_shapes.get() is None
+
+
+@pytest.fixture
+def load_main(tmp_path, monkeypatch):
+    """main'i verilen .env içeriğiyle geçici bir dizinde yeniden import eder."""
+    cwd = os.getcwd()
+    (tmp_path / "static").mkdir()
+    # Açılan dinleyiciler diğer testlere taşınmasın
+    monkeypatch.setattr(metrics, "_query_listeners", [])
+
+    def load(env: str):
+        (tmp_path / ".env").write_text(env)
+        os.chdir(tmp_path)
+        try:
+            importlib.reload(query_detector)
+            sys.modules.pop("main", None)
+            return importlib.import_module("main")
+        finally:
+            os.chdir(cwd)
+
+    yield load
+    sys.modules.pop("main", None)
+    importlib.reload(query_detector)
+
+
+def middleware_names(app) -> list:
+    return [middleware.cls.__name__ for middleware in app.user_middleware]
+
+
+def test_detector_is_off_unless_enabled(load_main):
+    main = load_main("")
+    assert query_detector.N_PLUS_ONE_DETECTOR is False
+    assert "NPlusOneMiddleware" not in middleware_names(main.app)
+    assert query_detector.detector.record not in metrics._query_listeners
+
+    main = load_main("N_PLUS_ONE_DETECTOR=true\n")
+    assert query_detector.N_PLUS_ONE_DETECTOR is True
+    assert "NPlusOneMiddleware" in middleware_names(main.app)
+    assert query_detector.detector.record in metrics._query_listeners
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from helpers.reference_cache import reference_data
+from helpers.reference_import import ImportFormatError, import_reference
+from models import City, Jail, Town
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+async def fixture_chunks(name: str, size: int = 7):
+    # Küçük parçalar: satırlar ve çok byte'lı karakterler parça sınırında bölünür
+    with open(os.path.join(FIXTURES, name), "rb") as file:
+        data = file.read()
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def bytes_chunks(data: bytes):
+    yield data
+
+
+@pytest.fixture
+def bumps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(reference_data, "bump", lambda: calls.append(True))
+    return calls
+
+
+async def add_cities(*city_ids):
+    for city_id in city_ids:
+        await City.create(
+            city_id=city_id, country_id=1, city_name=str(city_id), plate_no=city_id, phone_code=""
+        )
+
+
+def test_csv_import_reports_bad_rows_and_upserts_the_rest(run_db, bumps):
+    async def test():
+        await add_cities(34, 6)
+        await Jail.create(id=5, city_id=6, name="Eski ad", address="", type=1)
+
+        result = await import_reference("jails", fixture_chunks("jails.csv"), "csv", chunk_size=2)
+
+        assert result.to_dict() == {
+            "kind": "jails",
+            "rows": 6,
+            # 1 ve 2 ilk parçada eklenir; ikinci parçada 5 ve tekrar eden 1 güncellenir
+            "created": 2,
+            "updated": 2,
+            "failed": 2,
+            "errors": [
+                {"line": 5, "error": "city_id: unknown city 99"},
+                {"line": 6, "error": result.errors[1]["error"]},
+            ],
+            "errors_truncated": False,
+        }
+        assert result.errors[1]["error"].startswith("type:")
+
+        jails = {jail.id: jail for jail in await Jail.all()}
+        assert sorted(jails) == [1, 2, 5]
+        # Dosyada tekrar eden anahtar için son satır geçerli
+        assert jails[1].name == "Marmara Cezaevi"
+        assert jails[1].address == "Silivri, İstanbul"
+        # Tırnak içindeki çift tırnak ve satır sonu korunur
+        assert jails[2].name == 'Metris "Kapalı" Cezaevi'
+        assert jails[2].address == "Esenler\nİstanbul"
+        assert (jails[5].name, jails[5].type) == ("Ankara Kadın Cezaevi", 3)
+        assert len(bumps) == 1
+
+    run_db(test)
+
+
+def test_ndjson_import_reports_bad_lines_and_upserts_the_rest(run_db, bumps):
+    async def test():
+        await add_cities(34, 6)
+        await Town.create(town_id=2, city_id=34, town_name="Eski ad")
+
+        result = await import_reference("towns", fixture_chunks("towns.ndjson"), "ndjson")
+
+        assert (result.rows, result.created, result.updated, result.failed) == (6, 2, 1, 3)
+        assert [error["line"] for error in result.errors] == [3, 5, 6]
+        assert result.errors[0]["error"].startswith("Invalid JSON")
+        assert result.errors[1]["error"].startswith("town_name:")
+        assert result.errors[2]["error"] == "Each line must be a JSON object"
+
+        towns = dict(await Town.all().values_list("town_id", "town_name"))
+        assert towns == {1: "Kadıköy", 2: "Üsküdar", 4: "Çankaya"}
+        assert len(bumps) == 1
+
+    run_db(test)
+
+
+def test_nothing_written_means_no_bump(run_db, bumps):
+    async def test():
+        with pytest.raises(ImportFormatError):
+            await import_reference("cities", bytes_chunks(b"city_id,nufus\n1,2\n"), "csv")
+
+        result = await import_reference("towns", bytes_chunks(b'{"town_id": 1}\n'), "ndjson")
+        assert (result.created, result.updated, result.failed) == (0, 0, 1)
+
+        assert await Town.all().count() == 0
+        assert bumps == []
+
+    run_db(test)
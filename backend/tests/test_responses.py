@@ -0,0 +1,36 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from helpers.responses import dumps
+from models import Order, order_pydanticOut
+from routers.admin_order import get_all_orders
+
+
+def test_plain_values_match_jsonable_encoder():
+    content = {
+        "date": datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        "price": Decimal("7.20"),
+        "count": Decimal("3"),
+    }
+    assert orjson.loads(dumps(content)) == jsonable_encoder(content)
+    assert orjson.loads(dumps(content))["date"] == "2026-01-02T03:04:05+00:00"
+
+
+def test_admin_orders_bypass_matches_response_model_output(run_db):
+    async def test():
+        await Order.create(customer_name="a", customer_id=1, order_price=Decimal("7.20"))
+        await Order.create(customer_name="b", customer_id=2, date=datetime(2026, 1, 2, tzinfo=timezone.utc))
+
+        response = await get_all_orders(Response(), current_admin=None)
+        page = await order_pydanticOut.from_queryset(Order.all().order_by("-date", "-id"))
+        # FastAPI'nin response_model yolu: pydantic JSON modu, sonra varsayılan yanıt sınıfı
+        expected = dumps(TypeAdapter(List[order_pydanticOut]).dump_python(page, mode="json"))
+        assert response.body == expected
+
+    run_db(test)
@@ -0,0 +1,121 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+import helpers.uploads as uploads
+from helpers.uploads import UploadBudget, UploadSizeLimitMiddleware, save_upload, save_uploads
+
+LIMIT = 1000
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_request_size=LIMIT)
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    with TestClient(app) as client:
+        yield client
+
+
+def multipart(size: int):
+    boundary = "test-boundary"
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="a.txt"\r\n'
+        "Content-Type: text/plain\r\n\r\n"
+    ).encode() + b"x" * size + f"\r\n--{boundary}--\r\n".encode()
+    return body, {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+
+
+def chunked(body: bytes, size: int = 100):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+
+def upload_file(data: bytes, filename: str = "a.txt") -> UploadFile:
+    return UploadFile(file=io.BytesIO(data), filename=filename)
+
+
+def leftovers(directory) -> list:
+    return sorted(os.listdir(directory))
+
+
+def test_middleware_allows_requests_under_the_limit(client):
+    body, headers = multipart(100)
+    assert client.post("/upload", content=body, headers=headers).json() == {"size": 100}
+    response = client.post("/upload", content=chunked(body), headers=headers)
+    assert response.json() == {"size": 100}
+
+
+def test_middleware_rejects_large_content_length(client):
+    body, headers = multipart(LIMIT)
+    response = client.post("/upload", content=body, headers=headers)
+    assert response.status_code == 413
+    assert str(LIMIT) in response.json()["detail"]
+
+
+def test_middleware_rejects_large_chunked_body(client):
+    body, headers = multipart(LIMIT)
+    response = client.post("/upload", content=chunked(body), headers=headers)
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+
+
+def test_save_upload_replaces_temp_file(tmp_path):
+    data = b"merhaba" * 10
+    saved = asyncio.run(save_upload(upload_file(data), str(tmp_path), "a.bin"))
+
+    assert saved.path == str(tmp_path / "a.bin")
+    assert saved.size == len(data)
+    assert saved.sha256 == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "a.bin").read_bytes() == data
+    assert leftovers(tmp_path) == ["a.bin"]
+
+
+def test_per_file_limit_removes_partial_file(tmp_path, monkeypatch):
+    # Limit aşılmadan önce geçici dosyaya parça yazılmış olsun
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 4)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(save_upload(
+            upload_file(b"x" * 25), str(tmp_path), "a.bin", max_file_size=10
+        ))
+    assert error.value.status_code == 413
+    assert "a.txt" in error.value.detail
+    assert leftovers(tmp_path) == []
+
+
+def test_request_budget_is_shared_between_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "CHUNK_SIZE", 4)
+    budget = UploadBudget(10)
+    asyncio.run(save_upload(upload_file(b"x" * 6), str(tmp_path), "a.bin", budget))
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(save_upload(upload_file(b"x" * 6), str(tmp_path), "b.bin", budget))
+    assert error.value.status_code == 413
+    assert leftovers(tmp_path) == ["a.bin"]
+
+
+def test_failed_replace_removes_temp_file(tmp_path, monkeypatch):
+    def failing_replace(source, target):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(uploads.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        asyncio.run(save_upload(upload_file(b"x" * 6), str(tmp_path), "a.bin"))
+    assert leftovers(tmp_path) == []
+
+
+def test_save_uploads_discards_earlier_files_on_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(uploads, "UploadBudget", lambda: UploadBudget(10))
+    files = [upload_file(b"x" * 6, "a.txt"), upload_file(b"x" * 6, "b.txt")]
+    with pytest.raises(HTTPException):
+        asyncio.run(save_uploads(files, str(tmp_path), lambda file: file.filename))
+    assert leftovers(tmp_path) == []
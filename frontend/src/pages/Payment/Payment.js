@@ -395,9 +395,6 @@ const PaymentPage = () => {
   const [paymentMethod, setPaymentMethod] = useState("card");
   const [updatedFields, setUpdatedFields] = useState({
     status: "Ödeme Bekleniyor - Kartla Ödeme",
-    order_price: "0.00",
-    tax: 0.0,
-    discount: 0.0,
   });
   const order_id = searchParams.get("order_id");
   const token = localStorage.getItem("token");
@@ -758,14 +755,8 @@ const PaymentPage = () => {
     const handlePayment = () => {
       console.log("Ödeme işlemi başlatıldı");
 
-      // Update updatedFields with precise order details before payment
-      setUpdatedFields((prev) => ({
-        ...prev,
-        order_price: parseFloat(totalWithTax),
-        tax: parseFloat(totalTax),
-        discount: appliedCoupon ? 1.0 : 0.0,
-      }));
-
+      // Fiyat, vergi ve indirim sunucuda hesaplanır; uygulanan kupon
+      // coupon_code parametresiyle gönderilir
       console.log(updatedFields); // Güncel `updatedFields` değeri loglanır
       updateOrder();
     };
@@ -776,6 +767,9 @@ const PaymentPage = () => {
           `${BASE_URL}/order/${order_id}`,
           updatedFields,
           {
+            params: appliedCoupon
+              ? { coupon_code: appliedCoupon.coupon_code }
+              : {},
             headers: {
               Authorization: `Bearer ${token}`,
             },
@@ -402,7 +402,21 @@ const UserAccountPage = () => {
           },
         });
         setUserData(response.data.user);
-        setOrders(response.data.orders || []); // Store orders in state
+
+        // Siparişler sayfalı geliyor; kalan sayfaları cursor ile çek
+        let allOrders = response.data.orders || [];
+        let cursor = response.data.next_cursor;
+        while (cursor) {
+          const page = await axios.get(`${BASE_URL}/profile/orders`, {
+            params: { cursor },
+            headers: {
+              Authorization: `Bearer ${token}`,
+            },
+          });
+          allOrders = allOrders.concat(page.data.orders);
+          cursor = page.data.next_cursor;
+        }
+        setOrders(allOrders); // Store orders in state
       } catch (error) {
         console.error("Profile fetch error:", error);
       } finally {
@@ -984,9 +998,6 @@ const UnsentItems = ({ orders, onDelete, onEdit }) => {
   const [sortOrder, setSortOrder] = useState("desc"); // Default descending order
   const itemsPerPage = 10;
 
-  // Strip HTML Tags
-  const stripHTMLTags = (text) => text.replace(/<\/?[^>]+(>|$)/g, "");
-
   // Sort orders by selected key and order
   const sortedOrders = [...orders].sort((a, b) => {
     if (sortKey === "date") {
@@ -1069,7 +1080,7 @@ const UnsentItems = ({ orders, onDelete, onEdit }) => {
                   })}
                 </TableCell>
                 <TableCell>
-                  {stripHTMLTags(order.envelope_text).slice(0, 20)}
+                  {order.envelope_preview.slice(0, 20)}
                 </TableCell>
                 <TableCell>{order.status}</TableCell>
                 <TableCell style={{ textAlign: "center" }}>